@@ -1,4 +1,5 @@
 #imports
+import asyncio
 import os
 import logging
 import threading
@@ -14,9 +15,13 @@ from telegram.constants import ParseMode
 from telegram.helpers import escape_markdown
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters, ConversationHandler
 from google.oauth2 import service_account
+from google.auth.transport.requests import AuthorizedSession
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from dotenv import load_dotenv
+from pytube.progress import ProgressBus
+from pytube.request import bandwidth_scheduler
+from pytube.sinks import BackgroundSink, FileSink, Sink, Tee, feed_file
 
 # Cargar variables de entorno desde .env
 load_dotenv()
@@ -111,6 +116,27 @@ else:
 DOWNLOAD_DIR = "downloads"
 API_PORT = int(os.getenv("PORT", 5001))
 TELEGRAM_FILE_LIMIT = 50 * 1024 * 1024  # 50 MB
+DRIVE_UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3/files"
+DRIVE_UPLOAD_QUEUE = 32  # fragmentos de 256KB en espera de subir a Drive
+
+# Límites de ancho de banda compartidos por todas las descargas (0 = sin límite)
+BANDWIDTH_LIMIT = int(os.getenv("BANDWIDTH_LIMIT", 0))  # bytes por segundo
+BANDWIDTH_BURST = int(os.getenv("BANDWIDTH_BURST", 0))  # bytes
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("MAX_CONNECTIONS_PER_HOST", 0))
+bandwidth_scheduler.configure(
+    rate=BANDWIDTH_LIMIT,
+    burst=BANDWIDTH_BURST,
+    max_connections_per_host=MAX_CONNECTIONS_PER_HOST
+)
+if BANDWIDTH_LIMIT:
+    logger.info(f"🚦 Ancho de banda limitado a {BANDWIDTH_LIMIT} bytes/s")
+
+# Progreso de las descargas: Telegram limita las ediciones de mensajes, así que
+# el avance de todas las descargas se agrupa y se publica como mucho cada
+# PROGRESS_INTERVAL segundos
+PROGRESS_INTERVAL = float(os.getenv("PROGRESS_INTERVAL", 3))
+progress_bus = ProgressBus(interval=PROGRESS_INTERVAL)
+progress_messages = {}  # descarga -> (loop, mensaje de estado, encabezado)
 
 # Lista de sitios soportados con ejemplos de URLs
 SUPPORTED_SITES = {
@@ -145,7 +171,44 @@ def choose_format(info: dict, kind: str) -> str:
         return max(audio, key=lambda f: (f.get("abr") or 0))["format_id"]
     return "best"
 
-def invidious_download(video_id: str, kind: str):
+
+def fetch_to_sinks(
+    stream_url: str, path: str, sinks=None, headers=None, name=None, progress_key=None
+):
+    """Descarga una URL a disco y, a la vez, a los sinks dados (Drive, Telegram, hash...)"""
+    tee = Tee([FileSink(path)] + list(sinks or []))
+    task = None
+    if progress_key:
+        task = progress_bus.task(
+            (progress_key, path), job=progress_key, label=os.path.basename(path)
+        )
+    try:
+        with requests.get(
+            stream_url, stream=True, headers=headers, proxies=get_proxy_dict(), timeout=60
+        ) as r, bandwidth_scheduler.job(name=name or stream_url) as job:
+            r.raise_for_status()
+            if task and r.headers.get("Content-Length"):
+                task.update(0, int(r.headers["Content-Length"]))
+            chunk_size = bandwidth_scheduler.read_size or 1024 * 1024
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    job.consume(len(chunk))
+                    tee.write(chunk)
+                    if task:
+                        task.advance(len(chunk))
+    except BaseException as e:
+        tee.abort(e)
+        raise
+    tee.close()
+    if task:
+        task.finish()
+    for sink, error in tee.errors.items():
+        if isinstance(sink, FileSink):
+            raise error
+        logging.warning(f"⚠️ Falló el destino {sink!r}: {error}")
+
+
+def invidious_download(video_id: str, kind: str, sinks=None, progress_key=None):
     if not INVIDIOUS_API_URL:
         raise Exception("Invidious no configurado")
     resp = requests.get(f"{INVIDIOUS_API_URL}/api/v1/videos/{video_id}", proxies=get_proxy_dict(), timeout=15)
@@ -159,12 +222,9 @@ def invidious_download(video_id: str, kind: str):
     ext = ".mp4" if kind == "video" else ".mp3"
     fname = title.replace("/", "_").replace(" ", "_") + ext
     path = os.path.join(DOWNLOAD_DIR, fname)
-    with requests.get(stream_url, stream=True, proxies=get_proxy_dict(), timeout=60) as r:
-        r.raise_for_status()
-        with open(path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=1024*1024):
-                if chunk:
-                    f.write(chunk)
+    fetch_to_sinks(
+        stream_url, path, sinks, name=f"invidious {video_id}", progress_key=progress_key
+    )
     meta = {"title": title, "author": info.get("uploader"), "length": info.get("duration"), "type": kind}
     return meta, path
 
@@ -190,6 +250,67 @@ def format_file_size(size_bytes):
     else:
         return f"{size_bytes/(1024*1024*1024):.2f} GB"
 
+
+def bandwidth_hook(job):
+    """Crea un progress hook de yt-dlp que descuenta lo descargado del presupuesto común"""
+    received = {}
+
+    def hook(d):
+        name = d.get("filename")
+        downloaded = d.get("downloaded_bytes") or 0
+        delta = downloaded - received.get(name, 0)
+        received[name] = downloaded
+        if delta > 0:
+            job.consume(delta)
+    return hook
+
+
+def progress_hook(key):
+    """Crea un progress hook de yt-dlp que publica el avance de cada archivo"""
+    def hook(d):
+        name = d.get("filename") or ""
+        task = progress_bus.task((key, name), job=key, label=os.path.basename(name))
+        total = d.get("total_bytes") or d.get("total_bytes_estimate")
+        task.update(d.get("downloaded_bytes") or 0, int(total) if total else None)
+        if d.get("status") == "finished":
+            task.finish()
+    return hook
+
+
+def on_download_progress(event):
+    """Edita el mensaje de estado de cada descarga que avanzó desde el último evento"""
+    for key in event.jobs(changed=True):
+        target = progress_messages.get(key)
+        if target is None:
+            continue
+        loop, message, header = target
+        received, total = event.progress(key)
+        asyncio.run_coroutine_threadsafe(
+            edit_progress(key, message, header, received, total), loop
+        )
+
+
+async def edit_progress(key, message, header, received, total):
+    """Muestra el avance de una descarga en su mensaje de estado"""
+    if key not in progress_messages:
+        return  # la descarga ya terminó y el mensaje muestra otra cosa
+    if total:
+        fraction = min(1.0, received / total)
+        bar = "█" * int(fraction * 10) + "░" * (10 - int(fraction * 10))
+        line = (
+            f"{bar} {fraction:.0%}\n"
+            f"📦 {format_file_size(received)} de {format_file_size(total)}"
+        )
+    else:
+        line = f"📦 {format_file_size(received)} descargados"
+    try:
+        await message.edit_text(f"{header}\n\n{line}", parse_mode=ParseMode.MARKDOWN)
+    except Exception as e:
+        logging.debug(f"No se pudo actualizar el progreso: {str(e)}")
+
+progress_bus.subscribe(on_download_progress)
+
+
 def is_supported_url(url):
     """Verifica si la URL es de un sitio soportado"""
     for site_urls in SUPPORTED_SITES.values():
@@ -215,8 +336,25 @@ def extract_video_id(url):
     # Otros formatos se pueden agregar según sea necesario
     return None
 
-def download_video(url: str, kind: str = "video") -> dict:
-    """Descarga un video o audio de una URL"""
+
+def can_stream_to_sinks(info: dict, opts: dict) -> bool:
+    """Indica si el formato elegido es un único archivo HTTP que no hay que procesar después"""
+    return (
+        "requested_formats" not in info
+        and not opts.get("postprocessors")
+        and info.get("protocol") in ("http", "https")
+        and bool(info.get("url"))
+    )
+
+
+def download_video(url: str, kind: str = "video", sinks=None, progress_key=None) -> dict:
+    """Descarga un video o audio de una URL
+
+    Si se dan `sinks`, cada byte se envía también a ellos a medida que llega, para
+    subirlo mientras se descarga. Cuando yt-dlp tiene que unir o convertir el
+    archivo, se les envía el resultado al terminar. Con `progress_key`, el avance
+    se publica en `progress_bus` bajo esa clave.
+    """
     if not is_supported_url(url):
         return {"status": "error", "message": "⚠️ URL no soportada. Usa /plataformas para ver los sitios disponibles."}
     
@@ -239,13 +377,41 @@ def download_video(url: str, kind: str = "video") -> dict:
     
     if (p := get_proxy_dict()):
         opts["proxy"] = p["http"]
-    
+
+    job = bandwidth_scheduler.job(name=url)
+    opts["progress_hooks"] = [bandwidth_hook(job)]
+    if progress_key:
+        opts["progress_hooks"].append(progress_hook(progress_key))
+
     try:
         with YoutubeDL(opts) as ydl:
-            info = ydl.extract_info(url, download=True)
+            streamed = False
+            if sinks:
+                info = ydl.extract_info(url, download=False)
+                if can_stream_to_sinks(info, opts):
+                    try:
+                        fetch_to_sinks(
+                            info["url"],
+                            ydl.prepare_filename(info),
+                            sinks,
+                            headers=info.get("http_headers"),
+                            name=url,
+                            progress_key=progress_key,
+                        )
+                        streamed = True
+                    except requests.RequestException as e:
+                        # Los sinks ya se cancelaron; quien llama recurre al archivo
+                        logging.warning(f"⚠️ Descarga directa fallida, se usa yt-dlp: {e}")
+                        sinks = None
+                if not streamed:
+                    info = ydl.process_ie_result(info, download=True)
+            else:
+                info = ydl.extract_info(url, download=True)
             path = ydl.prepare_filename(info)
             if kind == "audio" and not path.endswith(".mp3"):
                 path = os.path.splitext(path)[0] + ".mp3"
+            if sinks and not streamed:
+                feed_file(path, Tee(sinks))
             
             meta = {
                 "title": info.get("title", "Desconocido"),
@@ -260,11 +426,13 @@ def download_video(url: str, kind: str = "video") -> dict:
         logging.warning("yt-dlp fallo: %s", msg)
         if video_id and "youtube" in url.lower() and any(x in msg for x in ["Sign in to confirm", "Requested format"]):
             try:
-                meta, path = invidious_download(video_id, kind)
+                meta, path = invidious_download(video_id, kind, sinks, progress_key)
             except Exception as e2:
                 return {"status": "error", "message": f"❌ Error: {str(e2)}"}
         else:
             return {"status": "error", "message": f"❌ Error: {msg}"}
+    finally:
+        job.close()
     
     return {"status": "success", "metadata": meta, "path": path}
 
@@ -338,27 +506,106 @@ def upload_to_drive(path: str) -> str | None:
         logging.info(f"- ID: {response.get('id')}")
         logging.info(f"- Tamaño: {format_file_size(int(response.get('size', 0)))}")
         
-        # Configurar permisos públicos
-        logging.info("🔒 Configurando permisos públicos...")
-        try:
-            drive_service.permissions().create(
-                fileId=response.get("id"),
-                body={"type": "anyone", "role": "reader"},
-                fields="id"
-            ).execute()
-            logging.info("✅ Permisos públicos configurados")
-        except Exception as e:
-            logging.error(f"❌ Error al configurar permisos: {str(e)}")
-            # Continuamos aunque falle la configuración de permisos
-        
-        web_link = response.get("webViewLink")
-        logging.info(f"🔗 Enlace generado: {web_link}")
-        return web_link
+        return share_drive_file(response)
         
     except Exception as e:
         logging.error(f"❌ Error al subir a Drive: {str(e)}", exc_info=True)
         return None
 
+
+def share_drive_file(response: dict) -> str | None:
+    """Hace público un archivo subido a Drive y devuelve su enlace"""
+    # Configurar permisos públicos
+    logging.info("🔒 Configurando permisos públicos...")
+    try:
+        drive_service.permissions().create(
+            fileId=response.get("id"),
+            body={"type": "anyone", "role": "reader"},
+            fields="id"
+        ).execute()
+        logging.info("✅ Permisos públicos configurados")
+    except Exception as e:
+        logging.error(f"❌ Error al configurar permisos: {str(e)}")
+        # Continuamos aunque falle la configuración de permisos
+
+    web_link = response.get("webViewLink")
+    logging.info(f"🔗 Enlace generado: {web_link}")
+    return web_link
+
+
+class DriveResumableSink(Sink):
+    """Sube a Google Drive por una sesión resumable a medida que llegan los bytes
+
+    El tamaño total no se conoce hasta el final, así que cada fragmento se envía
+    con `Content-Range: bytes a-b/*` y el último con el tamaño real.
+    """
+    chunk_size = 8 * 256 * 1024  # Drive exige múltiplos de 256KB
+
+    def __init__(self, name: str, mimetype: str):
+        self.session = AuthorizedSession(creds)
+        self.buffer = bytearray()
+        self.offset = 0
+        self.response = None
+        resp = self.session.post(
+            DRIVE_UPLOAD_URL,
+            params={"uploadType": "resumable", "fields": "id,webViewLink,size"},
+            json={
+                "name": name,
+                "parents": [GDRIVE_FOLDER_ID],
+                "description": (
+                    f"Subido por DownloaderBot el {datetime.now().strftime('%d/%m/%Y %H:%M')}"
+                )
+            },
+            headers={"X-Upload-Content-Type": mimetype},
+            timeout=30
+        )
+        resp.raise_for_status()
+        self.session_uri = resp.headers["Location"]
+        logging.info("🚀 Sesión de subida a Drive iniciada")
+
+    def write(self, chunk):
+        self.buffer += chunk
+        while len(self.buffer) >= self.chunk_size:
+            self._send(self.chunk_size)
+
+    def close(self):
+        self._send(len(self.buffer), total=self.offset + len(self.buffer))
+        logging.info(f"✅ Subida a Drive completada: {format_file_size(self.offset)}")
+
+    def abort(self, error):
+        try:
+            self.session.delete(self.session_uri, timeout=30)
+        except Exception as e:
+            logging.warning(f"⚠️ No se pudo cancelar la subida a Drive: {e}")
+
+    def _send(self, size: int, total: int | None = None):
+        if size:
+            end = self.offset + size - 1
+            content_range = f"bytes {self.offset}-{end}/{'*' if total is None else total}"
+        else:
+            content_range = f"bytes */{total}"
+        resp = self.session.put(
+            self.session_uri,
+            data=bytes(self.buffer[:size]),
+            headers={"Content-Range": content_range},
+            timeout=60
+        )
+        if total is not None:
+            resp.raise_for_status()
+            self.offset = total
+            self.buffer = bytearray()
+            self.response = resp.json()
+            return
+        if resp.status_code != 308:
+            resp.raise_for_status()
+            raise Exception(f"Respuesta inesperada de Drive: {resp.status_code}")
+        # Drive puede guardar menos de lo enviado; el resto se reenvía
+        committed = self.offset
+        if "Range" in resp.headers:
+            committed = int(resp.headers["Range"].rsplit("-", 1)[1]) + 1
+        del self.buffer[:committed - self.offset]
+        self.offset = committed
+
 # -------- SERVICIO FLASK --------
 app = Flask(__name__)
 
@@ -618,10 +865,40 @@ async def process_format(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"_Por favor, espera un momento..._"
     )
     
-    # Iniciar descarga
-    result = download_video(url, kind)
+    # Destinos que reciben el archivo mientras se descarga: Drive se sube en
+    # paralelo. Telegram, solo si Drive falla, se envía desde el disco
+    sinks = []
+    drive_sink = None
+    if drive_service:
+        try:
+            drive_sink = DriveResumableSink(
+                f"{context.user_data.get('site', 'descarga')} "
+                f"{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                "video/mp4" if kind == "video" else "audio/mpeg"
+            )
+            sinks.append(BackgroundSink(drive_sink, depth=DRIVE_UPLOAD_QUEUE))
+        except Exception as e:
+            logging.error(f"❌ No se pudo iniciar la subida a Drive: {str(e)}")
+            drive_sink = None
+
+    # Iniciar descarga en otro hilo, para que el bot siga respondiendo y el
+    # mensaje de estado muestre el avance
+    progress_key = f"{status_message.chat_id}:{status_message.message_id}"
+    progress_messages[progress_key] = (
+        asyncio.get_running_loop(),
+        status_message,
+        f"⌛ *Descargando...*\n\n"
+        f"📥 Descargando {kind} de {context.user_data.get('site', 'sitio web')}"
+    )
+    try:
+        result = await asyncio.to_thread(download_video, url, kind, sinks, progress_key)
+    finally:
+        progress_messages.pop(progress_key, None)
+        progress_bus.remove(progress_key)
     
     if result["status"] != "success":
+        if drive_sink and drive_sink.response is None:
+            drive_sink.abort(None)
         await status_message.edit_text(
             f"❌ *Error en la descarga*\n\n"
             f"{result.get('message')}\n\n"
@@ -658,7 +935,18 @@ async def process_format(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "_Esto puede tomar unos momentos..._"
         )
         
-        drive_link = upload_to_drive(path)
+        if drive_sink and drive_sink.response:
+            # Ya se subió durante la descarga; solo falta el nombre definitivo
+            try:
+                drive_service.files().update(
+                    fileId=drive_sink.response["id"],
+                    body={"name": os.path.basename(path)}
+                ).execute()
+            except Exception as e:
+                logging.warning(f"⚠️ No se pudo renombrar el archivo en Drive: {str(e)}")
+            drive_link = share_drive_file(drive_sink.response)
+        else:
+            drive_link = upload_to_drive(path)
         
         if not drive_link:
             logging.error("No se pudo obtener el enlace de Drive")
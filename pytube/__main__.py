@@ -6,12 +6,13 @@ exclusively on the developer interface. Pytube offloads the heavy lifting to
 smaller peripheral modules and functions.
 
 """
+import asyncio
 import logging
 from typing import Any, Callable, Dict, List, Optional
 
 import pytube
 import pytube.exceptions as exceptions
-from pytube import extract, request
+from pytube import extract, players, request
 from pytube import Stream, StreamQuery
 from pytube.helpers import install_proxy
 from pytube.innertube import InnerTube
@@ -58,6 +59,7 @@ class YouTube:
         self._vid_info: Optional[Dict] = None  # content fetched from innertube/player
 
         self._watch_html: Optional[str] = None  # the html of /watch?v=<video_id>
+        self._watch_page: Optional[extract.WatchPage] = None  # parsed watch html
         self._embed_html: Optional[str] = None
         self._player_config_args: Optional[Dict] = None  # inline js in the html containing
         self._age_restricted: Optional[bool] = None
@@ -75,7 +77,9 @@ class YouTube:
 
         # Shared between all instances of `Stream` (Borg pattern).
         self.stream_monostate = Monostate(
-            on_progress=on_progress_callback, on_complete=on_complete_callback
+            on_progress=on_progress_callback,
+            on_complete=on_complete_callback,
+            video_id=self.video_id,
         )
 
         if proxies:
@@ -102,6 +106,16 @@ class YouTube:
         self._watch_html = request.get(url=self.watch_url)
         return self._watch_html
 
+    @property
+    def watch_page(self) -> extract.WatchPage:
+        """The data embedded in the watch html, extracted in a single pass.
+
+        :rtype: WatchPage
+        """
+        if self._watch_page is None or self._watch_page.html is not self.watch_html:
+            self._watch_page = extract.WatchPage(self.watch_html)
+        return self._watch_page
+
     @property
     def embed_html(self):
         if self._embed_html:
@@ -113,7 +127,7 @@ class YouTube:
     def age_restricted(self):
         if self._age_restricted:
             return self._age_restricted
-        self._age_restricted = extract.is_age_restricted(self.watch_html)
+        self._age_restricted = self.watch_page.is_age_restricted
         return self._age_restricted
 
     @property
@@ -124,7 +138,7 @@ class YouTube:
         if self.age_restricted:
             self._js_url = extract.js_url(self.embed_html)
         else:
-            self._js_url = extract.js_url(self.watch_html)
+            self._js_url = self.watch_page.js_url
 
         return self._js_url
 
@@ -133,14 +147,12 @@ class YouTube:
         if self._js:
             return self._js
 
-        # If the js_url doesn't match the cached url, fetch the new js and update
-        #  the cache; otherwise, load the cache.
-        if pytube.__js_url__ != self.js_url:
-            self._js = request.get(self.js_url)
-            pytube.__js__ = self._js
-            pytube.__js_url__ = self.js_url
-        else:
-            self._js = pytube.__js__
+        # Players are cached by url, so videos served by different player
+        #  versions don't evict each other's.
+        self._js = players.player_cache.js(self.js_url)
+        # Kept up to date for code reading the old single-player cache.
+        pytube.__js__ = self._js
+        pytube.__js_url__ = self.js_url
 
         return self._js
 
@@ -148,7 +160,7 @@ class YouTube:
     def initial_data(self):
         if self._initial_data:
             return self._initial_data
-        self._initial_data = extract.initial_data(self.watch_html)
+        self._initial_data = self.watch_page.initial_data
         return self._initial_data
 
     @property
@@ -174,18 +186,11 @@ class YouTube:
         self._fmt_streams = []
 
         stream_manifest = extract.apply_descrambler(self.streaming_data)
+        extract.check_stream_urls(stream_manifest, self.vid_info)
 
-        # If the cached js doesn't work, try fetching a new js file
-        # https://github.com/pytube/pytube/issues/1054
-        try:
-            extract.apply_signature(stream_manifest, self.vid_info, self.js)
-        except exceptions.ExtractError:
-            # To force an update to the js file, we clear the cache and retry
-            self._js = None
-            self._js_url = None
-            pytube.__js__ = None
-            pytube.__js_url__ = None
-            extract.apply_signature(stream_manifest, self.vid_info, self.js)
+        # Urls are only signed once a stream's url is read, so building the
+        # query costs nothing for the streams that aren't downloaded.
+        signer = extract.StreamSigner(self._load_cipher, self._reset_js)
 
         # build instances of :class:`Stream <Stream>`
         # Initialize stream objects
@@ -193,6 +198,7 @@ class YouTube:
             video = Stream(
                 stream=stream,
                 monostate=self.stream_monostate,
+                signer=signer,
             )
             self._fmt_streams.append(video)
 
@@ -201,13 +207,26 @@ class YouTube:
 
         return self._fmt_streams
 
+    def _load_cipher(self):
+        """Build the cipher of the video's player, reusing a cached one."""
+        return players.player_cache.cipher(self.js_url, self.js)
+
+    def _reset_js(self) -> None:
+        """Drop the cached js, so it's fetched again on next use."""
+        if self._js_url:
+            # Other videos using this player refetch it too, unless it has
+            #  already been refetched.
+            players.player_cache.invalidate(self._js_url, self._js)
+        self._js = None
+        self._js_url = None
+
     def check_availability(self):
         """Check whether the video is available.
 
         Raises different exceptions based on why the video is unavailable,
         otherwise does nothing.
         """
-        status, messages = extract.playability_status(self.watch_html)
+        status, messages = self.watch_page.playability_status
 
         for reason in messages:
             if status == 'UNPLAYABLE':
@@ -247,6 +266,50 @@ class YouTube:
         self._vid_info = innertube_response
         return self._vid_info
 
+    async def avid_info(self):
+        """Fetch and return the raw vid info without blocking the event loop.
+
+        The result is cached, so :attr:`vid_info` can be used afterwards
+        without making a request.
+
+        :rtype: Dict[Any, Any]
+        """
+        if self._vid_info:
+            return self._vid_info
+
+        innertube = InnerTube(use_oauth=self.use_oauth, allow_cache=self.allow_oauth_cache)
+
+        innertube_response = await innertube.aplayer(self.video_id)
+        self._vid_info = innertube_response
+        return self._vid_info
+
+    async def aprefetch(self):
+        """Fetch everything needed to build the streams without blocking.
+
+        The watch html and the vid info are requested concurrently, followed
+        by the player js if it isn't cached yet. Afterwards :attr:`streams`
+        and the metadata properties don't make any further requests.
+        """
+        async def fetch_watch_html():
+            if not self._watch_html:
+                self._watch_html = await request.aget(url=self.watch_url)
+
+        await asyncio.gather(fetch_watch_html(), self.avid_info())
+
+        if not self._js_url and self.age_restricted and not self._embed_html:
+            self._embed_html = await request.aget(url=self.embed_url)
+        if not self._js:
+            js = players.player_cache.cached_js(self.js_url)
+            if js is None:
+                js = await players.player_store.aload_js(self.js_url, fresh=True)
+            if js is None:
+                js = await request.aget(self.js_url)
+                await players.player_store.astore_js(self.js_url, js)
+            players.player_cache.put_js(self.js_url, js)
+            self._js = js
+            pytube.__js__ = self._js
+            pytube.__js_url__ = self.js_url
+
     def bypass_age_gate(self):
         """Attempt to update the vid_info by bypassing the age gate."""
         innertube = InnerTube(
@@ -320,7 +383,7 @@ class YouTube:
         """
         if self._publish_date:
             return self._publish_date
-        self._publish_date = extract.publish_date(self.watch_html)
+        self._publish_date = self.watch_page.publish_date
         return self._publish_date
 
     @publish_date.setter
@@ -0,0 +1,438 @@
+"""A minimal asyncio HTTP/1.1 client for the async API of :mod:`pytube.request`.
+
+The standard library has no asynchronous HTTP client, so this module speaks
+just enough HTTP/1.1 over :func:`asyncio.open_connection` for pytube's needs:
+keep-alive connections pooled per host, ``Content-Length`` and chunked
+bodies, and redirects. Errors are raised as the same
+:class:`urllib.error.HTTPError` the blocking API raises.
+
+Connections are always made directly. When a proxy is installed,
+:mod:`pytube.request` sends requests through the blocking client in a worker
+thread instead, and wraps the responses in :class:`ThreadedResponse`.
+"""
+import asyncio
+import http.client
+import io
+import logging
+import socket
+import ssl
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+
+logger = logging.getLogger(__name__)
+
+_redirect_codes = {301, 302, 303, 307, 308}
+_max_redirects = 10
+
+
+def _resolve_timeout(timeout) -> Optional[float]:
+    if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+        return socket.getdefaulttimeout()
+    return timeout
+
+
+async def _wait(awaitable, timeout: Optional[float]):
+    if timeout is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, timeout)
+
+
+class _Connection:
+    """A keep-alive connection bound to the event loop that opened it."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.loop = asyncio.get_event_loop()
+
+    @property
+    def usable(self) -> bool:
+        return (
+            self.loop is asyncio.get_event_loop()
+            and not self.writer.is_closing()
+            and not self.reader.at_eof()
+        )
+
+    def close(self):
+        try:
+            self.writer.close()
+        except RuntimeError:
+            # The loop that opened the connection has already been closed.
+            pass
+
+
+class AsyncConnectionPool:
+    """Store of idle asyncio connections, keyed per host."""
+
+    def __init__(self, maxsize: int = 10, idle_timeout: float = 30.0):
+        """Construct an :class:`AsyncConnectionPool <AsyncConnectionPool>`.
+
+        :param int maxsize:
+            Maximum number of idle connections kept per host.
+        :param float idle_timeout:
+            Seconds after which an idle connection is dropped instead of reused.
+        """
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[Tuple, List[Tuple[_Connection, float]]] = {}
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+        self._requests = 0
+
+    def acquire(self, key: Tuple) -> Optional[_Connection]:
+        now = time.monotonic()
+        idle = self._idle.get(key, [])
+        while idle:
+            conn, released_at = idle.pop()
+            if conn.usable and now - released_at <= self.idle_timeout:
+                return conn
+            self._discarded += 1
+            conn.close()
+        return None
+
+    def release(self, key: Tuple, conn: _Connection, reusable: bool):
+        idle = self._idle.setdefault(key, [])
+        if reusable and conn.usable and len(idle) < self.maxsize:
+            idle.append((conn, time.monotonic()))
+            return
+        self._discarded += 1
+        conn.close()
+
+    def clear(self):
+        """Close every idle connection held by the pool."""
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+    def stats(self) -> Dict:
+        """Return counters describing how the pool has been used.
+
+        :rtype: dict
+        """
+        return {
+            'requests': self._requests,
+            'created': self._created,
+            'reused': self._reused,
+            'discarded': self._discarded,
+            'idle': {
+                key[1]: len(connections)
+                for key, connections in self._idle.items()
+                if connections
+            },
+        }
+
+
+class AsyncResponse:
+    """Response to a request made by :func:`urlopen`.
+
+    Mirrors the parts of :class:`http.client.HTTPResponse` that pytube uses,
+    with :meth:`read` as a coroutine.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        method: str,
+        status: int,
+        reason: str,
+        headers: http.client.HTTPMessage,
+        conn: _Connection,
+        release,
+        timeout: Optional[float],
+    ):
+        self.url = url
+        self.status = self.code = status
+        self.reason = self.msg = reason
+        self.headers = headers
+        self._conn = conn
+        self._release = release
+        self._timeout = timeout
+
+        self._chunked = headers.get('Transfer-Encoding', '').lower() == 'chunked'
+        self._chunk_left = 0
+        self._length: Optional[int] = None
+        content_length = headers.get('Content-Length')
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            self._length = 0
+        elif not self._chunked and content_length is not None:
+            self._length = int(content_length)
+        self._keep_alive = headers.get('Connection', '').lower() != 'close' and (
+            self._chunked or self._length is not None
+        )
+        if self._length == 0:
+            self._finish()
+
+    def info(self) -> http.client.HTTPMessage:
+        return self.headers
+
+    def getcode(self) -> int:
+        return self.status
+
+    @property
+    def closed(self) -> bool:
+        return self._conn is None
+
+    async def read(self, amt: Optional[int] = None) -> bytes:
+        """Read and return up to ``amt`` bytes of the body, or all of it.
+
+        :rtype: bytes
+        :returns: The data read, or ``b''`` once the body is exhausted.
+        """
+        if self._conn is None:
+            return b''
+        try:
+            return await _wait(self._read(amt), self._timeout)
+        except asyncio.IncompleteReadError as e:
+            self.close()
+            raise http.client.IncompleteRead(e.partial, e.expected)
+        except BaseException:
+            # A timeout or cancellation leaves unread data on the socket.
+            self.close()
+            raise
+
+    async def _read(self, amt: Optional[int]) -> bytes:
+        reader = self._conn.reader
+        if self._chunked:
+            return await self._read_chunked(amt)
+        if self._length is not None:
+            size = self._length if amt is None else min(amt, self._length)
+            data = await reader.readexactly(size)
+            self._length -= size
+            if self._length == 0:
+                self._finish()
+            return data
+        # No length given: the body runs until the server closes.
+        data = await reader.read(-1 if amt is None else amt)
+        if not data or amt is None:
+            self._keep_alive = False
+            self._finish()
+        return data
+
+    async def _read_chunked(self, amt: Optional[int]) -> bytes:
+        reader = self._conn.reader
+        parts = []
+        received = 0
+        while amt is None or received < amt:
+            if self._chunk_left == 0:
+                line = await reader.readline()
+                size = int(line.split(b';', 1)[0].strip() or b'0', 16)
+                if size == 0:
+                    # Skip any trailers up to the final blank line.
+                    while (await reader.readline()).strip():
+                        pass
+                    self._finish()
+                    break
+                self._chunk_left = size
+            size = self._chunk_left if amt is None else min(self._chunk_left, amt - received)
+            parts.append(await reader.readexactly(size))
+            received += size
+            self._chunk_left -= size
+            if self._chunk_left == 0:
+                await reader.readexactly(2)  # CRLF after each chunk
+        return b''.join(parts)
+
+    def _finish(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._release(conn, self._keep_alive)
+
+    def close(self):
+        """Close the response, discarding the connection if unread data remains."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._release(conn, False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+class ThreadedResponse:
+    """Asynchronous view of a blocking response, read in a worker thread."""
+
+    def __init__(self, response):
+        self._response = response
+        self.url = getattr(response, 'url', None)
+        self.status = self.code = getattr(response, 'status', None)
+        self.reason = self.msg = getattr(response, 'reason', None)
+        self.headers = response.info()
+
+    def info(self) -> http.client.HTTPMessage:
+        return self.headers
+
+    def getcode(self) -> int:
+        return self.status
+
+    @property
+    def closed(self) -> bool:
+        return self._response.closed
+
+    async def read(self, amt: Optional[int] = None) -> bytes:
+        """Read and return up to ``amt`` bytes of the body, or all of it.
+
+        :rtype: bytes
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._response.read, amt)
+
+    def close(self):
+        self._response.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+async def _open(key: Tuple, timeout: Optional[float]) -> _Connection:
+    scheme, host, port = key
+    context = ssl.create_default_context() if scheme == 'https' else None
+    try:
+        reader, writer = await _wait(
+            asyncio.open_connection(
+                host, port, ssl=context, server_hostname=host if context else None
+            ),
+            timeout,
+        )
+    except OSError as e:
+        raise URLError(e)
+    return _Connection(reader, writer)
+
+
+async def _send(conn: _Connection, head: bytes, body: Optional[bytes], timeout):
+    conn.writer.write(head + (body or b''))
+    await _wait(conn.writer.drain(), timeout)
+    status_line = await _wait(conn.reader.readline(), timeout)
+    if not status_line:
+        raise http.client.RemoteDisconnected(
+            'Remote end closed connection without response'
+        )
+    header_lines = []
+    while True:
+        line = await _wait(conn.reader.readline(), timeout)
+        if line in (b'\r\n', b'\n', b''):
+            break
+        header_lines.append(line)
+    return status_line, header_lines
+
+
+async def _request(
+    pool: AsyncConnectionPool,
+    url: str,
+    method: str,
+    headers: Dict[str, str],
+    data: Optional[bytes],
+    timeout: Optional[float],
+) -> AsyncResponse:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError("Invalid URL")
+    port = parts.port or (443 if scheme == 'https' else 80)
+    key = (scheme, parts.hostname, port)
+
+    target = parts.path or '/'
+    if parts.query:
+        target += '?' + parts.query
+    host_header = parts.netloc.rsplit('@', 1)[-1]
+    request_headers = {'Host': host_header, 'Connection': 'keep-alive'}
+    request_headers.update({name.title(): value for name, value in headers.items()})
+    if data is not None:
+        request_headers['Content-Length'] = str(len(data))
+    head = f'{method} {target} HTTP/1.1\r\n'
+    head += ''.join(f'{name}: {value}\r\n' for name, value in request_headers.items())
+    head = (head + '\r\n').encode('latin-1')
+
+    pool._requests += 1
+    conn = pool.acquire(key)
+    response_head = None
+    if conn is not None:
+        try:
+            response_head = await _send(conn, head, data, timeout)
+        except (ConnectionError, http.client.RemoteDisconnected) as e:
+            logger.debug("discarding stale connection to %s: %s", key[1], e)
+            conn.close()
+            conn = None
+        except BaseException:
+            conn.close()
+            raise
+        else:
+            pool._reused += 1
+    if conn is None:
+        conn = await _open(key, timeout)
+        pool._created += 1
+        try:
+            response_head = await _send(conn, head, data, timeout)
+        except BaseException:
+            conn.close()
+            raise
+
+    status_line, header_lines = response_head
+    try:
+        version, status, reason = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+    except ValueError:
+        version, status = status_line.decode('latin-1').rstrip('\r\n').split(' ', 1)
+        reason = ''
+    response_headers = http.client.parse_headers(io.BytesIO(b''.join(header_lines) + b'\r\n'))
+
+    def release(connection, reusable):
+        pool.release(key, connection, reusable and version == 'HTTP/1.1')
+
+    return AsyncResponse(
+        url, method, int(status), reason, response_headers, conn, release, timeout
+    )
+
+
+async def urlopen(
+    pool: AsyncConnectionPool,
+    url: str,
+    method: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    data: Optional[bytes] = None,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+) -> AsyncResponse:
+    """Send a request over a pooled connection and return the response.
+
+    Redirects are followed and error statuses raise
+    :class:`urllib.error.HTTPError`, as :func:`urllib.request.urlopen` does.
+
+    :param AsyncConnectionPool pool:
+        The pool to take connections from.
+    :param str url:
+        The URL to request.
+    :param str method:
+        (Optional) The HTTP method; ``POST`` if ``data`` is given, else ``GET``.
+    :param dict headers:
+        (Optional) Headers to send with the request.
+    :param bytes data:
+        (Optional) The request body.
+    :rtype: AsyncResponse
+    """
+    method = method or ('POST' if data is not None else 'GET')
+    headers = headers or {}
+    timeout = _resolve_timeout(timeout)
+    for _ in range(_max_redirects + 1):
+        response = await _request(pool, url, method, headers, data, timeout)
+        if response.status in _redirect_codes and 'Location' in response.headers:
+            # Drain the body so the connection can be reused.
+            await response.read()
+            url = urljoin(url, response.headers['Location'])
+            if response.status == 303 or (
+                response.status in (301, 302) and method == 'POST'
+            ):
+                method, data = 'GET', None
+            continue
+        if response.status >= 400:
+            response.close()
+            raise HTTPError(
+                url, response.status, response.reason, response.headers, None
+            )
+        return response
+    raise HTTPError(url, response.status, 'Too many redirects', response.headers, None)
@@ -0,0 +1,72 @@
+"""Reusable read buffers for zero-copy streaming.
+
+Reading a media range with ``response.read()`` allocates a new bytes object
+for every chunk, up to the size of the whole range. With ``zero_copy``,
+:func:`pytube.request.stream` instead reads into a buffer borrowed from a
+:class:`BufferPool` with ``readinto`` and yields :class:`memoryview` slices
+of it, so each transfer only ever holds one buffer.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+# Size of each pooled buffer, and so the largest chunk a zero-copy read yields.
+default_buffer_size = 262144  # 256KB
+
+
+class BufferPool:
+    """Thread-safe pool of equally sized :class:`bytearray` buffers."""
+
+    def __init__(self, buffer_size: int = default_buffer_size, max_idle: int = 16):
+        """Construct a :class:`BufferPool <BufferPool>`.
+
+        :param int buffer_size:
+            Size of each buffer, in bytes.
+        :param int max_idle:
+            Number of returned buffers kept for reuse; more are freed.
+        """
+        self.buffer_size = buffer_size
+        self.max_idle = max_idle
+        self._idle: List[bytearray] = []
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+
+    def acquire(self) -> bytearray:
+        """Take a buffer out of the pool, allocating one if none is idle.
+
+        :rtype: bytearray
+        """
+        with self._lock:
+            if self._idle:
+                self._reused += 1
+                return self._idle.pop()
+            self._created += 1
+        return bytearray(self.buffer_size)
+
+    def release(self, buffer: bytearray) -> None:
+        """Give a buffer back once no view of it is in use anymore."""
+        with self._lock:
+            if len(buffer) == self.buffer_size and len(self._idle) < self.max_idle:
+                self._idle.append(buffer)
+
+    @contextmanager
+    def buffer(self) -> Iterator[bytearray]:
+        """Borrow a buffer for the duration of the block."""
+        buffer = self.acquire()
+        try:
+            yield buffer
+        finally:
+            self.release(buffer)
+
+    def stats(self) -> Dict:
+        """Return counters describing how the pool has been used.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'created': self._created,
+                'reused': self._reused,
+                'idle': len(self._idle),
+            }
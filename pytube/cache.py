@@ -0,0 +1,86 @@
+"""Bounded in-memory cache whose entries expire."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class ExpiringCache:
+    """Thread-safe LRU cache with a time-to-live per entry.
+
+    Once ``maxsize`` entries are stored, adding another evicts the least
+    recently used one. Entries are never served after they expire.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 6 * 3600):
+        """Construct an :class:`ExpiringCache <ExpiringCache>`.
+
+        :param int maxsize:
+            Largest number of entries kept.
+        :param float ttl:
+            Seconds an entry stays valid, unless it is given an earlier
+            expiry when stored.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value stored for ``key``, or ``default`` if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, expires: Optional[float] = None) -> None:
+        """Store ``value`` for ``key``.
+
+        :param float expires:
+            (Optional) Unix time after which the entry must not be served, if
+            that is sooner than the cache's ``ttl``.
+        """
+        expires_at = time.time() + self.ttl
+        if expires is not None:
+            expires_at = min(expires_at, expires)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Return the hit, miss, eviction and expiration counters.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+            }
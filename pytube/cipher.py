@@ -12,21 +12,120 @@ functions" (2) maps them to Python equivalents and (3) taking the ciphered
 signature and decoding it.
 
 """
+import functools
 import logging
 import re
+import time
+from contextlib import contextmanager
 from itertools import chain
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Match, Optional, Pattern, Tuple
 
 from pytube.exceptions import ExtractError, RegexMatchError
-from pytube.helpers import cache, regex_search
+from pytube.helpers import cache
 from pytube.parser import find_object_from_startpoint, throttling_array_split
 
 logger = logging.getLogger(__name__)
 
+#: Version of the format written by :meth:`Cipher.to_dict`.
+artifacts_version = 1
+
+_js_func_patterns = (
+    r"\w+\.(\w+)\(\w,(\d+)\)",
+    r"\w+\[(\"\w+\")\]\(\w,(\d+)\)"
+)
+
+
+class JsIndex:
+    """base.js, indexed for the searches of the cipher extraction.
+
+    Searching the whole file for each of the many candidate patterns is the
+    bulk of the work of building a :class:`Cipher`. Every pattern contains
+    some literal, such as ``.set(``, that only occurs a few hundred times, and
+    none of them matches across a ``;`` or ``}``, so a pattern is only
+    searched in the statements around its literal. Those regions are found
+    once per literal and shared by all its patterns.
+    """
+
+    def __init__(self, js: str):
+        self.js = js
+        self._regions: Dict[str, List[Tuple[int, int]]] = {}
+
+    def regions(self, anchor: str) -> List[Tuple[int, int]]:
+        """Return the spans of the statements around each occurrence of ``anchor``.
+
+        Each span runs from the ``;`` or ``}`` before the occurrence up to and
+        including the first one after it. Overlapping spans are merged.
+
+        :rtype: list
+        """
+        regions = self._regions.get(anchor)
+        if regions is not None:
+            return regions
+        js = self.js
+        regions = []
+        pos = js.find(anchor)
+        while pos != -1:
+            start = max(js.rfind(";", 0, pos), js.rfind("}", 0, pos)) + 1
+            ends = [
+                end for end in (
+                    js.find(";", pos + len(anchor)), js.find("}", pos + len(anchor))
+                ) if end != -1
+            ]
+            end = min(ends) + 1 if ends else len(js)
+            if regions and start <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], max(end, regions[-1][1]))
+            else:
+                regions.append((start, end))
+            pos = js.find(anchor, pos + len(anchor))
+        self._regions[anchor] = regions
+        return regions
+
+    def search(self, pattern: Pattern, anchor: str) -> Optional[Match]:
+        """Return the first match of ``pattern`` around ``anchor``, if any.
+
+        :param pattern:
+            A compiled pattern whose every match contains ``anchor``.
+        :param str anchor:
+            A literal string.
+        """
+        for start, end in self.regions(anchor):
+            match = pattern.search(self.js, start, end)
+            if match:
+                return match
+        return None
+
+
+def _match_at(regex: Pattern, js: str, literal: str) -> Optional[Match]:
+    """Return the first match of ``regex`` in ``js`` that starts at ``literal``.
+
+    The same as ``regex.search(js)`` for a pattern whose every match starts
+    with ``literal``, but only the occurrences of the literal are tried.
+    """
+    pos = js.find(literal)
+    while pos != -1:
+        match = regex.match(js, pos)
+        if match:
+            return match
+        pos = js.find(literal, pos + 1)
+    return None
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], phase: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = time.perf_counter() - start
+
 
 class Cipher:
     def __init__(self, js: str):
-        self.transform_plan: List[str] = get_transform_plan(js)
+        #: Seconds spent on each phase of the extraction.
+        self.timings: Dict[str, float] = {}
+        index = JsIndex(js)
+        with _timed(self.timings, "transform_plan"):
+            self.transform_plan: List[str] = get_transform_plan(js, index)
         var_regex = re.compile(r"^\w+\W")
         var_match = var_regex.search(self.transform_plan[0])
         if not var_match:
@@ -34,44 +133,111 @@ class Cipher:
                 caller="__init__", pattern=var_regex.pattern
             )
         var = var_match.group(0)[:-1]
-        self.transform_map = get_transform_map(js, var)
-        self.js_func_patterns = [
-            r"\w+\.(\w+)\(\w,(\d+)\)",
-            r"\w+\[(\"\w+\")\]\(\w,(\d+)\)"
-        ]
-
-        self.throttling_plan = get_throttling_plan(js)
-        self.throttling_array = get_throttling_function_array(js)
-
-        self.calculated_n = None
-
-    def calculate_n(self, initial_n: list):
-        """Converts n to the correct value to prevent throttling."""
-        if self.calculated_n:
-            return self.calculated_n
-
-        # First, update all instances of 'b' with the list(initial_n)
-        for i in range(len(self.throttling_array)):
-            if self.throttling_array[i] == 'b':
-                self.throttling_array[i] = initial_n
-
-        for step in self.throttling_plan:
-            curr_func = self.throttling_array[int(step[0])]
-            if not callable(curr_func):
-                logger.debug(f'{curr_func} is not callable.')
-                logger.debug(f'Throttling array:\n{self.throttling_array}\n')
-                raise ExtractError(f'{curr_func} is not callable.')
-
-            first_arg = self.throttling_array[int(step[1])]
+        with _timed(self.timings, "transform_map"):
+            self.transform_map = get_transform_map(js, var)
+        self.js_func_patterns = list(_js_func_patterns)
+
+        with _timed(self.timings, "throttling_code"):
+            raw_code = get_throttling_function_code(js, index)
+        with _timed(self.timings, "throttling_plan"):
+            self.throttling_plan = get_throttling_plan(js, raw_code)
+        with _timed(self.timings, "throttling_array"):
+            self.throttling_array = get_throttling_function_array(js, raw_code)
+
+        self._calculate_n: Optional[Callable[[str], str]] = None
+        self._signature_steps: Optional[Tuple[Tuple[Callable, int], ...]] = None
+        logger.debug(
+            "extracted cipher in %.1fms (%s)",
+            sum(self.timings.values()) * 1000,
+            ", ".join(
+                f"{phase}: {seconds * 1000:.1f}ms"
+                for phase, seconds in self.timings.items()
+            ),
+        )
 
-            if len(step) == 2:
-                curr_func(first_arg)
-            elif len(step) == 3:
-                second_arg = self.throttling_array[int(step[2])]
-                curr_func(first_arg, second_arg)
+    def to_dict(self) -> Dict:
+        """Return what was extracted from the js, in a JSON serializable form.
 
-        self.calculated_n = ''.join(initial_n)
-        return self.calculated_n
+        :rtype: dict
+        """
+        array = []
+        for el in self.throttling_array:
+            if el is self.throttling_array:
+                array.append({"self": True})
+            elif callable(el):
+                array.append({"fn": el.__name__})
+            else:
+                array.append(el)
+        return {
+            "version": artifacts_version,
+            "transform_plan": self.transform_plan,
+            "transform_map": {
+                name: fn.__name__ for name, fn in self.transform_map.items()
+            },
+            "throttling_plan": [list(step) for step in self.throttling_plan],
+            "throttling_array": array,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Cipher":
+        """Rebuild a :class:`Cipher` from the output of :meth:`to_dict`,
+        without parsing the js again.
+
+        :raises ValueError:
+            If ``data`` is in an unknown format.
+        :rtype: Cipher
+        """
+        if data.get("version") != artifacts_version:
+            raise ValueError(f"unknown cipher format {data.get('version')!r}")
+        try:
+            cipher = cls.__new__(cls)
+            cipher.transform_plan = list(data["transform_plan"])
+            cipher.transform_map = {
+                name: _serializable_functions[fn]
+                for name, fn in data["transform_map"].items()
+            }
+            cipher.js_func_patterns = list(_js_func_patterns)
+            cipher.throttling_plan = [
+                tuple(step) for step in data["throttling_plan"]
+            ]
+            array: List[Any] = []
+            for el in data["throttling_array"]:
+                if isinstance(el, dict):
+                    if el.get("self"):
+                        el = array
+                    else:
+                        el = _serializable_functions[el["fn"]]
+                array.append(el)
+            cipher.throttling_array = array
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"malformed cipher data: {e!r}") from e
+        cipher._calculate_n = None
+        cipher._signature_steps = None
+        cipher.timings = {}
+        return cipher
+
+    def calculate_n(self, initial_n) -> str:
+        """Converts n to the correct value to prevent throttling.
+
+        Doesn't modify the cipher, so it can be called for any number of
+        videos, from any number of threads. Results are memoized per cipher,
+        keyed by ``n`` alone.
+
+        :param initial_n:
+            The ``n`` query parameter of a stream url, as a string or a list
+            of characters.
+        :rtype: str
+        """
+        if self._calculate_n is None:
+            plan = tuple(tuple(step) for step in self.throttling_plan)
+            array = tuple(
+                _array_self if el is self.throttling_array else el
+                for el in self.throttling_array
+            )
+            self._calculate_n = functools.lru_cache(maxsize=1024)(
+                functools.partial(transform_n, plan, array)
+            )
+        return self._calculate_n("".join(initial_n))
 
     def get_signature(self, ciphered_signature: str) -> str:
         """Decipher the signature.
@@ -84,24 +250,25 @@ class Cipher:
         :returns:
             Decrypted signature required to download the media content.
         """
-        signature = list(ciphered_signature)
-
-        for js_func in self.transform_plan:
-            name, argument = self.parse_function(js_func)  # type: ignore
-            signature = self.transform_map[name](signature, argument)
+        if self._signature_steps is None:
+            steps = []
+            for js_func in self.transform_plan:
+                name, argument = self.parse_function(js_func)  # type: ignore
+                steps.append((self.transform_map[name], argument))
+            self._signature_steps = tuple(steps)
+
+        # The transforms only move characters around, so they are compiled
+        # into the positions the output takes its characters from.
+        positions = compile_signature_permutation(
+            self._signature_steps, len(ciphered_signature)
+        )
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                "applied transform function\n"
-                "output: %s\n"
-                "js_function: %s\n"
-                "argument: %d\n"
-                "function: %s",
-                "".join(signature),
-                name,
-                argument,
-                self.transform_map[name],
+                "applied transform plan %s: %s",
+                self.transform_plan,
+                [fn.__name__ for fn, _ in self._signature_steps],
             )
-
-        return "".join(signature)
+        return "".join(map(ciphered_signature.__getitem__, positions))
 
     @cache
     def parse_function(self, js_func: str) -> Tuple[str, int]:
@@ -135,33 +302,113 @@ class Cipher:
         )
 
 
-def get_initial_function_name(js: str) -> str:
+# Patterns for the name of the signature function, by priority, each with a
+# literal that every match contains.
+_initial_function_patterns = [
+    (r"\b[cs]\s*&&\s*[adf]\.set\([^,]+\s*,\s*encodeURIComponent\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(", ".set("),  # noqa: E501
+    (r"\b[a-zA-Z0-9]+\s*&&\s*[a-zA-Z0-9]+\.set\([^,]+\s*,\s*encodeURIComponent\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(", ".set("),  # noqa: E501
+    (r'(?:\b|[^a-zA-Z0-9$])(?P<sig>[a-zA-Z0-9$]{2})\s*=\s*function\(\s*a\s*\)\s*{\s*a\s*=\s*a\.split\(\s*""\s*\)', ".split("),  # noqa: E501
+    (r'(?P<sig>[a-zA-Z0-9$]+)\s*=\s*function\(\s*a\s*\)\s*{\s*a\s*=\s*a\.split\(\s*""\s*\)', ".split("),  # noqa: E501
+    (r'(["\'])signature\1\s*,\s*(?P<sig>[a-zA-Z0-9$]+)\(', "signature"),
+    (r"\.sig\|\|(?P<sig>[a-zA-Z0-9$]+)\(", ".sig||"),
+    (r"yt\.akamaized\.net/\)\s*\|\|\s*.*?\s*[cs]\s*&&\s*[adf]\.set\([^,]+\s*,\s*(?:encodeURIComponent\s*\()?\s*(?P<sig>[a-zA-Z0-9$]+)\(", "yt.akamaized.net/)"),  # noqa: E501
+    (r"\b[cs]\s*&&\s*[adf]\.set\([^,]+\s*,\s*(?P<sig>[a-zA-Z0-9$]+)\(", ".set("),  # noqa: E501
+    (r"\b[a-zA-Z0-9]+\s*&&\s*[a-zA-Z0-9]+\.set\([^,]+\s*,\s*(?P<sig>[a-zA-Z0-9$]+)\(", ".set("),  # noqa: E501
+    (r"\bc\s*&&\s*a\.set\([^,]+\s*,\s*\([^)]*\)\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(", ".set("),  # noqa: E501
+    (r"\bc\s*&&\s*[a-zA-Z0-9]+\.set\([^,]+\s*,\s*\([^)]*\)\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(", ".set("),  # noqa: E501
+    (r"\bc\s*&&\s*[a-zA-Z0-9]+\.set\([^,]+\s*,\s*\([^)]*\)\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(", ".set("),  # noqa: E501
+]
+
+
+# Stands for the throttling array itself in the arguments of transform_n.
+_array_self = object()
+
+
+def transform_n(plan: Tuple[Tuple[str, ...], ...], array: Tuple, n: str) -> str:
+    """Run the throttling plan of a player on ``n``.
+
+    Works on a copy of the throttling array, so it's safe to call
+    concurrently.
+
+    :param tuple plan:
+        The throttling plan, as returned by :func:`get_throttling_plan`.
+    :param tuple array:
+        The throttling array, as returned by
+        :func:`get_throttling_function_array`, with ``_array_self`` in place
+        of references to the array itself.
+    :param str n:
+        The initial value of ``n``.
+    :rtype: str
+    """
+    initial_n = list(n)
+    working: List[Any] = []
+    for el in array:
+        if el is _array_self:
+            el = working
+        elif el == 'b':
+            # Every occurrence of 'b' refers to the same list.
+            el = initial_n
+        working.append(el)
+
+    for step in plan:
+        curr_func = working[int(step[0])]
+        if not callable(curr_func):
+            logger.debug(f'{curr_func} is not callable.')
+            logger.debug(f'Throttling array:\n{working}\n')
+            raise ExtractError(f'{curr_func} is not callable.')
+
+        first_arg = working[int(step[1])]
+
+        if len(step) == 2:
+            curr_func(first_arg)
+        elif len(step) == 3:
+            second_arg = working[int(step[2])]
+            curr_func(first_arg, second_arg)
+
+    return ''.join(initial_n)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_signature_permutation(
+    steps: Tuple[Tuple[Callable, int], ...], length: int
+) -> Tuple[int, ...]:
+    """Compile signature transforms into a single permutation.
+
+    Applies the transforms to the positions ``0..length-1`` instead of the
+    characters of a signature. The results are cached, so a player only
+    compiles its plan once for each signature length.
+
+    :param tuple steps:
+        ``(function, argument)`` pairs, such as ``(swap, 3)``, applied in
+        order.
+    :param int length:
+        Length of the ciphered signature.
+    :rtype: tuple
+    :returns:
+        The position in the ciphered signature of each character of the
+        deciphered one.
+    """
+    positions = list(range(length))
+    for fn, argument in steps:
+        positions = fn(positions, argument)
+    return tuple(positions)
+
+
+def get_initial_function_name(js: str, index: Optional[JsIndex] = None) -> str:
     """Extract the name of the function responsible for computing the signature.
     :param str js:
         The contents of the base.js asset file.
+    :param JsIndex index:
+        (Optional) An index of ``js`` to search first.
     :rtype: str
     :returns:
         Function name from regex match
     """
-
-    function_patterns = [
-        r"\b[cs]\s*&&\s*[adf]\.set\([^,]+\s*,\s*encodeURIComponent\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(",  # noqa: E501
-        r"\b[a-zA-Z0-9]+\s*&&\s*[a-zA-Z0-9]+\.set\([^,]+\s*,\s*encodeURIComponent\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(",  # noqa: E501
-        r'(?:\b|[^a-zA-Z0-9$])(?P<sig>[a-zA-Z0-9$]{2})\s*=\s*function\(\s*a\s*\)\s*{\s*a\s*=\s*a\.split\(\s*""\s*\)',  # noqa: E501
-        r'(?P<sig>[a-zA-Z0-9$]+)\s*=\s*function\(\s*a\s*\)\s*{\s*a\s*=\s*a\.split\(\s*""\s*\)',  # noqa: E501
-        r'(["\'])signature\1\s*,\s*(?P<sig>[a-zA-Z0-9$]+)\(',
-        r"\.sig\|\|(?P<sig>[a-zA-Z0-9$]+)\(",
-        r"yt\.akamaized\.net/\)\s*\|\|\s*.*?\s*[cs]\s*&&\s*[adf]\.set\([^,]+\s*,\s*(?:encodeURIComponent\s*\()?\s*(?P<sig>[a-zA-Z0-9$]+)\(",  # noqa: E501
-        r"\b[cs]\s*&&\s*[adf]\.set\([^,]+\s*,\s*(?P<sig>[a-zA-Z0-9$]+)\(",  # noqa: E501
-        r"\b[a-zA-Z0-9]+\s*&&\s*[a-zA-Z0-9]+\.set\([^,]+\s*,\s*(?P<sig>[a-zA-Z0-9$]+)\(",  # noqa: E501
-        r"\bc\s*&&\s*a\.set\([^,]+\s*,\s*\([^)]*\)\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(",  # noqa: E501
-        r"\bc\s*&&\s*[a-zA-Z0-9]+\.set\([^,]+\s*,\s*\([^)]*\)\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(",  # noqa: E501
-        r"\bc\s*&&\s*[a-zA-Z0-9]+\.set\([^,]+\s*,\s*\([^)]*\)\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(",  # noqa: E501
-    ]
     logger.debug("finding initial function name")
-    for pattern in function_patterns:
-        regex = re.compile(pattern)
-        function_match = regex.search(js)
+    if index is None:
+        index = JsIndex(js)
+    for pattern, anchor in _initial_function_patterns:
+        function_match = index.search(re.compile(pattern), anchor)
         if function_match:
             logger.debug("finished regex search, matched: %s", pattern)
             return function_match.group(1)
@@ -171,7 +418,7 @@ def get_initial_function_name(js: str) -> str:
     )
 
 
-def get_transform_plan(js: str) -> List[str]:
+def get_transform_plan(js: str, index: Optional[JsIndex] = None) -> List[str]:
     """Extract the "transform plan".
 
     The "transform plan" is the functions that the ciphered signature is
@@ -179,6 +426,8 @@ def get_transform_plan(js: str) -> List[str]:
 
     :param str js:
         The contents of the base.js asset file.
+    :param JsIndex index:
+        (Optional) An index of ``js`` to search first.
 
     **Example**:
 
@@ -191,10 +440,13 @@ def get_transform_plan(js: str) -> List[str]:
     'DE.VR(a,3)',
     'DE.kT(a,21)']
     """
-    name = re.escape(get_initial_function_name(js))
-    pattern = r"%s=function\(\w\){[a-z=\.\(\"\)]*;(.*);(?:.+)}" % name
+    name = get_initial_function_name(js, index)
+    pattern = r"%s=function\(\w\){[a-z=\.\(\"\)]*;(.*);(?:.+)}" % re.escape(name)
     logger.debug("getting transform plan")
-    return regex_search(pattern, js, group=1).split(";")
+    plan_match = _match_at(re.compile(pattern), js, f"{name}=function(")
+    if not plan_match:
+        raise RegexMatchError(caller="get_transform_plan", pattern=pattern)
+    return plan_match.group(1).split(";")
 
 
 def get_transform_object(js: str, var: str) -> List[str]:
@@ -222,7 +474,7 @@ def get_transform_object(js: str, var: str) -> List[str]:
     pattern = r"var %s={(.*?)};" % re.escape(var)
     logger.debug("getting transform object")
     regex = re.compile(pattern, flags=re.DOTALL)
-    transform_match = regex.search(js)
+    transform_match = _match_at(regex, js, f"var {var}={{")
     if not transform_match:
         raise RegexMatchError(caller="get_transform_object", pattern=pattern)
 
@@ -252,11 +504,13 @@ def get_transform_map(js: str, var: str) -> Dict:
     return mapper
 
 
-def get_throttling_function_name(js: str) -> str:
+def get_throttling_function_name(js: str, index: Optional[JsIndex] = None) -> str:
     """Extract the name of the function that computes the throttling parameter.
 
     :param str js:
         The contents of the base.js asset file.
+    :param JsIndex index:
+        (Optional) An index of ``js`` to search first.
     :rtype: str
     :returns:
         The name of the function used to compute the throttling parameter.
@@ -273,9 +527,10 @@ def get_throttling_function_name(js: str) -> str:
         r'\([a-z]\s*=\s*([a-zA-Z0-9$]+)(\[\d+\])?\([a-z]\)',
     ]
     logger.debug('Finding throttling function name')
+    if index is None:
+        index = JsIndex(js)
     for pattern in function_patterns:
-        regex = re.compile(pattern)
-        function_match = regex.search(js)
+        function_match = index.search(re.compile(pattern), '.get("n")')
         if function_match:
             logger.debug("finished regex search, matched: %s", pattern)
             if len(function_match.groups()) == 1:
@@ -283,10 +538,12 @@ def get_throttling_function_name(js: str) -> str:
             idx = function_match.group(2)
             if idx:
                 idx = idx.strip("[]")
-                array = re.search(
-                    r'var {nfunc}\s*=\s*(\[.+?\]);'.format(
-                        nfunc=re.escape(function_match.group(1))),
-                    js
+                nfunc = function_match.group(1)
+                array = _match_at(
+                    re.compile(r'var {nfunc}\s*=\s*(\[.+?\]);'.format(
+                        nfunc=re.escape(nfunc))),
+                    js,
+                    f"var {nfunc}"
                 )
                 if array:
                     array = array.group(1).strip("[]").split(",")
@@ -298,22 +555,24 @@ def get_throttling_function_name(js: str) -> str:
     )
 
 
-def get_throttling_function_code(js: str) -> str:
+def get_throttling_function_code(js: str, index: Optional[JsIndex] = None) -> str:
     """Extract the raw code for the throttling function.
 
     :param str js:
         The contents of the base.js asset file.
+    :param JsIndex index:
+        (Optional) An index of ``js`` to search first.
     :rtype: str
     :returns:
         The name of the function used to compute the throttling parameter.
     """
     # Begin by extracting the correct function name
-    name = re.escape(get_throttling_function_name(js))
+    name = get_throttling_function_name(js, index)
 
     # Identify where the function is defined
-    pattern_start = r"%s=function\(\w\)" % name
+    pattern_start = r"%s=function\(\w\)" % re.escape(name)
     regex = re.compile(pattern_start)
-    match = regex.search(js)
+    match = _match_at(regex, js, f"{name}=function(")
 
     # Extract the code within curly braces for the function itself, and merge any split lines
     code_lines_list = find_object_from_startpoint(js, match.span()[1]).split('\n')
@@ -323,15 +582,19 @@ def get_throttling_function_code(js: str) -> str:
     return match.group(0) + joined_lines
 
 
-def get_throttling_function_array(js: str) -> List[Any]:
+def get_throttling_function_array(js: str, raw_code: Optional[str] = None) -> List[Any]:
     """Extract the "c" array.
 
     :param str js:
         The contents of the base.js asset file.
+    :param str raw_code:
+        (Optional) The code of the throttling function, if already extracted
+        with :func:`get_throttling_function_code`.
     :returns:
         The array of various integers, arrays, and functions.
     """
-    raw_code = get_throttling_function_code(js)
+    if raw_code is None:
+        raw_code = get_throttling_function_code(js)
 
     array_start = r",c=\["
     array_regex = re.compile(array_start)
@@ -389,7 +652,7 @@ def get_throttling_function_array(js: str) -> List[Any]:
     return converted_array
 
 
-def get_throttling_plan(js: str):
+def get_throttling_plan(js: str, raw_code: Optional[str] = None):
     """Extract the "throttling plan".
 
     The "throttling plan" is a list of tuples used for calling functions
@@ -399,10 +662,14 @@ def get_throttling_plan(js: str):
 
     :param str js:
         The contents of the base.js asset file.
+    :param str raw_code:
+        (Optional) The code of the throttling function, if already extracted
+        with :func:`get_throttling_function_code`.
     :returns:
         The full function code for computing the throttlign parameter.
     """
-    raw_code = get_throttling_function_code(js)
+    if raw_code is None:
+        raw_code = get_throttling_function_code(js)
 
     transform_start = r"try{"
     plan_regex = re.compile(transform_start)
@@ -695,3 +962,22 @@ def map_functions(js_func: str) -> Callable:
         if re.search(pattern, js_func):
             return fn
     raise RegexMatchError(caller="map_functions", pattern="multiple")
+
+
+# Python equivalents of the js functions, by name, for Cipher.from_dict.
+_serializable_functions: Dict[str, Callable] = {
+    fn.__name__: fn
+    for fn in (
+        reverse,
+        splice,
+        swap,
+        throttling_reverse,
+        throttling_push,
+        throttling_unshift,
+        throttling_cipher_function,
+        throttling_nested_splice,
+        throttling_prepend,
+        throttling_swap,
+        js_splice,
+    )
+}
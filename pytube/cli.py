@@ -9,12 +9,15 @@ import shutil
 import sys
 import datetime as dt
 import subprocess  # nosec
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from typing import List, Optional
 
 import pytube.exceptions as exceptions
 from pytube import __version__
 from pytube import CaptionQuery, Playlist, Stream, YouTube
 from pytube.helpers import safe_filename, setup_logger
+from pytube.mux import mux_streams
+from pytube.progress import ProgressBus, ProgressEvent
 
 
 logger = logging.getLogger(__name__)
@@ -82,7 +85,11 @@ def _perform_args_on_youtube(
         )
     if args.ffmpeg:
         ffmpeg_process(
-            youtube=youtube, resolution=args.ffmpeg, target=args.target
+            youtube=youtube,
+            resolution=args.ffmpeg,
+            target=args.target,
+            piped=args.ffmpeg_pipe,
+            builtin=args.builtin_mux,
         )
 
 
@@ -176,6 +183,22 @@ def _parse_args(
             "Runs the command line program ffmpeg to combine the audio and video"
         ),
     )
+    parser.add_argument(
+        "--ffmpeg-pipe",
+        action="store_true",
+        help=(
+            "With --ffmpeg, download the audio and video at the same time and "
+            "pipe them straight into ffmpeg instead of through temporary files"
+        ),
+    )
+    parser.add_argument(
+        "--builtin-mux",
+        action="store_true",
+        help=(
+            "With --ffmpeg, combine mp4 audio and video with pytube's own muxer "
+            "while they download, without running ffmpeg"
+        ),
+    )
 
     return parser.parse_args(args)
 
@@ -248,6 +271,51 @@ def on_progress(
     display_progress_bar(bytes_received, filesize)
 
 
+def progress_renderer(ch: str = "█", scale: float = 0.55):
+    """Return a :class:`ProgressBus <pytube.progress.ProgressBus>` subscriber
+    drawing one progress bar per stream, plus their total when there are
+    several, redrawn in place.
+
+    Example:
+    ~~~~~~~~
+    video 1080p |██████████████████████                 |  55.0%
+    audio 128kbps |█████████████████████████████████████| 100.0%
+    total |█████████████████████████                    |  62.3%
+
+    :param str ch:
+        Character to use for presenting progress segment.
+    :param float scale:
+        Scale multiplier to reduce progress bar size.
+    """
+    drawn = 0
+
+    def render(event: ProgressEvent) -> None:
+        nonlocal drawn
+        rows = [
+            (task.label, task.received, task.total) for task in event.tasks
+        ]
+        if len(rows) > 1:
+            rows.append(("total",) + event.progress())
+        # Terminal size is looked up once per coalesced event, not per chunk.
+        max_width = int(shutil.get_terminal_size().columns * scale)
+        label_width = max(len(label) for label, _, _ in rows)
+        lines = []
+        for label, received, total in rows:
+            fraction = min(1.0, received / total) if total else 0.0
+            filled = int(round(max_width * fraction))
+            progress_bar = ch * filled + " " * (max_width - filled)
+            lines.append(
+                f"{label:<{label_width}} |{progress_bar}| {100 * fraction:5.1f}%"
+            )
+        # Move back up over the bars drawn last time.
+        up = f"\x1b[{drawn}F" if drawn else ""
+        sys.stdout.write(up + "\n".join(lines) + "\n")
+        sys.stdout.flush()
+        drawn = len(lines)
+
+    return render
+
+
 def _download(
     stream: Stream,
     target: Optional[str] = None,
@@ -287,7 +355,11 @@ def _unique_name(base: str, subtype: str, media_type: str, target: str) -> str:
 
 
 def ffmpeg_process(
-    youtube: YouTube, resolution: str, target: Optional[str] = None
+    youtube: YouTube,
+    resolution: str,
+    target: Optional[str] = None,
+    piped: bool = False,
+    builtin: bool = False,
 ) -> None:
     """
     Decides the correct video stream to download, then calls _ffmpeg_downloader.
@@ -298,8 +370,18 @@ def ffmpeg_process(
         YouTube video resolution.
     :param str target:
         Target directory for download
+    :param bool piped:
+        Download both streams at once and pipe them into ffmpeg with
+        _ffmpeg_pipe_downloader.
+    :param bool builtin:
+        Combine the streams with pytube's own muxer through
+        _builtin_mux_downloader; mp4 streams are preferred.
     """
-    youtube.register_on_progress_callback(on_progress)
+    # Audio and video may download at once; show them as one multi-bar.
+    progress = ProgressBus()
+    progress.subscribe(progress_renderer())
+    youtube.register_on_progress_callback(progress.on_progress)
+    youtube.register_on_complete_callback(progress.on_complete)
     target = target or os.getcwd()
 
     if resolution == "best":
@@ -313,7 +395,7 @@ def ffmpeg_process(
             .order_by("resolution")
             .last()
         )
-        if highest_quality_stream.resolution == mp4_stream.resolution:
+        if builtin or highest_quality_stream.resolution == mp4_stream.resolution:
             video_stream = mp4_stream
         else:
             video_stream = highest_quality_stream
@@ -339,7 +421,13 @@ def ffmpeg_process(
     if not audio_stream:
         print("Could not find an audio only stream")
         sys.exit()
-    _ffmpeg_downloader(
+    if builtin:
+        downloader = _builtin_mux_downloader
+    elif piped:
+        downloader = _ffmpeg_pipe_downloader
+    else:
+        downloader = _ffmpeg_downloader
+    downloader(
         audio_stream=audio_stream, video_stream=video_stream, target=target
     )
 
@@ -402,6 +490,111 @@ def _ffmpeg_downloader(
     os.unlink(audio_path)
 
 
+def _ffmpeg_pipe_downloader(
+    audio_stream: Stream, video_stream: Stream, target: str
+) -> None:
+    """
+    Downloads the audio and video streams at the same time and feeds each to
+    ffmpeg through its own pipe as it arrives, so muxing overlaps downloading
+    and no intermediate files are written. Falls back to _ffmpeg_downloader on
+    platforms that can't hand extra pipes to a child process.
+
+    :param Stream audio_stream:
+        A valid Stream object representing the audio to download
+    :param Stream video_stream:
+        A valid Stream object representing the video to download
+    :param Path target:
+        A valid Path object
+    """
+    if os.name != "posix":
+        _ffmpeg_downloader(
+            audio_stream=audio_stream, video_stream=video_stream, target=target
+        )
+        return
+
+    final_path = os.path.join(
+        target, f"{safe_filename(video_stream.title)}.{video_stream.subtype}"
+    )
+    filesize_megabytes = (video_stream.filesize + audio_stream.filesize) // 1048576
+    print(f"{os.path.basename(final_path)} | {filesize_megabytes} MB")
+
+    video_read, video_write = os.pipe()
+    audio_read, audio_write = os.pipe()
+    try:
+        process = subprocess.Popen(  # nosec
+            [
+                "ffmpeg",
+                "-i",
+                f"pipe:{video_read}",
+                "-i",
+                f"pipe:{audio_read}",
+                "-codec",
+                "copy",
+                final_path,
+            ],
+            pass_fds=(video_read, audio_read),
+        )
+    except BaseException:
+        os.close(video_write)
+        os.close(audio_write)
+        raise
+    finally:
+        # ffmpeg holds its own copies of the read ends.
+        os.close(video_read)
+        os.close(audio_read)
+
+    def feed(stream: Stream, fd: int) -> None:
+        with open(fd, "wb") as fh:
+            stream.stream_to_buffer(fh)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(feed, video_stream, video_write),
+            executor.submit(feed, audio_stream, audio_write),
+        ]
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        failed = [future for future in done if future.exception()]
+        if failed:
+            # Stopping ffmpeg breaks the other pipe, which ends the other download.
+            process.kill()
+    process.wait()
+    if failed:
+        if os.path.exists(final_path):
+            os.unlink(final_path)
+        raise failed[0].exception()
+
+
+def _builtin_mux_downloader(
+    audio_stream: Stream, video_stream: Stream, target: str
+) -> None:
+    """
+    Downloads the audio and video streams at the same time and combines them
+    with pytube's fragmented MP4 muxer as they arrive, without ffmpeg or any
+    intermediate files. Streams that aren't both mp4 are handed to
+    _ffmpeg_downloader instead.
+
+    :param Stream audio_stream:
+        A valid Stream object representing the audio to download
+    :param Stream video_stream:
+        A valid Stream object representing the video to download
+    :param Path target:
+        A valid Path object
+    """
+    if video_stream.subtype != "mp4" or audio_stream.subtype != "mp4":
+        print("The built-in muxer only combines mp4 streams, using ffmpeg")
+        _ffmpeg_downloader(
+            audio_stream=audio_stream, video_stream=video_stream, target=target
+        )
+        return
+
+    final_path = os.path.join(
+        target, f"{safe_filename(video_stream.title)}.{video_stream.subtype}"
+    )
+    filesize_megabytes = (video_stream.filesize + audio_stream.filesize) // 1048576
+    print(f"{os.path.basename(final_path)} | {filesize_megabytes} MB")
+    mux_streams(video_stream, audio_stream, final_path)
+
+
 def download_by_itag(
     youtube: YouTube, itag: int, target: Optional[str] = None
 ) -> None:
@@ -0,0 +1,189 @@
+"""Content-Encoding negotiation and streaming decompression.
+
+Watch pages and InnerTube replies are large and compress several-fold, so
+:func:`pytube.request.get` and :func:`pytube.request.post` ask for
+``gzip``/``deflate`` (and ``br`` if a brotli module is installed) and decode
+the body incrementally as it is read.
+"""
+import zlib
+from typing import List, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Size of the raw reads made while filling a decoded read.
+raw_chunk_size = 65536
+
+accept_encoding = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+
+class _DeflateDecoder:
+    """Decode ``deflate`` bodies, which servers send with or without a zlib header."""
+
+    def __init__(self):
+        self._first = True
+        self._obj = zlib.decompressobj()
+
+    def decompress(self, data: bytes) -> bytes:
+        if not self._first:
+            return self._obj.decompress(data)
+        self._first = False
+        try:
+            return self._obj.decompress(data)
+        except zlib.error:
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _GzipDecoder:
+    def __init__(self):
+        self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+        # brotli names it ``process``, brotlicffi ``decompress``.
+        self.decompress = getattr(self._obj, "process", None) or self._obj.decompress
+
+    def flush(self) -> bytes:
+        return b""
+
+
+_decoders = {
+    "gzip": _GzipDecoder,
+    "x-gzip": _GzipDecoder,
+    "deflate": _DeflateDecoder,
+}
+if brotli is not None:
+    _decoders["br"] = _BrotliDecoder
+
+
+class _MultiDecoder:
+    """Undo several encodings, applied in the order they are listed."""
+
+    def __init__(self, decoders: List):
+        self._decoders = decoders
+
+    def decompress(self, data: bytes) -> bytes:
+        for decoder in reversed(self._decoders):
+            data = decoder.decompress(data)
+        return data
+
+    def flush(self) -> bytes:
+        data = b""
+        for decoder in reversed(self._decoders):
+            data = (decoder.decompress(data) if data else b"") + decoder.flush()
+        return data
+
+
+def get_decoder(content_encoding: Optional[str]):
+    """Return a decoder for a ``Content-Encoding`` header, or ``None``.
+
+    :raises ValueError:
+        If the encoding isn't supported.
+    """
+    if not isinstance(content_encoding, str):
+        return None
+    names = [
+        name.strip().lower() for name in content_encoding.split(",")
+        if name.strip() and name.strip().lower() != "identity"
+    ]
+    if not names:
+        return None
+    try:
+        decoders = [_decoders[name]() for name in names]
+    except KeyError as e:
+        raise ValueError(f"unsupported Content-Encoding: {e.args[0]}")
+    return decoders[0] if len(decoders) == 1 else _MultiDecoder(decoders)
+
+
+class DecodedResponse:
+    """Wrap a response so :meth:`read` returns the decoded body.
+
+    Anything other than :meth:`read` is delegated to the wrapped response.
+    """
+
+    def __init__(self, response, decoder):
+        self._response = response
+        self._decoder = decoder
+        self._buffer = bytearray()
+        self._eof = False
+
+    def _fill(self, amt: Optional[int]) -> None:
+        while not self._eof and (amt is None or len(self._buffer) < amt):
+            raw = self._response.read(raw_chunk_size)
+            if raw:
+                self._buffer += self._decoder.decompress(raw)
+            else:
+                self._buffer += self._decoder.flush()
+                self._eof = True
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """Read and return up to ``amt`` decoded bytes, or the rest of the body."""
+        self._fill(amt)
+        return self._take(amt)
+
+    def _take(self, amt: Optional[int]) -> bytes:
+        if amt is None or amt >= len(self._buffer):
+            data, self._buffer = bytes(self._buffer), bytearray()
+        else:
+            data = bytes(self._buffer[:amt])
+            del self._buffer[:amt]
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._response.close()
+
+
+class AsyncDecodedResponse(DecodedResponse):
+    """:class:`DecodedResponse` for :class:`pytube.aio.AsyncResponse`."""
+
+    async def _afill(self, amt: Optional[int]) -> None:
+        while not self._eof and (amt is None or len(self._buffer) < amt):
+            raw = await self._response.read(raw_chunk_size)
+            if raw:
+                self._buffer += self._decoder.decompress(raw)
+            else:
+                self._buffer += self._decoder.flush()
+                self._eof = True
+
+    async def read(self, amt: Optional[int] = None) -> bytes:
+        await self._afill(amt)
+        return self._take(amt)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._response.close()
+
+
+def decode_response(response, response_class=DecodedResponse):
+    """Return ``response``, wrapped to decode its body if it is compressed."""
+    headers = response.info()
+    encoding = headers.get("Content-Encoding") if headers else None
+    decoder = get_decoder(encoding)
+    if decoder is None:
+        return response
+    return response_class(response, decoder)
@@ -19,6 +19,10 @@ class HTMLParseError(PytubeError):
     """HTML could not be parsed"""
 
 
+class MuxError(PytubeError):
+    """Media streams could not be combined into one file."""
+
+
 class ExtractError(PytubeError):
     """Data extraction based exception."""
 
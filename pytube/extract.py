@@ -2,20 +2,51 @@
 import logging
 import urllib.parse
 import re
+import threading
 from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Match, Optional, Tuple
 from urllib.parse import parse_qs, quote, urlencode, urlparse
 
 from pytube.cipher import Cipher
-from pytube.exceptions import HTMLParseError, LiveStreamError, RegexMatchError
+from pytube.exceptions import (
+    ExtractError, HTMLParseError, LiveStreamError, RegexMatchError
+)
 from pytube.helpers import regex_search
 from pytube.metadata import YouTubeMetadata
-from pytube.parser import parse_for_object, parse_for_all_objects
+from pytube.parser import (
+    parse_for_all_objects, parse_for_object, parse_for_object_from_startpoint
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Where the objects and markers of a watch page are; tried in order.
+_initial_data_patterns = [
+    r"window\[['\"]ytInitialData['\"]]\s*=\s*",
+    r"ytInitialData\s*=\s*"
+]
+_initial_player_response_patterns = [
+    r"window\[['\"]ytInitialPlayerResponse['\"]]\s*=\s*",
+    r"ytInitialPlayerResponse\s*=\s*"
+]
+_ytcfg_patterns = [
+    r"ytcfg\s=\s",
+    r"ytcfg\.set\("
+]
+_ytplayer_config_patterns = [
+    r"ytplayer\.config\s*=\s*",
+    r"ytInitialPlayerResponse\s*=\s*"
+]
+_ytplayer_setconfig_patterns = [
+    r"yt\.setConfig\(.*['\"]PLAYER_CONFIG['\"]:\s*"
+]
+_js_url_patterns = [
+    r"(/s/player/[\w\d]+/[\w\d_/.]+/base\.js)"
+]
+_age_restriction_pattern = r"og:restrictions:age"
+_publish_date_pattern = r"itemprop=\"datePublished\" content=\"(\d{4}-\d{2}-\d{2})"
+
 
 def publish_date(watch_html: str):
     """Extract publish date
@@ -26,10 +57,7 @@ def publish_date(watch_html: str):
         Publish date of the video.
     """
     try:
-        result = regex_search(
-            r"(?<=itemprop=\"datePublished\" content=\")\d{4}-\d{2}-\d{2}",
-            watch_html, group=0
-        )
+        result = regex_search(_publish_date_pattern, watch_html, group=1)
     except RegexMatchError:
         return None
     return datetime.strptime(result, '%Y-%m-%d')
@@ -83,7 +111,7 @@ def is_age_restricted(watch_html: str) -> bool:
         Whether or not the content is age restricted.
     """
     try:
-        regex_search(r"og:restrictions:age", watch_html, group=0)
+        regex_search(_age_restriction_pattern, watch_html, group=0)
     except RegexMatchError:
         return False
     return True
@@ -103,7 +131,10 @@ def playability_status(watch_html: str) -> (str, str):
     :returns:
         Playability status and reason of the video.
     """
-    player_response = initial_player_response(watch_html)
+    return _playability_status(initial_player_response(watch_html))
+
+
+def _playability_status(player_response: Dict) -> (str, str):
     status_dict = player_response.get('playabilityStatus', {})
     if 'liveStreamability' in status_dict:
         return 'LIVE_STREAM', 'Video is a live stream.'
@@ -301,10 +332,7 @@ def get_ytplayer_js(html: str) -> Any:
     :returns:
         Path to YouTube's base.js file.
     """
-    js_url_patterns = [
-        r"(/s/player/[\w\d]+/[\w\d_/.]+/base\.js)"
-    ]
-    for pattern in js_url_patterns:
+    for pattern in _js_url_patterns:
         regex = re.compile(pattern)
         function_match = regex.search(html)
         if function_match:
@@ -331,11 +359,7 @@ def get_ytplayer_config(html: str) -> Any:
         Substring of the html containing the encoded manifest data.
     """
     logger.debug("finding initial function name")
-    config_patterns = [
-        r"ytplayer\.config\s*=\s*",
-        r"ytInitialPlayerResponse\s*=\s*"
-    ]
-    for pattern in config_patterns:
+    for pattern in _ytplayer_config_patterns:
         # Try each pattern consecutively if they don't find a match
         try:
             return parse_for_object(html, pattern)
@@ -348,10 +372,7 @@ def get_ytplayer_config(html: str) -> Any:
     # We want to parse the entire argument to setConfig()
     #  and use then load that as json to find PLAYER_CONFIG
     #  inside of it.
-    setconfig_patterns = [
-        r"yt\.setConfig\(.*['\"]PLAYER_CONFIG['\"]:\s*"
-    ]
-    for pattern in setconfig_patterns:
+    for pattern in _ytplayer_setconfig_patterns:
         # Try each pattern consecutively if they don't find a match
         try:
             return parse_for_object(html, pattern)
@@ -376,11 +397,7 @@ def get_ytcfg(html: str) -> str:
         Substring of the html containing the encoded manifest data.
     """
     ytcfg = {}
-    ytcfg_patterns = [
-        r"ytcfg\s=\s",
-        r"ytcfg\.set\("
-    ]
-    for pattern in ytcfg_patterns:
+    for pattern in _ytcfg_patterns:
         # Try each pattern consecutively and try to build a cohesive object
         try:
             found_objects = parse_for_all_objects(html, pattern)
@@ -397,61 +414,144 @@ def get_ytcfg(html: str) -> str:
     )
 
 
-def apply_signature(stream_manifest: Dict, vid_info: Dict, js: str) -> None:
-    """Apply the decrypted signature to the stream manifest.
+def check_stream_urls(stream_manifest: List[Dict], vid_info: Dict) -> None:
+    """Raise :class:`LiveStreamError` if the streams of a live video lack urls.
 
-    :param dict stream_manifest:
+    :param list stream_manifest:
         Details of the media streams available.
-    :param str js:
-        The contents of the base.js asset file.
-
+    :param dict vid_info:
+        The video info the manifest was taken from.
     """
-    cipher = Cipher(js=js)
-
-    for i, stream in enumerate(stream_manifest):
-        try:
-            url: str = stream["url"]
-        except KeyError:
+    for stream in stream_manifest:
+        if "url" not in stream:
             live_stream = (
                 vid_info.get("playabilityStatus", {},)
                 .get("liveStreamability")
             )
             if live_stream:
                 raise LiveStreamError("UNKNOWN")
-        # 403 Forbidden fix.
-        if "signature" in url or (
-            "s" not in stream and ("&sig=" in url or "&lsig=" in url)
-        ):
-            # For certain videos, YouTube will just provide them pre-signed, in
-            # which case there's no real magic to download them and we can skip
-            # the whole signature descrambling entirely.
-            logger.debug("signature found, skip decipher")
-            continue
 
-        signature = cipher.get_signature(ciphered_signature=stream["s"])
 
-        logger.debug(
-            "finished descrambling signature for itag=%s", stream["itag"]
-        )
+def needs_signature(stream: Dict) -> bool:
+    """Whether a stream's url has to be signed before it can be downloaded.
+
+    :param dict stream:
+        A stream from the stream manifest.
+    :rtype: bool
+    """
+    url: str = stream["url"]
+    # For certain videos, YouTube will just provide them pre-signed, in
+    # which case there's no real magic to download them and we can skip
+    # the whole signature descrambling entirely.
+    return not ("signature" in url or (
+        "s" not in stream and ("&sig=" in url or "&lsig=" in url)
+    ))
+
+
+class StreamSigner:
+    """Sign the stream urls of one video on demand.
+
+    Only the streams whose url is actually read are deciphered, and they
+    share a single :class:`Cipher <pytube.cipher.Cipher>`, built the first
+    time it's needed.
+    """
+
+    def __init__(
+        self,
+        load_cipher: Callable[[], Cipher],
+        refresh_js: Optional[Callable[[], None]] = None,
+    ):
+        """Construct a :class:`StreamSigner <StreamSigner>`.
+
+        :param load_cipher:
+            Returns the :class:`Cipher <pytube.cipher.Cipher>` of the
+            video's base.js.
+        :param refresh_js:
+            (Optional) Drops a cached base.js, so ``load_cipher`` fetches it
+            again. Called once, if deciphering with the cached file fails.
+        """
+        self._load_cipher = load_cipher
+        self._refresh_js = refresh_js
+        self._cipher: Optional[Cipher] = None
+        self._lock = threading.Lock()
+
+    @property
+    def cipher(self) -> Cipher:
+        """The cipher of the video's base.js."""
+        with self._lock:
+            if self._cipher is None:
+                self._cipher = self._load_cipher()
+            return self._cipher
+
+    def sign(self, url: str, ciphered_signature: Optional[str]) -> str:
+        """Apply the decrypted signature and ``n`` to a stream url.
+
+        :param str url:
+            The unsigned url from the stream manifest.
+        :param str ciphered_signature:
+            The ``s`` value of the stream; ``url`` is returned as is if None.
+        :rtype: str
+        """
+        if ciphered_signature is None:
+            return url
+        try:
+            return self._sign(url, ciphered_signature)
+        except ExtractError:
+            if self._refresh_js is None:
+                raise
+            # If the cached js doesn't work, try fetching a new js file
+            # https://github.com/pytube/pytube/issues/1054
+            refresh_js, self._refresh_js = self._refresh_js, None
+            with self._lock:
+                self._cipher = None
+            refresh_js()
+            return self._sign(url, ciphered_signature)
+
+    def _sign(self, url: str, ciphered_signature: str) -> str:
+        cipher = self.cipher
+        signature = cipher.get_signature(ciphered_signature=ciphered_signature)
         parsed_url = urlparse(url)
 
         # Convert query params off url to dict
-        query_params = parse_qs(urlparse(url).query)
+        query_params = parse_qs(parsed_url.query)
         query_params = {
             k: v[0] for k,v in query_params.items()
         }
         query_params['sig'] = signature
         if 'ratebypass' not in query_params.keys():
-            # Cipher n to get the updated value
+            # Cipher n to get the updated value; it's the same for every
+            # stream of a video, and the cipher memoizes it.
+            query_params['n'] = cipher.calculate_n(query_params['n'])
 
-            initial_n = list(query_params['n'])
-            new_n = cipher.calculate_n(initial_n)
-            query_params['n'] = new_n
+        return f'{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}?{urlencode(query_params)}'  # noqa:E501
 
-        url = f'{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}?{urlencode(query_params)}'  # noqa:E501
+
+def apply_signature(stream_manifest: Dict, vid_info: Dict, js: str) -> None:
+    """Apply the decrypted signature to the stream manifest.
+
+    :class:`YouTube <pytube.YouTube>` signs its streams lazily with a
+    :class:`StreamSigner`; this signs every stream in place up front.
+
+    :param dict stream_manifest:
+        Details of the media streams available.
+    :param str js:
+        The contents of the base.js asset file.
+
+    """
+    check_stream_urls(stream_manifest, vid_info)
+    signer = StreamSigner(lambda: Cipher(js=js))
+
+    for i, stream in enumerate(stream_manifest):
+        # 403 Forbidden fix.
+        if not needs_signature(stream):
+            logger.debug("signature found, skip decipher")
+            continue
 
         # 403 forbidden fix
-        stream_manifest[i]["url"] = url
+        stream_manifest[i]["url"] = signer.sign(stream["url"], stream["s"])
+        logger.debug(
+            "finished descrambling signature for itag=%s", stream["itag"]
+        )
 
 
 def apply_descrambler(stream_data: Dict) -> None:
@@ -504,11 +604,7 @@ def initial_data(watch_html: str) -> str:
     @param watch_html: Html of the watch page
     @return:
     """
-    patterns = [
-        r"window\[['\"]ytInitialData['\"]]\s*=\s*",
-        r"ytInitialData\s*=\s*"
-    ]
-    for pattern in patterns:
+    for pattern in _initial_data_patterns:
         try:
             return parse_for_object(watch_html, pattern)
         except HTMLParseError:
@@ -526,11 +622,7 @@ def initial_player_response(watch_html: str) -> str:
     @param watch_html: Html of the watch page
     @return:
     """
-    patterns = [
-        r"window\[['\"]ytInitialPlayerResponse['\"]]\s*=\s*",
-        r"ytInitialPlayerResponse\s*=\s*"
-    ]
-    for pattern in patterns:
+    for pattern in _initial_player_response_patterns:
         try:
             return parse_for_object(watch_html, pattern)
         except HTMLParseError:
@@ -577,3 +669,176 @@ def metadata(initial_data) -> Optional[YouTubeMetadata]:
     metadata_rows = [x["metadataRowRenderer"] for x in metadata_rows]
 
     return YouTubeMetadata(metadata_rows)
+
+
+# Every match of the patterns of a watch page starts with one of these.
+_watch_page_anchor = re.compile(
+    r'yt(?:Initial|cfg|player)|window\[|/s/player/|og:restrictions:age'
+    r'|itemprop="datePublished"'
+)
+_watch_page_patterns = [
+    re.compile(pattern) for pattern in dict.fromkeys(
+        _initial_data_patterns
+        + _initial_player_response_patterns
+        + _ytcfg_patterns
+        + _ytplayer_config_patterns
+        + _js_url_patterns
+        + [_age_restriction_pattern, _publish_date_pattern]
+    )
+]
+
+_missing = object()
+
+
+class WatchPage:
+    """The data embedded in the html of a watch page.
+
+    The module level functions each search the whole html for their own
+    patterns. The first time any field of a :class:`WatchPage` is read, the
+    html is scanned once for all of them; each object is then parsed the
+    first time it's needed, and only once.
+    """
+
+    def __init__(self, html: str):
+        """Construct a :class:`WatchPage <WatchPage>`.
+
+        :param str html:
+            The html contents of the watch page.
+        """
+        self.html = html
+        self._matches: Optional[Dict[str, List[Match]]] = None
+        self._objects: Dict[int, Any] = {}
+        self._fields: Dict[str, Any] = {}
+
+    def _find(self, pattern: str) -> List[Match]:
+        """Return the matches of one of the patterns of the page, in order."""
+        if self._matches is None:
+            matches: Dict[str, List[Match]] = {
+                regex.pattern: [] for regex in _watch_page_patterns
+            }
+            for anchor in _watch_page_anchor.finditer(self.html):
+                for regex in _watch_page_patterns:
+                    match = regex.match(self.html, anchor.start())
+                    if match:
+                        matches[regex.pattern].append(match)
+            self._matches = matches
+        return self._matches[pattern]
+
+    def _object(self, start_point: int) -> Any:
+        if start_point not in self._objects:
+            self._objects[start_point] = parse_for_object_from_startpoint(
+                self.html, start_point
+            )
+        return self._objects[start_point]
+
+    def _first_object(self, patterns: List[str], caller: str) -> Any:
+        for pattern in patterns:
+            # Try each pattern consecutively if they don't find a match
+            for match in self._find(pattern)[:1]:
+                try:
+                    return self._object(match.end())
+                except HTMLParseError:
+                    logger.debug(f'Pattern failed: {pattern}')
+        raise RegexMatchError(caller=caller, pattern=f"{caller}_pattern")
+
+    def _field(self, name: str, extract: Callable[[], Any]) -> Any:
+        value = self._fields.get(name, _missing)
+        if value is _missing:
+            value = self._fields[name] = extract()
+        return value
+
+    @property
+    def initial_data(self) -> Any:
+        """The ytInitialData json; see :func:`initial_data`."""
+        return self._field(
+            "initial_data",
+            lambda: self._first_object(_initial_data_patterns, "initial_data"),
+        )
+
+    @property
+    def initial_player_response(self) -> Any:
+        """The ytInitialPlayerResponse json; see :func:`initial_player_response`."""
+        return self._field(
+            "initial_player_response",
+            lambda: self._first_object(
+                _initial_player_response_patterns, "initial_player_response"
+            ),
+        )
+
+    @property
+    def ytplayer_config(self) -> Any:
+        """The player configuration; see :func:`get_ytplayer_config`."""
+        def extract():
+            try:
+                return self._first_object(
+                    _ytplayer_config_patterns, "get_ytplayer_config"
+                )
+            except RegexMatchError:
+                pass
+            # Rarely needed, and the pattern can't be anchored, so it gets a
+            # search of its own.
+            for pattern in _ytplayer_setconfig_patterns:
+                try:
+                    return parse_for_object(self.html, pattern)
+                except HTMLParseError:
+                    continue
+            raise RegexMatchError(
+                caller="get_ytplayer_config",
+                pattern="config_patterns, setconfig_patterns"
+            )
+
+        return self._field("ytplayer_config", extract)
+
+    @property
+    def ytcfg(self) -> Dict:
+        """The ytcfg object; see :func:`get_ytcfg`."""
+        def extract():
+            ytcfg = {}
+            for pattern in _ytcfg_patterns:
+                for match in self._find(pattern):
+                    try:
+                        ytcfg.update(self._object(match.end()))
+                    except HTMLParseError:
+                        continue
+            if len(ytcfg) > 0:
+                return ytcfg
+            raise RegexMatchError(caller="get_ytcfg", pattern="ytcfg_pattenrs")
+
+        return self._field("ytcfg", extract)
+
+    @property
+    def js_url(self) -> str:
+        """The base JavaScript url; see :func:`js_url`."""
+        def extract():
+            try:
+                base_js = self.ytplayer_config['assets']['js']
+            except (KeyError, RegexMatchError):
+                matches = [m for p in _js_url_patterns for m in self._find(p)]
+                if not matches:
+                    raise RegexMatchError(
+                        caller="get_ytplayer_js", pattern="js_url_patterns"
+                    )
+                base_js = matches[0].group(1)
+            return "https://youtube.com" + base_js
+
+        return self._field("js_url", extract)
+
+    @property
+    def publish_date(self) -> Optional[datetime]:
+        """The publish date of the video; see :func:`publish_date`."""
+        def extract():
+            for match in self._find(_publish_date_pattern)[:1]:
+                return datetime.strptime(match.group(1), '%Y-%m-%d')
+            return None
+
+        return self._field("publish_date", extract)
+
+    @property
+    def is_age_restricted(self) -> bool:
+        """Whether the video is age restricted; see :func:`is_age_restricted`."""
+        return bool(self._find(_age_restriction_pattern))
+
+    @property
+    def playability_status(self) -> (str, str):
+        """The playability status and reason; see :func:`playability_status`."""
+        return _playability_status(self.initial_player_response)
@@ -260,6 +260,10 @@ def install_proxy(proxy_handler: Dict[str, str]) -> None:
     opener = request.build_opener(proxy_support)
     request.install_opener(opener)
 
+    # pytube.request imports this module, so it can only be loaded lazily.
+    from pytube import request as pytube_request
+    pytube_request.install_proxy(proxy_handler)
+
 
 def uniqueify(duped_list: List) -> List:
     """Remove duplicate items from a list, while maintaining list order.
@@ -366,8 +366,8 @@ class InnerTube:
             'racyCheckOk': True
         }
 
-    def _call_api(self, endpoint, query, data):
-        """Make a request to a given endpoint with the provided query parameters and data."""
+    def _prepare_call(self, endpoint, query):
+        """Build the url and headers for a request to the given endpoint."""
         # Remove the API key if oauth is being used.
         if self.use_oauth:
             del query['key']
@@ -386,7 +386,11 @@ class InnerTube:
                 headers['Authorization'] = f'Bearer {self.access_token}'
 
         headers.update(self.header)
+        return endpoint_url, headers
 
+    def _call_api(self, endpoint, query, data):
+        """Make a request to a given endpoint with the provided query parameters and data."""
+        endpoint_url, headers = self._prepare_call(endpoint, query)
         response = request._execute_request(
             endpoint_url,
             'POST',
@@ -395,6 +399,20 @@ class InnerTube:
         )
         return json.loads(response.read())
 
+    async def _acall_api(self, endpoint, query, data):
+        """Async counterpart of :meth:`_call_api`.
+
+        OAuth token refreshes, when needed, are still made synchronously.
+        """
+        endpoint_url, headers = self._prepare_call(endpoint, query)
+        response = await request._aexecute_request(
+            endpoint_url,
+            'POST',
+            headers=headers,
+            data=data
+        )
+        return json.loads(await response.read())
+
     def browse(self):
         """Make a request to the browse endpoint.
 
@@ -447,6 +465,22 @@ class InnerTube:
         query.update(self.base_params)
         return self._call_api(endpoint, query, self.base_data)
 
+    async def aplayer(self, video_id):
+        """Make a request to the player endpoint without blocking the event loop.
+
+        :param str video_id:
+            The video id to get player info for.
+        :rtype: dict
+        :returns:
+            Raw player info results.
+        """
+        endpoint = f'{self.base_url}/player'
+        query = {
+            'videoId': video_id,
+        }
+        query.update(self.base_params)
+        return await self._acall_api(endpoint, query, self.base_data)
+
     def search(self, search_query, continuation=None):
         """Make a request to the search endpoint.
 
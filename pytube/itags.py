@@ -1,5 +1,5 @@
 """This module contains a lookup table of YouTube's itag values."""
-from typing import Dict
+from typing import Dict, Optional
 
 PROGRESSIVE_VIDEO = {
     5: ("240p", "64kbps"),
@@ -129,25 +129,80 @@ _3D = [82, 83, 84, 85, 100, 101, 102]
 LIVE = [91, 92, 93, 94, 95, 96, 132, 151]
 
 
+class FormatProfile:
+    """Immutable format information shared by every stream of one itag."""
+
+    __slots__ = ("resolution", "abr", "is_live", "is_3d", "is_hdr", "is_dash")
+
+    def __init__(
+        self,
+        resolution: Optional[str],
+        abr: Optional[str],
+        is_live: bool,
+        is_3d: bool,
+        is_hdr: bool,
+        is_dash: bool,
+    ):
+        set_ = object.__setattr__
+        set_(self, "resolution", resolution)
+        set_(self, "abr", abr)
+        set_(self, "is_live", is_live)
+        set_(self, "is_3d", is_3d)
+        set_(self, "is_hdr", is_hdr)
+        set_(self, "is_dash", is_dash)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def as_dict(self) -> Dict:
+        """Return the profile as a new dictionary.
+
+        :rtype: dict
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"<FormatProfile: {self.as_dict()}>"
+
+
+# One shared profile per itag, and one per distinct set of values, so the
+# streams of thousands of videos reference a handful of objects.
+_profiles: Dict[int, FormatProfile] = {}
+_interned: Dict[tuple, FormatProfile] = {}
+
+
+def format_profile(itag: int) -> FormatProfile:
+    """Get the shared :class:`FormatProfile` for a given itag.
+
+    :param int itag:
+        YouTube format identifier code.
+    :rtype: FormatProfile
+    """
+    itag = int(itag)
+    profile = _profiles.get(itag)
+    if profile is None:
+        res, bitrate = ITAGS.get(itag, (None, None))
+        values = (
+            res,
+            bitrate,
+            itag in LIVE,
+            itag in _3D,
+            itag in HDR,
+            itag in DASH_AUDIO or itag in DASH_VIDEO,
+        )
+        profile = _interned.setdefault(values, FormatProfile(*values))
+        # Racing threads store equal profiles, so no lock is needed.
+        _profiles[itag] = profile
+    return profile
+
+
 def get_format_profile(itag: int) -> Dict:
     """Get additional format information for a given itag.
 
     :param str itag:
         YouTube format identifier code.
     """
-    itag = int(itag)
-    if itag in ITAGS:
-        res, bitrate = ITAGS[itag]
-    else:
-        res, bitrate = None, None
-    return {
-        "resolution": res,
-        "abr": bitrate,
-        "is_live": itag in LIVE,
-        "is_3d": itag in _3D,
-        "is_hdr": itag in HDR,
-        "is_dash": (
-            itag in DASH_AUDIO
-            or itag in DASH_VIDEO
-        ),
-    }
+    return format_profile(itag).as_dict()
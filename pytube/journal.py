@@ -0,0 +1,165 @@
+"""Sidecar journal of the byte ranges written to a partial download.
+
+While a stream downloads into ``<file>.part``, the ranges that have reached
+the file are recorded in ``<file>.part.json``. If the download is
+interrupted, a later call reads the journal back and only requests the
+ranges that are still missing.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+part_suffix = ".part"
+journal_suffix = ".part.json"
+
+
+class DownloadJournal:
+    """Completed byte ranges of a partial download, saved next to it."""
+
+    def __init__(
+        self,
+        path: str,
+        file_size: int,
+        identity: Dict,
+        ranges: Optional[List[List[int]]] = None,
+        save_interval: float = 2.0,
+    ):
+        """Construct a :class:`DownloadJournal <DownloadJournal>`.
+
+        :param str path:
+            Where the journal is saved.
+        :param int file_size:
+            Total size of the file being downloaded.
+        :param dict identity:
+            Values identifying the stream; a saved journal is only resumed
+            when they match.
+        :param list ranges:
+            (Optional) Sorted, non-overlapping inclusive ``[start, stop]``
+            ranges already written.
+        :param float save_interval:
+            Minimum number of seconds between two checkpoints.
+        """
+        self.path = path
+        self.file_size = file_size
+        self.identity = identity
+        self.save_interval = save_interval
+        self._ranges: List[List[int]] = ranges or []
+        self._lock = threading.Lock()
+        self._last_save = time.monotonic()
+
+    @classmethod
+    def open(cls, part_path: str, file_size: int, identity: Dict) -> "DownloadJournal":
+        """Load the journal for ``part_path``, or start an empty one.
+
+        A saved journal is ignored if the partial file is gone, or if it was
+        written for a different stream or file size.
+
+        :param str part_path:
+            Path of the partial download.
+        :param int file_size:
+            Total size of the file being downloaded.
+        :param dict identity:
+            Values identifying the stream.
+        :rtype: DownloadJournal
+        """
+        path = journal_path(part_path)
+        ranges = None
+        if os.path.isfile(part_path) and os.path.isfile(path):
+            try:
+                with open(path) as fh:
+                    data = json.load(fh)
+            except (OSError, ValueError) as e:
+                logger.debug("ignoring unreadable journal %s: %s", path, e)
+            else:
+                if (
+                    data.get("file_size") == file_size
+                    and data.get("identity") == identity
+                ):
+                    ranges = data.get("ranges")
+        return cls(path, file_size, identity, ranges)
+
+    @property
+    def completed_bytes(self) -> int:
+        """Number of bytes already written."""
+        with self._lock:
+            return sum(stop - start + 1 for start, stop in self._ranges)
+
+    def add(self, start: int, stop: int) -> None:
+        """Record that bytes ``start`` to ``stop`` (inclusive) were written."""
+        with self._lock:
+            ranges = self._ranges
+            # Chunks usually extend a range that is already recorded.
+            for current in ranges:
+                if current[0] <= start <= current[1] + 1:
+                    current[1] = max(current[1], stop)
+                    break
+            else:
+                ranges.append([start, stop])
+                ranges.sort()
+            merged = [ranges[0]]
+            for current in ranges[1:]:
+                if current[0] <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], current[1])
+                else:
+                    merged.append(current)
+            self._ranges = merged
+
+    def missing(self) -> List[Tuple[int, int]]:
+        """Return the inclusive byte ranges that have not been written yet.
+
+        :rtype: List[Tuple[int, int]]
+        """
+        missing = []
+        position = 0
+        with self._lock:
+            for start, stop in self._ranges:
+                if start > position:
+                    missing.append((position, start - 1))
+                position = max(position, stop + 1)
+        if position < self.file_size:
+            missing.append((position, self.file_size - 1))
+        return missing
+
+    def due(self) -> bool:
+        """Whether enough time has passed since the last checkpoint."""
+        return time.monotonic() - self._last_save >= self.save_interval
+
+    def save(self) -> None:
+        """Write the journal to disk atomically.
+
+        The data the journal refers to must already have been written to
+        the partial file.
+        """
+        with self._lock:
+            data = {
+                "file_size": self.file_size,
+                "identity": self.identity,
+                "ranges": self._ranges,
+            }
+            self._last_save = time.monotonic()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(data, fh)
+        os.replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        """Delete the saved journal, if there is one."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def part_path(file_path: str) -> str:
+    """Return the path a download is written to until it completes."""
+    return file_path + part_suffix
+
+
+def journal_path(part_file_path: str) -> str:
+    """Return the path of the journal kept for a partial download."""
+    return part_file_path[:-len(part_suffix)] + journal_suffix
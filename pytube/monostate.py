@@ -8,8 +8,10 @@ class Monostate:
         on_complete: Optional[Callable[[Any, Optional[str]], None]],
         title: Optional[str] = None,
         duration: Optional[int] = None,
+        video_id: Optional[str] = None,
     ):
         self.on_progress = on_progress
         self.on_complete = on_complete
         self.title = title
         self.duration = duration
+        self.video_id = video_id
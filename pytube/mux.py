@@ -0,0 +1,429 @@
+"""Combine an adaptive video and audio stream into one MP4 without ffmpeg.
+
+YouTube serves adaptive MP4 streams as fragmented MP4: an ``ftyp`` and
+``moov`` header describing a single track, then ``moof``/``mdat`` pairs that
+each hold a few seconds of media. :func:`mux` merges the two headers into one
+``moov`` with both tracks and interleaves the fragments of both inputs by
+decode time. Fragment boxes are only patched in place and media data is
+copied through in small pieces, so memory use doesn't grow with the file, and
+the inputs can be pipes fed by downloads still in progress.
+"""
+import logging
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, List, Optional, Tuple
+
+from pytube.exceptions import MuxError
+from pytube.sinks import PipeSink
+
+logger = logging.getLogger(__name__)
+
+# Size of the pieces media data is copied in.
+copy_size = 65536
+
+# Index and segment boxes referencing input offsets, dropped from the output.
+_dropped_boxes = {b"sidx", b"ssix", b"styp", b"mfra", b"emsg", b"prft"}
+
+
+def _iter_boxes(data, start: int, end: int):
+    """Yield ``(type, payload_start, box_end)`` for the boxes in ``data[start:end]``."""
+    while start + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, start)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, start + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - start
+        if size < header or start + size > end:
+            raise MuxError(f"malformed {box_type!r} box")
+        yield box_type, start + header, start + size
+        start += size
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    """Serialise a box, with a 64-bit size if it needs one."""
+    size = len(payload) + 8
+    if size > 0xFFFFFFFF:
+        return struct.pack(">I4sQ", 1, box_type, size + 8) + payload
+    return struct.pack(">I4s", size, box_type) + payload
+
+
+def _children(data: bytes) -> List[Tuple[bytes, bytes]]:
+    """Split a container's payload into ``(type, payload)`` pairs."""
+    return [
+        (box_type, data[start:end])
+        for box_type, start, end in _iter_boxes(data, 0, len(data))
+    ]
+
+
+def _join(children: List[Tuple[bytes, bytes]]) -> bytes:
+    return b"".join(_box(box_type, payload) for box_type, payload in children)
+
+
+def _find(children: List[Tuple[bytes, bytes]], box_type: bytes) -> Optional[bytes]:
+    return next((payload for t, payload in children if t == box_type), None)
+
+
+def _read_uint(payload: bytes, v0_offset: int, v1_offset: int) -> int:
+    """Read a field that is 32-bit in version 0 boxes and 64-bit in version 1."""
+    if payload[0] == 1:
+        return struct.unpack_from(">Q", payload, v1_offset)[0]
+    return struct.unpack_from(">I", payload, v0_offset)[0]
+
+
+def _timescale(payload: bytes) -> int:
+    """Read the timescale of an ``mvhd`` or ``mdhd`` box, 32-bit in both versions."""
+    return struct.unpack_from(">I", payload, 20 if payload[0] == 1 else 12)[0] or 1
+
+
+def _write_uint(payload: bytearray, v0_offset: int, v1_offset: int, value: int) -> None:
+    if payload[0] == 1:
+        struct.pack_into(">Q", payload, v1_offset, value)
+    else:
+        struct.pack_into(">I", payload, v0_offset, min(value, 0xFFFFFFFF))
+
+
+class _Input:
+    """One fragmented MP4 input, read front to back."""
+
+    def __init__(self, fileobj: BinaryIO, name: str):
+        self.fileobj = fileobj
+        self.name = name
+        self.position = 0
+        self._peeked: Optional[Tuple[bytes, int, bytes]] = None
+        self.ftyp = b""
+        self.mvhd = b""
+        self.trak: List[Tuple[bytes, bytes]] = []
+        self.mehd: Optional[bytes] = None
+        self.trex = b""
+        self.moov_rest: List[Tuple[bytes, bytes]] = []
+        self.movie_timescale = 1
+        self.timescale = 1
+        self.time = 0
+
+    def _read(self, n: int) -> bytes:
+        data = bytearray()
+        while len(data) < n:
+            chunk = self.fileobj.read(n - len(data))
+            if not chunk:
+                raise MuxError(f"{self.name}: unexpected end of stream")
+            data += chunk
+        self.position += n
+        return bytes(data)
+
+    def _header(self) -> Optional[Tuple[bytes, int, bytes]]:
+        """Read the next box header as ``(type, payload_size, raw_header)``.
+
+        A payload size of ``-1`` means the box runs to the end of the stream.
+        """
+        if self._peeked is not None:
+            header, self._peeked = self._peeked, None
+            return header
+        first = self.fileobj.read(8)
+        while first and len(first) < 8:
+            more = self.fileobj.read(8 - len(first))
+            if not more:
+                break
+            first += more
+        if not first:
+            return None
+        if len(first) < 8:
+            raise MuxError(f"{self.name}: truncated box header")
+        self.position += 8
+        size, box_type = struct.unpack(">I4s", first)
+        if size == 1:
+            large = self._read(8)
+            return box_type, struct.unpack(">Q", large)[0] - 16, first + large
+        if size == 0:
+            return box_type, -1, first
+        if size < 8:
+            raise MuxError(f"{self.name}: malformed {box_type!r} box")
+        return box_type, size - 8, first
+
+    def _copy(self, size: int, output: "_Output") -> None:
+        while size != 0:
+            want = copy_size if size < 0 else min(copy_size, size)
+            chunk = self.fileobj.read(want)
+            if not chunk:
+                if size < 0:
+                    return
+                raise MuxError(f"{self.name}: unexpected end of stream")
+            self.position += len(chunk)
+            if output is not None:
+                output.write(chunk)
+            if size > 0:
+                size -= len(chunk)
+
+    def read_init(self) -> None:
+        """Read the boxes before the first fragment."""
+        while True:
+            header = self._header()
+            if header is None:
+                raise MuxError(f"{self.name}: no moov box found")
+            box_type, size, _ = header
+            if box_type == b"moov":
+                self._parse_moov(self._read(size))
+                return
+            if box_type == b"ftyp":
+                self.ftyp = self._read(size)
+            elif box_type == b"moof":
+                raise MuxError(f"{self.name}: fragment before moov")
+            else:
+                self._copy(size, None)
+
+    def _parse_moov(self, payload: bytes) -> None:
+        children = _children(payload)
+        traks = [p for t, p in children if t == b"trak"]
+        mvex = _find(children, b"mvex")
+        if mvex is None:
+            raise MuxError(f"{self.name}: not a fragmented MP4")
+        if len(traks) != 1:
+            raise MuxError(f"{self.name}: expected one track, found {len(traks)}")
+        mvhd = _find(children, b"mvhd")
+        if mvhd is None:
+            raise MuxError(f"{self.name}: no mvhd box found")
+        self.mvhd = mvhd
+        self.movie_timescale = _timescale(mvhd)
+        self.trak = _children(traks[0])
+        mdia = _children(_find(self.trak, b"mdia") or b"")
+        mdhd = _find(mdia, b"mdhd")
+        if mdhd is None:
+            raise MuxError(f"{self.name}: track has no mdhd box")
+        self.timescale = _timescale(mdhd)
+        mvex_children = _children(mvex)
+        self.mehd = _find(mvex_children, b"mehd")
+        trex = _find(mvex_children, b"trex")
+        if trex is None:
+            raise MuxError(f"{self.name}: no trex box found")
+        self.trex = trex
+        self.moov_rest = [
+            (t, p) for t, p in children if t not in (b"mvhd", b"trak", b"mvex")
+        ]
+
+    def duration(self, timescale: int) -> int:
+        """Return the track's duration converted to ``timescale``."""
+        duration = _read_uint(self.mvhd, 16, 24)
+        if self.mehd:
+            duration = max(duration, _read_uint(self.mehd, 4, 4))
+        return duration * timescale // self.movie_timescale
+
+    def next_fragment(self) -> Optional[Tuple[bytearray, int]]:
+        """Return the next ``moof`` box and its input offset, or ``None`` at the end."""
+        while True:
+            offset = self.position - (len(self._peeked[2]) if self._peeked else 0)
+            header = self._header()
+            if header is None:
+                return None
+            box_type, size, raw = header
+            if box_type == b"moof":
+                if size < 0:
+                    raise MuxError(f"{self.name}: unbounded moof box")
+                moof = bytearray(raw + self._read(size))
+                self.time = _fragment_time(moof, self.time)
+                return moof, offset
+            self._copy(size, None)
+
+    def copy_fragment_data(self, output: "_Output") -> None:
+        """Copy the boxes after a ``moof``, up to the next one, to ``output``."""
+        while True:
+            header = self._header()
+            if header is None:
+                return
+            box_type, size, raw = header
+            if box_type == b"moof":
+                self._peeked = header
+                return
+            if box_type in _dropped_boxes:
+                self._copy(size, None)
+                continue
+            output.write(raw)
+            self._copy(size, output)
+
+
+class _Output:
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+        self.position = 0
+
+    def write(self, data) -> None:
+        self.fileobj.write(data)
+        self.position += len(data)
+
+
+def _payload_start(box: bytearray) -> int:
+    return 16 if struct.unpack_from(">I", box)[0] == 1 else 8
+
+
+def _fragment_time(moof: bytearray, default: int) -> int:
+    """Return the decode time of a fragment's first sample, from its ``tfdt``."""
+    for box_type, start, end in _iter_boxes(moof, _payload_start(moof), len(moof)):
+        if box_type == b"traf":
+            for child, child_start, child_end in _iter_boxes(moof, start, end):
+                if child == b"tfdt":
+                    return _read_uint(moof[child_start:child_end], 4, 4)
+    return default
+
+
+def _patch_fragment(
+    moof: bytearray, track_id: int, sequence: int, moof_in: int, moof_out: int
+) -> None:
+    """Renumber a fragment for the output file, in place."""
+    for box_type, start, end in _iter_boxes(moof, _payload_start(moof), len(moof)):
+        if box_type == b"mfhd":
+            struct.pack_into(">I", moof, start + 4, sequence)
+        elif box_type == b"traf":
+            for child, child_start, _ in _iter_boxes(moof, start, end):
+                if child != b"tfhd":
+                    continue
+                struct.pack_into(">I", moof, child_start + 4, track_id)
+                flags = int.from_bytes(moof[child_start + 1:child_start + 4], "big")
+                if flags & 0x000001:
+                    # Absolute input offset; move it with the fragment.
+                    base = struct.unpack_from(">Q", moof, child_start + 8)[0]
+                    struct.pack_into(
+                        ">Q", moof, child_start + 8, base - moof_in + moof_out
+                    )
+
+
+def _build_trak(source: _Input, track_id: int, movie_timescale: int) -> bytes:
+    children = []
+    for box_type, payload in source.trak:
+        if box_type == b"tkhd":
+            tkhd = bytearray(payload)
+            struct.pack_into(">I", tkhd, 20 if tkhd[0] == 1 else 12, track_id)
+            duration = _read_uint(tkhd, 20, 28)
+            _write_uint(
+                tkhd, 20, 28, duration * movie_timescale // source.movie_timescale
+            )
+            payload = bytes(tkhd)
+        elif box_type == b"edts":
+            payload = _scale_edts(payload, movie_timescale, source.movie_timescale)
+        children.append((box_type, payload))
+    return _join(children)
+
+
+def _scale_edts(payload: bytes, to_timescale: int, from_timescale: int) -> bytes:
+    """Convert edit list durations, which use the movie timescale."""
+    children = []
+    for box_type, box in _children(payload):
+        if box_type == b"elst":
+            elst = bytearray(box)
+            count = struct.unpack_from(">I", elst, 4)[0]
+            wide = elst[0] == 1
+            entry_size, fmt = (20, ">Q") if wide else (12, ">I")
+            for i in range(count):
+                offset = 8 + i * entry_size
+                duration = struct.unpack_from(fmt, elst, offset)[0]
+                struct.pack_into(
+                    fmt, elst, offset, duration * to_timescale // from_timescale
+                )
+            box = bytes(elst)
+        children.append((box_type, box))
+    return _join(children)
+
+
+def _build_moov(video: _Input, audio: _Input) -> bytes:
+    timescale = video.movie_timescale
+    duration = max(video.duration(timescale), audio.duration(timescale))
+    mvhd = bytearray(video.mvhd)
+    _write_uint(mvhd, 16, 24, duration)
+    # next_track_ID is the last field of mvhd.
+    struct.pack_into(">I", mvhd, len(mvhd) - 4, 3)
+
+    mvex = []
+    if video.mehd is not None or audio.mehd is not None:
+        mehd = bytearray(video.mehd or audio.mehd)
+        _write_uint(mehd, 4, 4, duration)
+        mvex.append((b"mehd", bytes(mehd)))
+    for track_id, source in ((1, video), (2, audio)):
+        trex = bytearray(source.trex)
+        struct.pack_into(">I", trex, 4, track_id)
+        mvex.append((b"trex", bytes(trex)))
+
+    return _box(b"moov", _join(
+        [(b"mvhd", bytes(mvhd))]
+        + [(b"trak", _build_trak(video, 1, timescale))]
+        + [(b"trak", _build_trak(audio, 2, timescale))]
+        + [(b"mvex", _join(mvex))]
+        + video.moov_rest
+    ))
+
+
+def mux(video: BinaryIO, audio: BinaryIO, output: BinaryIO) -> None:
+    """Combine a fragmented MP4 video and audio stream into ``output``.
+
+    :param video:
+        Readable binary file object with the video stream, e.g. an open file
+        or a :class:`pytube.sinks.PipeSink` fed by a download.
+    :param audio:
+        Readable binary file object with the audio stream.
+    :param output:
+        Writable binary file object the combined MP4 is written to. It
+        doesn't need to be seekable.
+    :raises MuxError:
+        If an input isn't a single-track fragmented MP4.
+    """
+    inputs = [_Input(video, "video"), _Input(audio, "audio")]
+    for source in inputs:
+        source.read_init()
+
+    out = _Output(output)
+    out.write(_box(b"ftyp", inputs[0].ftyp))
+    out.write(_build_moov(*inputs))
+
+    pending = [source.next_fragment() for source in inputs]
+    sequence = 0
+    while any(fragment is not None for fragment in pending):
+        # Emit whichever fragment starts first, so the tracks stay interleaved.
+        index = min(
+            (i for i, fragment in enumerate(pending) if fragment is not None),
+            key=lambda i: inputs[i].time / inputs[i].timescale,
+        )
+        source = inputs[index]
+        moof, moof_in = pending[index]
+        sequence += 1
+        _patch_fragment(moof, index + 1, sequence, moof_in, out.position)
+        out.write(moof)
+        source.copy_fragment_data(out)
+        pending[index] = source.next_fragment()
+    logger.debug("muxed %s fragments (%s bytes)", sequence, out.position)
+
+
+def mux_streams(
+    video_stream, audio_stream, file_path: str, depth: int = 16
+) -> str:
+    """Download an adaptive video and audio stream at once, muxing as they arrive.
+
+    :param video_stream:
+        :class:`Stream <pytube.Stream>` of an MP4 video track.
+    :param audio_stream:
+        :class:`Stream <pytube.Stream>` of an MP4 audio track.
+    :param str file_path:
+        Where the combined MP4 is written.
+    :param int depth:
+        Number of chunks of each stream that may wait for the muxer.
+    :returns:
+        ``file_path``
+    :rtype: str
+    """
+    pipes = [PipeSink(depth), PipeSink(depth)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(stream.stream_to_sinks, [pipe])
+            for stream, pipe in zip((video_stream, audio_stream), pipes)
+        ]
+        try:
+            with open(file_path, "wb") as fh:
+                mux(pipes[0], pipes[1], fh)
+        except BaseException:
+            # Unblock and stop the downloads feeding the pipes.
+            for pipe in pipes:
+                pipe.cancel()
+            if os.path.exists(file_path):
+                os.unlink(file_path)
+            raise
+        for future in futures:
+            future.result()
+    return file_path
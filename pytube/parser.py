@@ -57,67 +57,115 @@ def parse_for_object(html, preceding_regex):
     return parse_for_object_from_startpoint(html, start_index)
 
 
-def find_object_from_startpoint(html, start_point):
-    """Parses input html to find the end of a JavaScript object.
+# Characters that open or close a context outside of strings and regexes.
+_code_structure = re.compile(r'[{}\[\]"/]')
+
+# Characters that end a string or regex, or escape the next character.
+_literal_structure = {
+    '"': re.compile(r'["\\]'),
+    '/': re.compile(r'[/\\]'),
+}
+
+_context_closers = {
+    '{': '}',
+    '[': ']',
+    '"': '"',
+    '/': '/',  # javascript regex
+}
+
+# A slash starts a regular expression, rather than a division, after these.
+_regex_preceders = frozenset('(,=:[!&|?{};')
+
+_json_decoder = json.JSONDecoder()
+
+
+def find_object_end(html, start_point):
+    """Find where the JavaScript object starting at ``start_point`` ends.
+
+    Jumps from one structural character to the next rather than walking
+    every character, and never copies ``html``.
 
     :param str html:
         HTML to be parsed for an object.
     :param int start_point:
         Index of where the object starts.
-    :rtype dict:
+    :rtype: int
     :returns:
-        A dict created from parsing the object.
+        The index just past the end of the object, or ``len(html)`` if the
+        object isn't closed.
     """
-    html = html[start_point:]
-    if html[0] not in ['{','[']:
-        raise HTMLParseError(f'Invalid start point. Start of HTML:\n{html[:20]}')
-
-    # First letter MUST be a open brace, so we put that in the stack,
-    # and skip the first character.
-    last_char = '{'
-    curr_char = None
-    stack = [html[0]]
-    i = 1
+    if html[start_point:start_point + 1] not in ('{', '['):
+        raise HTMLParseError(
+            f'Invalid start point. Start of HTML:\n{html[start_point:start_point + 20]}'
+        )
+
+    end = len(html)
+    stack = [html[start_point]]
+    i = start_point + 1
+    while stack:
+        context = stack[-1]
+        literal = _literal_structure.get(context)
+        if literal is not None:
+            # Strings and regex expressions can contain context openers
+            # *and* closers; only their own closer and escapes matter.
+            match = literal.search(html, i)
+            if match is None:
+                return end
+            i = match.end()
+            if match.group() == context:
+                stack.pop()
+            else:
+                # Skip the escaped character
+                i += 1
+            continue
 
-    context_closers = {
-        '{': '}',
-        '[': ']',
-        '"': '"',
-        '/': '/' # javascript regex
-    }
-
-    while i < len(html):
-        if len(stack) == 0:
-            break
-        if curr_char not in [' ', '\n']:
-            last_char = curr_char
-        curr_char = html[i]
-        curr_context = stack[-1]
-
-        # If we've reached a context closer, we can remove an element off the stack
-        if curr_char == context_closers[curr_context]:
+        match = _code_structure.search(html, i)
+        if match is None:
+            return end
+        char = match.group()
+        i = match.end()
+        if char == _context_closers[context]:
             stack.pop()
-            i += 1
-            continue
+        elif char == '/':
+            # Slash starts a regular expression depending on what precedes it
+            j = i - 2
+            while j > start_point and html[j] in ' \n':
+                j -= 1
+            if j > start_point and html[j] in _regex_preceders:
+                stack.append(char)
+        elif char in '{["':
+            stack.append(char)
+
+    return min(i, end)
+
+
+def _string_end(html, start_point):
+    """Return the index just past the string literal at ``start_point``."""
+    literal = _literal_structure[html[start_point]]
+    i = start_point + 1
+    while True:
+        match = literal.search(html, i)
+        if match is None:
+            return len(html)
+        i = match.end()
+        if match.group() == html[start_point]:
+            return i
+        # Skip the escaped character
+        i += 1
 
-        # Strings and regex expressions require special context handling because they can contain
-        #  context openers *and* closers
-        if curr_context in ['"', '/']:
-            # If there's a backslash in a string or regex expression, we skip a character
-            if curr_char == '\\':
-                i += 2
-                continue
-        else:
-            # Non-string contexts are when we need to look for context openers.
-            if curr_char in context_closers.keys():
-                # Slash starts a regular expression depending on context
-                if not (curr_char == '/' and last_char not in ['(', ',', '=', ':', '[', '!', '&', '|', '?', '{', '}', ';']): 
-                    stack.append(curr_char)
 
-        i += 1
+def find_object_from_startpoint(html, start_point):
+    """Parses input html to find the end of a JavaScript object.
 
-    full_obj = html[:i]
-    return full_obj  # noqa: R504
+    :param str html:
+        HTML to be parsed for an object.
+    :param int start_point:
+        Index of where the object starts.
+    :rtype str:
+    :returns:
+        The source of the object.
+    """
+    return html[start_point:find_object_end(html, start_point)]
 
 
 def parse_for_object_from_startpoint(html, start_point):
@@ -131,6 +179,14 @@ def parse_for_object_from_startpoint(html, start_point):
     :returns:
         A dict created from parsing the object.
     """
+    if html[start_point:start_point + 1] in ('{', '['):
+        # Most objects are plain JSON, which the json module decodes in
+        # place, without scanning for the end first.
+        try:
+            return _json_decoder.raw_decode(html, start_point)[0]
+        except json.decoder.JSONDecodeError:
+            pass
+
     full_obj = find_object_from_startpoint(html, start_point)
     try:
         return json.loads(full_obj)
@@ -153,33 +209,28 @@ def throttling_array_split(js_array):
         A list of strings representing splits on `,` in the throttling array.
     """
     results = []
-    curr_substring = js_array[1:]
-
-    comma_regex = re.compile(r",")
     func_regex = re.compile(r"function\([^)]*\)")
 
-    while len(curr_substring) > 0:
-        if curr_substring.startswith('function'):
+    i = 1
+    end = len(js_array)
+    while i < end:
+        if js_array.startswith('function', i):
             # Handle functions separately. These can contain commas
-            match = func_regex.search(curr_substring)
-            match_start, match_end = match.span()
-
-            function_text = find_object_from_startpoint(curr_substring, match.span()[1])
-            full_function_def = curr_substring[:match_end + len(function_text)]
-            results.append(full_function_def)
-            curr_substring = curr_substring[len(full_function_def) + 1:]
+            match = func_regex.search(js_array, i)
+            function_end = find_object_end(js_array, match.end())
+            results.append(js_array[i:function_end])
+            i = function_end + 1
         else:
-            match = comma_regex.search(curr_substring)
-
-            # Try-catch to capture end of array
-            try:
-                match_start, match_end = match.span()
-            except AttributeError:
-                match_start = len(curr_substring) - 1
-                match_end = match_start + 1
-
-            curr_el = curr_substring[:match_start]
-            results.append(curr_el)
-            curr_substring = curr_substring[match_end:]
+            element_end = i
+            if js_array.startswith('"', i):
+                # Strings can contain commas too
+                element_end = _string_end(js_array, i)
+            comma = js_array.find(',', element_end)
+            if comma == -1:
+                # The last element, followed by the closing bracket
+                results.append(js_array[i:end - 1])
+                break
+            results.append(js_array[i:comma])
+            i = comma + 1
 
     return results
@@ -0,0 +1,140 @@
+"""Hand chunks from a network reader to a disk writer thread.
+
+Writing each chunk inline on the download thread means a slow disk stalls
+the socket read and lets the TCP window close. A :class:`WritePipeline`
+copies chunks into pooled buffers and queues them for a writer thread, so the
+reader only blocks once ``depth`` buffers are waiting to be written.
+"""
+import logging
+import queue
+import threading
+from typing import Callable, Optional
+
+from pytube.buffers import BufferPool
+
+logger = logging.getLogger(__name__)
+
+# Number of buffers that may wait for the writer before the reader blocks.
+default_depth = 4
+
+_stop = object()
+
+
+class WritePipeline:
+    """Run ``handler(view, offset)`` on a writer thread for each submitted chunk.
+
+    Chunks are handled in the order they were submitted. Use as a context
+    manager: leaving the block waits for every queued chunk to be handled, and
+    re-raises any error the handler raised.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[memoryview, int], None],
+        depth: Optional[int] = None,
+        pool: Optional[BufferPool] = None,
+        start: int = 0,
+    ):
+        """Construct a :class:`WritePipeline <WritePipeline>`.
+
+        :param handler:
+            Called on the writer thread with a view of each chunk and the
+            offset of its first byte. The view is only valid during the call.
+        :param int depth:
+            (Optional) Number of buffers that may wait to be handled.
+            Defaults to :data:`default_depth`.
+        :param BufferPool pool:
+            (Optional) Where buffers are borrowed from. Defaults to
+            :data:`pytube.request.buffer_pool`.
+        :param int start:
+            Offset of the first chunk submitted without an explicit offset.
+        """
+        if pool is None:
+            from pytube import request
+            pool = request.buffer_pool
+        self.handler = handler
+        self.pool = pool
+        self.position = start
+        self._queue: queue.Queue = queue.Queue(maxsize=depth or default_depth)
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, name="pytube-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, chunk, offset: Optional[int] = None) -> None:
+        """Queue a copy of ``chunk`` to be handled.
+
+        Blocks while the queue is full.
+
+        :param chunk:
+            A bytes-like object; it may be reused as soon as this returns.
+        :param int offset:
+            (Optional) Offset of the chunk's first byte. Defaults to the byte
+            after the previous chunk.
+        """
+        self._raise_error()
+        view = memoryview(chunk)
+        with self._lock:
+            if offset is None:
+                offset = self.position
+            self.position = offset + len(view)
+        while view:
+            buffer = self.pool.acquire()
+            size = min(len(buffer), len(view))
+            buffer[:size] = view[:size]
+            self._put((buffer, size, offset))
+            view = view[size:]
+            offset += size
+
+    def _put(self, item) -> None:
+        # Wake up regularly so a failed writer can't leave the reader stuck.
+        while True:
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                self._raise_error()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _stop:
+                return
+            buffer, size, offset = item
+            try:
+                if self._error is None:
+                    self.handler(memoryview(buffer)[:size], offset)
+            except BaseException as e:
+                logger.debug("writer failed: %r", e)
+                self._error = e
+            finally:
+                self.pool.release(buffer)
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def close(self) -> None:
+        """Wait until every queued chunk is handled, then stop the writer.
+
+        :raises: Any error raised by the handler.
+        """
+        if self._thread.is_alive():
+            self._queue.put(_stop)
+            self._thread.join()
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        # Keep the reader's error; still finish writing what was received.
+        try:
+            self.close()
+        except BaseException as e:
+            logger.debug("writer failed after reader error: %r", e)
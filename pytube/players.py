@@ -0,0 +1,375 @@
+"""Caches of YouTube's player js and the ciphers extracted from it.
+
+The player (``base.js``) is about a megabyte, and building a
+:class:`Cipher <pytube.cipher.Cipher>` from it runs dozens of regular
+expressions over it. Both only change when YouTube ships a new player
+version, so :class:`PlayerStore` keeps them on disk, where later runs and
+other processes (e.g. the workers of a web server) can reuse them, and
+:class:`PlayerCache` keeps the players in use in memory.
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+from pytube import request
+from pytube.cipher import Cipher
+
+logger = logging.getLogger(__name__)
+
+default_cache_dir = os.environ.get("PYTUBE_PLAYER_CACHE") or os.path.join(
+    pathlib.Path(__file__).parent.resolve(), "__cache__", "players"
+)
+
+
+def player_key(js_url: str) -> str:
+    """Return a key, safe to use as a file name, for a player url.
+
+    **Example**:
+
+    >>> player_key("https://youtube.com/s/player/13371337/player_ias.vflset/en_US/base.js")
+    '13371337-39ce8b2edeb7'
+
+    :param str js_url:
+        The url of the player's base.js.
+    :rtype: str
+    """
+    match = re.search(r"/s/player/([\w-]+)/", js_url)
+    version = match.group(1) if match else "player"
+    digest = hashlib.sha1(js_url.encode("utf-8")).hexdigest()[:12]  # nosec
+    return f"{version}-{digest}"
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()  # nosec
+
+
+class PlayerStore:
+    """On-disk cache of player js and ciphers, keyed by player version.
+
+    Files are replaced atomically, so any number of processes can share a
+    directory. The cache is best effort: if the directory can't be written,
+    players are fetched and parsed as if it didn't exist.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_age: float = 24 * 3600):
+        """Construct a :class:`PlayerStore <PlayerStore>`.
+
+        :param str directory:
+            (Optional) Where to keep the files. Defaults to the
+            ``PYTUBE_PLAYER_CACHE`` environment variable, or a ``__cache__``
+            directory inside the package.
+        :param float max_age:
+            Seconds a stored player is used before it's revalidated with
+            ``If-None-Match``/``If-Modified-Since``.
+        """
+        self.directory = str(directory or default_cache_dir)
+        self.max_age = max_age
+
+    def _path(self, js_url: str, suffix: str) -> str:
+        return os.path.join(self.directory, player_key(js_url) + suffix)
+
+    def _read_meta(self, js_url: str) -> Dict:
+        try:
+            meta = json.loads(
+                pathlib.Path(self._path(js_url, ".json")).read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(meta, dict) or meta.get("url") != js_url:
+            return {}
+        return meta
+
+    def _write(self, path: str, text: str) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    fh.write(text)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            logger.debug("could not write %s: %r", path, e)
+
+    def load_js(self, js_url: str, fresh: bool = False) -> Optional[str]:
+        """Return the stored js of a player, without revalidating it.
+
+        :param bool fresh:
+            Only return the js if it was validated within ``max_age``.
+        :rtype: str
+        :returns:
+            The js, or None if it isn't stored.
+        """
+        meta = self._read_meta(js_url)
+        if not meta:
+            return None
+        if fresh and time.time() - meta.get("validated", 0) >= self.max_age:
+            return None
+        try:
+            js = pathlib.Path(self._path(js_url, ".js")).read_text(encoding="utf-8")
+        except OSError:
+            return None
+        if _sha1(js) != meta.get("js_sha1"):
+            return None
+        return js
+
+    def store_js(self, js_url: str, js: str, headers: Optional[Dict] = None) -> None:
+        """Store the js of a player, dropping any cipher built from an older copy.
+
+        :param dict headers:
+            (Optional) Lowercase response headers; ``etag`` and
+            ``last-modified`` are kept for revalidation.
+        """
+        headers = headers or {}
+        meta = {
+            "url": js_url,
+            "js_sha1": _sha1(js),
+            "validated": time.time(),
+        }
+        for header in ("etag", "last-modified"):
+            if isinstance(headers.get(header), str):
+                meta[header] = headers[header]
+        self._write(self._path(js_url, ".js"), js)
+        self._write(self._path(js_url, ".json"), json.dumps(meta))
+
+    async def aload_js(self, js_url: str, fresh: bool = False) -> Optional[str]:
+        """Like :meth:`load_js`, but read the files in a worker thread.
+
+        :rtype: str
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.load_js, js_url, fresh=fresh)
+        )
+
+    async def astore_js(self, js_url: str, js: str, headers: Optional[Dict] = None) -> None:
+        """Like :meth:`store_js`, but write the files in a worker thread."""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(
+            None, functools.partial(self.store_js, js_url, js, headers)
+        )
+
+    def get_js(self, js_url: str) -> str:
+        """Return the js of a player, fetching or revalidating it as needed.
+
+        :rtype: str
+        """
+        js = self.load_js(js_url, fresh=True)
+        if js is not None:
+            return js
+        meta = self._read_meta(js_url)
+        js = self.load_js(js_url)
+
+        if js is None:
+            body, headers = request.get_if_modified(js_url)
+        else:
+            body, headers = request.get_if_modified(
+                js_url, etag=meta.get("etag"), last_modified=meta.get("last-modified")
+            )
+        if body is None and js is not None:
+            logger.debug("player %s not modified", js_url)
+            meta["validated"] = time.time()
+            self._write(self._path(js_url, ".json"), json.dumps(meta))
+            return js
+        if body is None:
+            body = request.get(js_url)
+        self.store_js(js_url, body, headers)
+        return body
+
+    def get_cipher(self, js_url: str, js: str) -> Cipher:
+        """Return the cipher of a player, building and storing it if needed.
+
+        :param str js_url:
+            The url of the player's base.js.
+        :param str js:
+            The contents of the base.js asset file.
+        :rtype: Cipher
+        """
+        meta = self._read_meta(js_url)
+        digest = _sha1(js)
+        if meta.get("js_sha1") == digest and "cipher" in meta:
+            try:
+                return Cipher.from_dict(meta["cipher"])
+            except ValueError as e:
+                logger.debug("stored cipher of %s unusable: %r", js_url, e)
+
+        cipher = Cipher(js=js)
+        if meta.get("js_sha1") != digest:
+            # The js wasn't fetched through this store; keep it as well.
+            self.store_js(js_url, js)
+            meta = self._read_meta(js_url) or {
+                "url": js_url, "js_sha1": digest, "validated": time.time()
+            }
+        meta["cipher"] = cipher.to_dict()
+        self._write(self._path(js_url, ".json"), json.dumps(meta))
+        return cipher
+
+    def invalidate(self, js_url: str) -> None:
+        """Forget a player, e.g. because deciphering with it failed."""
+        for suffix in (".json", ".js"):
+            try:
+                os.remove(self._path(js_url, suffix))
+            except OSError:
+                pass
+
+
+#: The store used by :class:`YouTube <pytube.YouTube>`.
+player_store = PlayerStore()
+
+
+class _Player:
+    """The js of one player, and what was extracted from it."""
+
+    __slots__ = ("js", "cipher")
+
+    def __init__(self):
+        self.js: Future = Future()
+        self.cipher: Optional[Future] = None
+
+
+class PlayerCache:
+    """Thread-safe in-memory cache of the most recently used players.
+
+    Each player is fetched, and its cipher extracted, only once however many
+    threads ask for it at the same time: the first caller does the work and
+    the others wait for its result. Players are looked up through a
+    :class:`PlayerStore` before being fetched.
+    """
+
+    def __init__(self, maxsize: int = 4, store: Optional[PlayerStore] = None):
+        """Construct a :class:`PlayerCache <PlayerCache>`.
+
+        :param int maxsize:
+            Number of player versions kept; the least recently used one is
+            dropped to make room for another.
+        :param PlayerStore store:
+            (Optional) Where players are stored on disk. Defaults to
+            :data:`player_store`.
+        """
+        self.maxsize = maxsize
+        self._store = store
+        self._players: "OrderedDict[str, _Player]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def store(self) -> PlayerStore:
+        return self._store or player_store
+
+    def _player(self, js_url: str):
+        """Return the entry of a player, and whether it was just added."""
+        with self._lock:
+            player = self._players.get(js_url)
+            if player is not None:
+                self._players.move_to_end(js_url)
+                return player, False
+            player = self._players[js_url] = _Player()
+            while len(self._players) > self.maxsize:
+                self._players.popitem(last=False)
+            return player, True
+
+    def _settle(self, js_url: str, player: _Player, future: Future, fn: Callable):
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            # Let the next caller try again.
+            with self._lock:
+                if self._players.get(js_url) is player:
+                    del self._players[js_url]
+            future.set_exception(e)
+
+    def js(self, js_url: str) -> str:
+        """Return the js of a player, fetching it if needed.
+
+        :rtype: str
+        """
+        player, added = self._player(js_url)
+        if added:
+            self._settle(
+                js_url, player, player.js, lambda: self.store.get_js(js_url)
+            )
+        return player.js.result()
+
+    def cached_js(self, js_url: str) -> Optional[str]:
+        """Return the js of a player if it's ready, without blocking.
+
+        :rtype: str
+        """
+        with self._lock:
+            player = self._players.get(js_url)
+        if player is None or not player.js.done() or player.js.exception():
+            return None
+        return player.js.result()
+
+    def put_js(self, js_url: str, js: str) -> None:
+        """Add the js of a player fetched elsewhere, e.g. asynchronously."""
+        player, added = self._player(js_url)
+        if added:
+            player.js.set_result(js)
+
+    def cipher(self, js_url: str, js: Optional[str] = None) -> Cipher:
+        """Return the cipher of a player.
+
+        The :class:`Cipher <pytube.cipher.Cipher>` is extracted once per
+        player and shared by every video using it; it isn't modified by
+        deciphering, so any number of threads can use it at once.
+
+        :param str js_url:
+            The url of the player's base.js.
+        :param str js:
+            (Optional) The contents of the base.js, if already fetched.
+        :rtype: Cipher
+        """
+        player, added = self._player(js_url)
+        if added:
+            if js is None:
+                self._settle(
+                    js_url, player, player.js, lambda: self.store.get_js(js_url)
+                )
+            else:
+                player.js.set_result(js)
+        with self._lock:
+            build = player.cipher is None
+            if build:
+                player.cipher = Future()
+        if build:
+            self._settle(
+                js_url,
+                player,
+                player.cipher,
+                lambda: self.store.get_cipher(js_url, player.js.result()),
+            )
+        return player.cipher.result()
+
+    def invalidate(self, js_url: str, js: Optional[str] = None) -> None:
+        """Forget a player, e.g. because deciphering with it failed.
+
+        :param str js:
+            (Optional) Only forget the player if this is still its js, so a
+            player another thread has just refetched is kept.
+        """
+        with self._lock:
+            player = self._players.get(js_url)
+            if player is None:
+                return
+            if js is not None and player.js.done() and not player.js.exception():
+                if player.js.result() != js:
+                    return
+            del self._players[js_url]
+        self.store.invalidate(js_url)
+
+
+#: The cache used by :class:`YouTube <pytube.YouTube>`.
+player_cache = PlayerCache()
@@ -0,0 +1,262 @@
+"""Keep-alive connection pooling for :mod:`pytube.request`.
+
+:func:`urllib.request.urlopen` forces ``Connection: close`` on every request,
+so each ``get``, ``post``, ``head`` and each range fetched by ``stream`` pays
+for its own TCP and TLS handshake. This module provides urllib handlers that
+keep HTTP/1.1 connections open and hand them back to a per-host pool once the
+response body has been fully consumed.
+"""
+import http.client
+import logging
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.error import URLError
+from urllib.request import HTTPHandler, HTTPSHandler
+
+logger = logging.getLogger(__name__)
+
+# Errors raised when a server silently dropped an idle keep-alive connection.
+_stale_connection_errors = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class PooledHTTPResponse(http.client.HTTPResponse):
+    """HTTP response that returns its connection to the pool when done.
+
+    The connection is released once the body has been read to the end. If
+    the response is closed early, the unread body is still on the socket, so
+    the connection is discarded instead.
+    """
+
+    _release = None
+    _reusable = True
+
+    def close(self):
+        if self.fp is not None and self.length != 0:
+            # Closed before the whole body was read.
+            self._reusable = False
+        super().close()
+
+    def _close_conn(self):
+        super()._close_conn()
+        release, self._release = self._release, None
+        if release is not None:
+            release(self._reusable and not self.will_close)
+
+
+class _PooledConnectionMixin:
+    response_class = PooledHTTPResponse
+
+
+class PooledHTTPConnection(_PooledConnectionMixin, http.client.HTTPConnection):
+    """:class:`http.client.HTTPConnection` producing pooled responses."""
+
+
+class PooledHTTPSConnection(_PooledConnectionMixin, http.client.HTTPSConnection):
+    """:class:`http.client.HTTPSConnection` producing pooled responses."""
+
+
+_connection_classes = {
+    http.client.HTTPConnection: PooledHTTPConnection,
+    http.client.HTTPSConnection: PooledHTTPSConnection,
+}
+
+
+class ConnectionPool:
+    """Thread-safe store of idle keep-alive connections, keyed per host."""
+
+    def __init__(self, maxsize: int = 10, idle_timeout: float = 30.0):
+        """Construct a :class:`ConnectionPool <ConnectionPool>`.
+
+        :param int maxsize:
+            Maximum number of idle connections kept per host.
+        :param float idle_timeout:
+            Seconds after which an idle connection is assumed to have been
+            closed by the server and is dropped instead of reused.
+        """
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[Tuple, List[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+        self._requests = 0
+
+    def acquire(self, key: Tuple) -> Optional[http.client.HTTPConnection]:
+        """Take an idle connection for ``key`` out of the pool, if any.
+
+        :param tuple key:
+            Pool key, as built by the handler for a request.
+        :rtype: http.client.HTTPConnection or None
+        """
+        now = time.monotonic()
+        expired = []
+        conn = None
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                candidate, released_at = idle.pop()
+                if now - released_at > self.idle_timeout:
+                    expired.append(candidate)
+                    continue
+                conn = candidate
+                break
+            self._discarded += len(expired)
+        for stale in expired:
+            stale.close()
+        return conn
+
+    def release(self, key: Tuple, conn: http.client.HTTPConnection, reusable: bool):
+        """Return a connection to the pool once its response is consumed.
+
+        :param tuple key:
+            Pool key the connection was created for.
+        :param conn:
+            The connection to give back.
+        :param bool reusable:
+            Whether the connection is in a clean state for another request.
+        """
+        if reusable and conn.sock is not None:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.maxsize:
+                    idle.append((conn, time.monotonic()))
+                    return
+        with self._lock:
+            self._discarded += 1
+        conn.close()
+
+    def clear(self):
+        """Close every idle connection held by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+    def stats(self) -> Dict:
+        """Return counters describing how the pool has been used.
+
+        :rtype: dict
+        :returns:
+            ``requests`` sent, connections ``created``, ``reused`` and
+            ``discarded``, and the number of ``idle`` connections per host.
+        """
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'created': self._created,
+                'reused': self._reused,
+                'discarded': self._discarded,
+                'idle': {
+                    key[1]: len(connections)
+                    for key, connections in self._idle.items()
+                    if connections
+                },
+            }
+
+    def _record(self, reused: bool):
+        with self._lock:
+            self._requests += 1
+            if reused:
+                self._reused += 1
+            else:
+                self._created += 1
+
+
+class _KeepAliveHandlerMixin:
+    """Replacement for ``AbstractHTTPHandler.do_open`` backed by a pool."""
+
+    def __init__(self, pool: ConnectionPool, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = pool
+
+    def do_open(self, http_class, req, **http_conn_args):
+        host = req.host
+        if not host:
+            raise URLError('no host given')
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers["Connection"] = "keep-alive"
+        headers = {name.title(): val for name, val in headers.items()}
+
+        tunnel_headers = {}
+        if req._tunnel_host:
+            proxy_auth_hdr = "Proxy-Authorization"
+            if proxy_auth_hdr in headers:
+                # Proxy-Authorization should not be sent to origin server.
+                tunnel_headers[proxy_auth_hdr] = headers.pop(proxy_auth_hdr)
+
+        key = (http_class.__name__, host, req._tunnel_host)
+        conn = self.pool.acquire(key)
+        if conn is not None:
+            _set_timeout(conn, req.timeout)
+            try:
+                response = self._send(conn, req, headers)
+            except (URLError, *_stale_connection_errors) as e:
+                if isinstance(e, URLError) and not isinstance(
+                    e.reason, _stale_connection_errors
+                ):
+                    raise
+                # The server closed the idle connection; retry on a new one.
+                logger.debug("discarding stale connection to %s: %s", host, e)
+                conn = None
+            else:
+                self.pool._record(reused=True)
+
+        if conn is None:
+            pooled_class = _connection_classes.get(http_class, http_class)
+            conn = pooled_class(host, timeout=req.timeout, **http_conn_args)
+            conn.set_debuglevel(self._debuglevel)
+            if req._tunnel_host:
+                conn.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+            response = self._send(conn, req, headers)
+            self.pool._record(reused=False)
+
+        response._release = lambda reusable: self.pool.release(key, conn, reusable)
+        response.url = req.get_full_url()
+        # urllib clients expect the reason in .msg.
+        response.msg = response.reason
+        return response
+
+    def _send(self, conn, req, headers):
+        try:
+            try:
+                conn.request(
+                    req.get_method(),
+                    req.selector,
+                    req.data,
+                    headers,
+                    encode_chunked=req.has_header('Transfer-encoding')
+                )
+            except OSError as err:  # timeout error
+                raise URLError(err)
+            return conn.getresponse()
+        except BaseException:
+            conn.close()
+            raise
+
+
+class KeepAliveHTTPHandler(_KeepAliveHandlerMixin, HTTPHandler):
+    """urllib handler sending ``http://`` requests over pooled connections."""
+
+
+class KeepAliveHTTPSHandler(_KeepAliveHandlerMixin, HTTPSHandler):
+    """urllib handler sending ``https://`` requests over pooled connections."""
+
+
+def _set_timeout(conn: http.client.HTTPConnection, timeout):
+    """Apply a per-request timeout to a connection taken from the pool."""
+    if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+        timeout = socket.getdefaulttimeout()
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
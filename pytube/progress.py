@@ -0,0 +1,287 @@
+"""Coalesced progress events for one or more concurrent downloads.
+
+:meth:`Stream.on_progress <pytube.Stream.on_progress>` fires once per chunk,
+which is far more often than a progress bar or a chat message can usefully
+be redrawn. A :class:`ProgressBus` collects progress from any number of
+tasks and delivers a snapshot of all of them to its subscribers at most once
+per ``interval``, so subscribers can also show the total of a job made of
+several streams.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TaskProgress:
+    """Progress of one task at the time an event was published."""
+
+    __slots__ = ("name", "label", "job", "received", "total", "done")
+
+    def __init__(
+        self,
+        name: Hashable,
+        label: str,
+        job: Hashable,
+        received: int,
+        total: Optional[int],
+        done: bool,
+    ):
+        self.name = name
+        self.label = label
+        self.job = job
+        self.received = received
+        self.total = total
+        self.done = done
+
+    def __repr__(self) -> str:
+        return (
+            f"<TaskProgress: {self.label} {self.received}/{self.total}"
+            f"{' done' if self.done else ''}>"
+        )
+
+
+class ProgressEvent:
+    """Snapshot of every task on a :class:`ProgressBus`."""
+
+    def __init__(self, tasks: Tuple[TaskProgress, ...], changed: FrozenSet[Hashable]):
+        #: Progress of every task, in the order they were added.
+        self.tasks = tasks
+        #: Names of the tasks that progressed since the previous event.
+        self.changed = changed
+
+    def jobs(self, changed: bool = False) -> List[Hashable]:
+        """Return the jobs of the tasks, optionally only of changed tasks.
+
+        :rtype: list
+        """
+        jobs: List[Hashable] = []
+        for task in self.tasks:
+            if (not changed or task.name in self.changed) and task.job not in jobs:
+                jobs.append(task.job)
+        return jobs
+
+    def progress(self, job: Hashable = None) -> Tuple[int, Optional[int]]:
+        """Return the bytes received and expected by the tasks of ``job``.
+
+        :param job:
+            (Optional) Only count the tasks of this job. Defaults to all tasks.
+        :rtype: tuple
+        :returns:
+            ``(received, total)``; ``total`` is ``None`` while the size of a
+            task is unknown.
+        """
+        received, total = 0, 0
+        for task in self.tasks:
+            if job is not None and task.job != job:
+                continue
+            received += task.received
+            if total is not None and task.total is not None:
+                total += task.total
+            else:
+                total = None
+        return received, total
+
+    def fraction(self, job: Hashable = None) -> Optional[float]:
+        """Return the fraction of ``job`` that is complete, or ``None`` if unknown.
+
+        :rtype: float
+        """
+        received, total = self.progress(job)
+        if not total:
+            return None
+        return min(1.0, received / total)
+
+
+class ProgressTask:
+    """A download reporting to a :class:`ProgressBus`."""
+
+    def __init__(
+        self,
+        bus: "ProgressBus",
+        name: Hashable,
+        label: str,
+        job: Hashable,
+        total: Optional[int],
+    ):
+        self.bus = bus
+        self.name = name
+        self.label = label
+        self.job = job
+        self.total = total
+        self.received = 0
+        self.done = False
+
+    def advance(self, nbytes: int) -> None:
+        """Record ``nbytes`` more bytes received."""
+        self.bus._update(self, None, None, False, nbytes)
+
+    def update(self, received: int, total: Optional[int] = None) -> None:
+        """Record the number of bytes received so far, and the size if now known."""
+        self.bus._update(self, received, total, False)
+
+    def finish(self) -> None:
+        """Mark the task complete; always delivered without delay."""
+        self.bus._update(self, self.received, None, True)
+
+
+class ProgressBus:
+    """Thread-safe fan-out of coalesced progress events.
+
+    Events are delivered on the thread reporting progress, to one subscriber
+    at a time and never out of order. A report that arrives while an event is
+    being delivered, or sooner than ``interval`` after the previous one, is
+    folded into the next event instead of being delivered on its own.
+    """
+
+    def __init__(self, interval: float = 0.1, min_bytes: int = 0):
+        """Construct a :class:`ProgressBus <ProgressBus>`.
+
+        :param float interval:
+            Minimum number of seconds between two events.
+        :param int min_bytes:
+            Minimum number of bytes received between two events; events for
+            tasks starting or finishing are delivered regardless.
+        """
+        self.interval = interval
+        self.min_bytes = min_bytes
+        self._tasks: Dict[Hashable, ProgressTask] = {}
+        self._subscribers: List[Callable[[ProgressEvent], Any]] = []
+        self._changed: set = set()
+        self._pending_bytes = 0
+        self._last = float("-inf")
+        self._lock = threading.Lock()
+        self._deliver_lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[ProgressEvent], Any]) -> Callable[[], None]:
+        """Call ``callback`` with every :class:`ProgressEvent` from now on.
+
+        :returns:
+            A function that unsubscribes ``callback``.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def task(
+        self,
+        name: Hashable,
+        total: Optional[int] = None,
+        job: Hashable = None,
+        label: Optional[str] = None,
+    ) -> ProgressTask:
+        """Return the task called ``name``, adding it if it's new.
+
+        :param name:
+            Identifies the task on this bus.
+        :param int total:
+            (Optional) Expected number of bytes.
+        :param job:
+            (Optional) Groups the tasks whose progress is added up by
+            :meth:`ProgressEvent.progress`.
+        :param str label:
+            (Optional) Human-readable name. Defaults to ``str(name)``.
+        :rtype: ProgressTask
+        """
+        with self._lock:
+            task = self._tasks.get(name)
+            if task is None:
+                task = ProgressTask(
+                    self, name, label or str(name), job, total
+                )
+                self._tasks[name] = task
+                self._changed.add(name)
+            return task
+
+    def remove(self, job: Hashable = None) -> None:
+        """Forget the tasks of ``job``, or every task."""
+        with self._lock:
+            for name, task in list(self._tasks.items()):
+                if job is None or task.job == job:
+                    del self._tasks[name]
+                    self._changed.discard(name)
+
+    def on_progress(self, stream, chunk: bytes, bytes_remaining: int) -> None:
+        """Report a :class:`Stream <pytube.Stream>`'s progress.
+
+        Matches the ``on_progress`` callback of :class:`pytube.YouTube`.
+        """
+        task = self.task(
+            stream,
+            total=stream.filesize,
+            label=f"{stream.type} {stream.resolution or stream.abr}",
+        )
+        task.update(stream.filesize - bytes_remaining)
+
+    def on_complete(self, stream, file_path: Optional[str]) -> None:
+        """Mark a :class:`Stream <pytube.Stream>` complete.
+
+        Matches the ``on_complete`` callback of :class:`pytube.YouTube`.
+        """
+        self.task(stream, total=stream.filesize).finish()
+
+    def flush(self) -> None:
+        """Deliver any progress not delivered yet."""
+        self._deliver(force=True)
+
+    def _update(
+        self,
+        task: ProgressTask,
+        received: Optional[int],
+        total: Optional[int],
+        done: bool,
+        delta: int = 0,
+    ) -> None:
+        with self._lock:
+            if received is None:
+                received = task.received + delta
+            self._pending_bytes += max(0, received - task.received)
+            task.received = received
+            if total is not None:
+                task.total = total
+            task.done = task.done or done
+            self._changed.add(task.name)
+        self._deliver(force=done)
+
+    def _deliver(self, force: bool) -> None:
+        # Whoever holds the delivery lock will pick this report up next time.
+        if not self._deliver_lock.acquire(blocking=force):
+            return
+        try:
+            with self._lock:
+                now = time.monotonic()
+                if not self._changed:
+                    return
+                if not force and (
+                    now - self._last < self.interval
+                    or self._pending_bytes < self.min_bytes
+                ):
+                    return
+                event = ProgressEvent(
+                    tuple(
+                        TaskProgress(
+                            t.name, t.label, t.job, t.received, t.total, t.done
+                        )
+                        for t in self._tasks.values()
+                    ),
+                    frozenset(self._changed),
+                )
+                self._changed = set()
+                self._pending_bytes = 0
+                self._last = now
+                subscribers = list(self._subscribers)
+            for subscriber in subscribers:
+                try:
+                    subscriber(event)
+                except Exception:
+                    logger.exception("progress subscriber %r failed", subscriber)
+        finally:
+            self._deliver_lock.release()
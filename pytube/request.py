@@ -1,19 +1,99 @@
 """Implements a simple wrapper around urlopen."""
+import asyncio
+import functools
 import http.client
 import json
 import logging
 import re
 import socket
-from functools import lru_cache
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from typing import Dict, Optional, Tuple
 from urllib import parse
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+from urllib.request import ProxyHandler, Request, build_opener
 
-from pytube.exceptions import RegexMatchError, MaxRetriesExceeded
-from pytube.helpers import regex_search
+from pytube import aio, compression
+from pytube.buffers import BufferPool
+from pytube.cache import ExpiringCache
+from pytube.exceptions import RegexMatchError
+from pytube.pool import ConnectionPool, KeepAliveHTTPHandler, KeepAliveHTTPSHandler
+from pytube.retry import RetryPolicy
+from pytube.scheduler import BandwidthScheduler
 
 logger = logging.getLogger(__name__)
 default_range_size = 9437184  # 9MB
+min_range_size = 1048576  # 1MB
+max_range_size = 4 * default_range_size
+# Number of OTF segments requested at the same time.
+default_segment_workers = 4
+# Size of the reads made by the asyncio API while streaming a range.
+aio_chunk_size = 65536
+# Size of the reads of a response body when no rate limit sets one. Bounded
+# reads let an interrupted range resume after the last chunk received.
+read_chunk_size = 65536
+
+# Keep-alive connections shared by every request made through this module.
+connection_pool = ConnectionPool()
+# Keep-alive connections shared by the asyncio API (``aget``, ``astream``...).
+async_connection_pool = aio.AsyncConnectionPool()
+# Bandwidth budget and per-host connection caps shared by every transfer.
+bandwidth_scheduler = BandwidthScheduler()
+# Read buffers lent to zero-copy transfers.
+buffer_pool = BufferPool()
+# Media sizes, keyed by (video id, itag), shared by every Stream.
+filesize_cache = ExpiringCache(maxsize=512)
+_opener = None
+# Proxies in use, by URL scheme. The asyncio client can't reach them directly.
+_proxies: Dict[str, str] = {}
+
+
+def install_proxy(proxy_handler: Optional[Dict[str, str]] = None) -> None:
+    """Route pooled requests through the given proxies.
+
+    :param dict proxy_handler:
+        (Optional) A dict mapping protocol to proxy address. If not given,
+        proxies are read from the environment like :func:`urllib.request.urlopen`.
+    """
+    global _opener, _proxies
+    proxy_support = ProxyHandler(proxy_handler)
+    _proxies = dict(proxy_support.proxies)
+    _opener = build_opener(
+        proxy_support,
+        KeepAliveHTTPHandler(connection_pool),
+        KeepAliveHTTPSHandler(connection_pool),
+    )
+    # Connections opened for the previous proxy settings must not be reused.
+    connection_pool.clear()
+
+
+def urlopen(request, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+    """Open a :class:`urllib.request.Request` over a pooled connection.
+
+    Behaves like :func:`urllib.request.urlopen`, but HTTP/1.1 connections are
+    kept alive and reused for later requests to the same host.
+    """
+    if _opener is None:
+        install_proxy()
+    return _opener.open(request, timeout=timeout)  # nosec
+
+
+def pool_stats() -> Dict:
+    """Return usage counters of the shared connection pool.
+
+    :rtype: dict
+    """
+    return connection_pool.stats()
+
+
+def async_pool_stats() -> Dict:
+    """Return usage counters of the connection pool used by the asyncio API.
+
+    :rtype: dict
+    """
+    return async_connection_pool.stats()
 
 
 def _execute_request(
@@ -21,20 +101,38 @@ def _execute_request(
     method=None,
     headers=None,
     data=None,
-    timeout=socket._GLOBAL_DEFAULT_TIMEOUT
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    compressed=True
 ):
+    """Send a request and return the response.
+
+    With ``compressed``, the server is offered gzip, deflate and (if a brotli
+    module is installed) brotli encodings, and the returned response decodes
+    the body as it is read. Media and ``HEAD`` requests should pass
+    ``compressed=False`` so sizes and byte ranges refer to the raw file.
+    """
+    base_headers, data = _prepare_request(url, headers, data, compressed)
+    request = Request(url, headers=base_headers, method=method, data=data)
+    response = urlopen(request, timeout=timeout)  # nosec
+    if compressed:
+        response = compression.decode_response(response)
+    return response
+
+
+def _prepare_request(url, headers=None, data=None, compressed=False):
+    """Validate ``url`` and build the headers and body shared by all requests."""
+    if not url.lower().startswith("http"):
+        raise ValueError("Invalid URL")
     base_headers = {"User-Agent": "Mozilla/5.0", "accept-language": "en-US,en"}
+    if compressed:
+        base_headers["Accept-Encoding"] = compression.accept_encoding
     if headers:
         base_headers.update(headers)
     if data:
         # encode data for request
         if not isinstance(data, bytes):
             data = bytes(json.dumps(data), encoding="utf-8")
-    if url.lower().startswith("http"):
-        request = Request(url, headers=base_headers, method=method, data=data)
-    else:
-        raise ValueError("Invalid URL")
-    return urlopen(request, timeout=timeout)  # nosec
+    return base_headers, data
 
 
 def get(url, extra_headers=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
@@ -54,6 +152,51 @@ def get(url, extra_headers=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
     return response.read().decode("utf-8")
 
 
+def get_if_modified(
+    url,
+    etag=None,
+    last_modified=None,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT
+) -> Tuple[Optional[str], Dict[str, str]]:
+    """Send a conditional http GET request.
+
+    :param str url:
+        The URL to perform the GET request for.
+    :param str etag:
+        (Optional) ``ETag`` of the copy held, sent as ``If-None-Match``.
+    :param str last_modified:
+        (Optional) ``Last-Modified`` of the copy held, sent as
+        ``If-Modified-Since``.
+    :rtype: tuple
+    :returns:
+        The UTF-8 decoded body, or None if the server answered
+        ``304 Not Modified``, and a dictionary of the ``etag`` and
+        ``last-modified`` headers that were sent.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    try:
+        response = _execute_request(url, headers=headers, timeout=timeout)
+    except HTTPError as e:
+        if e.code != 304:
+            raise
+        return None, _validators(e.headers)
+    return response.read().decode("utf-8"), _validators(response.info())
+
+
+def _validators(headers) -> Dict[str, str]:
+    """Return the cache validators among a response's headers."""
+    validators = {}
+    for name in ("etag", "last-modified"):
+        value = headers.get(name) if headers is not None else None
+        if isinstance(value, str):
+            validators[name] = value
+    return validators
+
+
 def post(url, extra_headers=None, data=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
     """Send an http POST request.
 
@@ -85,185 +228,958 @@ def post(url, extra_headers=None, data=None, timeout=socket._GLOBAL_DEFAULT_TIME
     return response.read().decode("utf-8")
 
 
+class SegmentCountParser:
+    """Find the ``Segment-Count`` header of an OTF stream's 0th segment.
+
+    Chunks are fed in as they are downloaded. Only a short tail of the
+    previous chunk is kept, so a header split across two chunks is still
+    found without buffering the whole segment.
+    """
+
+    pattern = re.compile(rb'Segment-Count: (\d+)\r?\n')
+    end_pattern = re.compile(rb'Segment-Count: (\d+)$')
+    _tail_size = 64
+
+    def __init__(self):
+        self.segment_count: Optional[int] = None
+        self._tail = b''
+
+    def feed(self, chunk: bytes) -> Optional[int]:
+        """Scan a chunk for the header.
+
+        :param bytes chunk: The next chunk of the 0th segment.
+        :rtype: int or None
+        :returns: The segment count, once it has been found.
+        """
+        if self.segment_count is None:
+            # Only the bytes around the chunk boundary are copied.
+            boundary = self._tail + chunk[:self._tail_size]
+            match = self.pattern.search(boundary) or self.pattern.search(chunk)
+            if match:
+                self.segment_count = int(match.group(1))
+                self._tail = b''
+            elif len(chunk) >= self._tail_size:
+                self._tail = chunk[-self._tail_size:]
+            else:
+                self._tail = boundary[-self._tail_size:]
+        return self.segment_count
+
+    def close(self) -> Optional[int]:
+        """Signal the end of the segment and return the count, if found.
+
+        A header at the very end of the segment has no trailing line break,
+        so the remaining tail is checked without one.
+        """
+        if self.segment_count is None:
+            match = self.end_pattern.search(self._tail)
+            if match:
+                self.segment_count = int(match.group(1))
+        return self.segment_count
+
+
+def _seq_urls(url):
+    """Split a sequential stream url into a base url and its query params."""
+    # YouTube expects a request sequence number as part of the parameters.
+    split_url = parse.urlsplit(url)
+    base_url = '%s://%s/%s?' % (split_url.scheme, split_url.netloc, split_url.path)
+    querys = dict(parse.parse_qsl(split_url.query))
+
+    def seq_url(seq_num):
+        return base_url + parse.urlencode(dict(querys, sq=seq_num))
+
+    return seq_url
+
+
+def _fetch_in_order(fn, items, max_workers):
+    """Map ``fn`` over ``items`` on a thread pool, yielding results in order.
+
+    At most ``max_workers`` results are held at once, so memory stays
+    bounded no matter how many items there are.
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        try:
+            for item in items:
+                pending.append(executor.submit(fn, item))
+                if len(pending) >= max_workers:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                for item in items:
+                    pending.append(executor.submit(fn, item))
+                    break
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
 def seq_stream(
     url,
     timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
-    max_retries=0
+    max_retries=0,
+    max_workers=None,
+    job=None,
+    retry_policy=None
 ):
     """Read the response in sequence.
+
+    Segments after the 0th are requested concurrently, but are always
+    yielded in order.
+
     :param str url: The URL to perform the GET request for.
+    :param int max_workers:
+        (Optional) Number of segments to request at the same time. Defaults
+        to ``default_segment_workers``.
+    :param job:
+        (Optional) The :class:`~pytube.scheduler.Job` the transfer is
+        charged to. A new job is registered if not given.
+    :param retry_policy:
+        (Optional) The :class:`~pytube.retry.RetryPolicy` applied to each
+        segment, as for :func:`stream`.
     :rtype: Iterable[bytes]
     """
-    # YouTube expects a request sequence number as part of the parameters.
-    split_url = parse.urlsplit(url)
-    base_url = '%s://%s/%s?' % (split_url.scheme, split_url.netloc, split_url.path)
+    retry_policy = _retry_policy(retry_policy, max_retries)
+    if max_workers is None:
+        max_workers = default_segment_workers
+    seq_url = _seq_urls(url)
 
-    querys = dict(parse.parse_qsl(split_url.query))
+    with _scheduler_job(job) as job:
+        # The 0th sequential request provides the file headers, which tell us
+        #  information about how the file is segmented.
+        parser = SegmentCountParser()
+        for chunk in stream(
+            seq_url(0), timeout=timeout, job=job, retry_policy=retry_policy
+        ):
+            yield chunk
+            parser.feed(chunk)
 
-    # The 0th sequential request provides the file headers, which tell us
-    #  information about how the file is segmented.
-    querys['sq'] = 0
-    url = base_url + parse.urlencode(querys)
+        segment_count = parser.close()
+        if segment_count is None:
+            raise RegexMatchError('seq_stream', SegmentCountParser.pattern.pattern)
 
-    segment_data = b''
-    for chunk in stream(url, timeout=timeout, max_retries=max_retries):
-        yield chunk
-        segment_data += chunk
+        def fetch_segment(seq_num):
+            return b''.join(stream(
+                seq_url(seq_num), timeout=timeout, job=job, retry_policy=retry_policy
+            ))
+
+        # Segments are fetched in parallel and handed back in order.
+        yield from _fetch_in_order(
+            fetch_segment, range(1, segment_count + 1), max_workers
+        )
+    return  # pylint: disable=R1711
+
+
+class _RangeReader:
+    """Iterate over bytes ``start`` to ``stop`` (inclusive) of ``url``.
 
-    # We can then parse the header to find the number of segments
-    stream_info = segment_data.split(b'\r\n')
-    segment_count_pattern = re.compile(b'Segment-Count: (\\d+)')
-    for line in stream_info:
-        match = segment_count_pattern.search(line)
+    If the request or the body read fails with an error the retry policy
+    allows, the range is requested again from the byte after the last one
+    received, rather than from its start.
+    """
+
+    def __init__(self, url, start, stop, timeout, retry_policy, job, buffer=None):
+        self.url = url
+        self.start = start
+        self.stop = stop
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.job = job
+        self.buffer = buffer
+        # Total file size reported by the first response, if any.
+        self.total: Optional[int] = None
+        # Seconds until the first response headers arrived.
+        self.ttfb: Optional[float] = None
+
+    def __iter__(self):
+        position = self.start
+        attempt = 0
+        started = time.monotonic()
+        while position <= self.stop:
+            resumed_at = position
+            response = None
+            try:
+                response = _execute_request(
+                    self.url + f"&range={position}-{self.stop}",
+                    method="GET",
+                    timeout=self.timeout,
+                    compressed=False
+                )
+                if self.ttfb is None:
+                    self.ttfb = time.monotonic() - started
+                    self.total = _content_total(response, self.url)
+                for chunk in _read_body(response, self.job, self.buffer):
+                    position += len(chunk)
+                    yield chunk
+                return
+            except Exception as e:
+                if response is not None:
+                    response.close()
+                if position > resumed_at:
+                    # The connection made progress, so start counting afresh.
+                    attempt = 0
+                self.retry_policy.check(e, attempt)
+                attempt += 1
+                logger.debug(
+                    "resuming range %s-%s at %s", self.start, self.stop, position
+                )
+
+
+def _retry_policy(retry_policy, max_retries):
+    """Use ``retry_policy`` if given, else retry ``max_retries`` times."""
+    if retry_policy is not None:
+        return retry_policy
+    return RetryPolicy(max_retries=max_retries)
+
+
+class RangeSizer:
+    """Pick the size of the next range request from measured transfers.
+
+    Each range costs one round trip before the first byte arrives, so ranges
+    are grown until that time-to-first-byte is a small share of the transfer,
+    and shrunk again when throughput drops. The size changes by at most a
+    factor of two per range to smooth out noisy measurements.
+    """
+
+    def __init__(
+        self,
+        range_size: int = default_range_size,
+        minimum: int = min_range_size,
+        maximum: int = max_range_size,
+        target_duration: float = 2.0,
+        max_overhead: float = 0.1,
+    ):
+        """Construct a :class:`RangeSizer <RangeSizer>`.
+
+        :param int range_size:
+            Size of the first range, in bytes.
+        :param int minimum:
+            Smallest range size that will be requested.
+        :param int maximum:
+            Largest range size that will be requested.
+        :param float target_duration:
+            Number of seconds a single range should take to transfer.
+        :param float max_overhead:
+            Largest acceptable ratio of time-to-first-byte to transfer time.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.range_size = min(max(range_size, minimum), maximum)
+        self.target_duration = target_duration
+        self.max_overhead = max_overhead
+        self.throughput: Optional[float] = None
+
+    def record(self, received: int, ttfb: float, elapsed: float) -> int:
+        """Update the range size from one completed range.
+
+        :param int received:
+            Number of bytes received for the range.
+        :param float ttfb:
+            Seconds between sending the request and receiving the headers.
+        :param float elapsed:
+            Seconds between sending the request and reading the last byte.
+        :rtype: int
+        :returns:
+            The size to use for the next range.
+        """
+        transfer = elapsed - ttfb
+        if received <= 0 or transfer <= 0:
+            return self.range_size
+
+        throughput = received / transfer
+        if self.throughput is None:
+            self.throughput = throughput
+        else:
+            self.throughput = (self.throughput + throughput) / 2
+
+        duration = max(self.target_duration, ttfb / self.max_overhead)
+        ideal = self.throughput * duration
+        ideal = min(max(ideal, self.range_size / 2), self.range_size * 2)
+        self.range_size = int(min(max(ideal, self.minimum), self.maximum))
+        return self.range_size
+
+
+def _content_total(response, url) -> Optional[int]:
+    """Read the total file size from a range response, if it is known.
+
+    The ``Content-Range`` header is used when present; otherwise the ``clen``
+    query parameter that YouTube includes on most media urls.
+    """
+    headers = response.info()
+    content_range = headers.get("Content-Range") if headers else None
+    if isinstance(content_range, str):
+        match = re.search(r"/(\d+)\s*$", content_range)
         if match:
-            segment_count = int(match.group(1).decode('utf-8'))
+            return int(match.group(1))
 
-    # We request these segments sequentially to build the file.
-    seq_num = 1
-    while seq_num <= segment_count:
-        # Create sequential request URL
-        querys['sq'] = seq_num
-        url = base_url + parse.urlencode(querys)
+    clen = parse.parse_qs(parse.urlsplit(url).query).get("clen")
+    if clen and clen[0].isdigit():
+        return int(clen[0])
+    return None
 
-        yield from stream(url, timeout=timeout, max_retries=max_retries)
-        seq_num += 1
-    return  # pylint: disable=R1711
+
+def _scheduler_job(job):
+    """Use ``job`` if given, else register a job for the transfer's duration."""
+    if job is not None:
+        return nullcontext(job)
+    return bandwidth_scheduler.job()
+
+
+def _read_body(response, job, buffer=None):
+    """Yield the body of ``response`` in chunks, charging them to ``job``.
+
+    If ``buffer`` is given, the body is read into it and the chunks are
+    :class:`memoryview` slices of it, overwritten by the next read.
+    """
+    if buffer is None:
+        read_size = bandwidth_scheduler.read_size or read_chunk_size
+        while True:
+            try:
+                chunk = response.read(read_size)
+            except http.client.IncompleteRead as e:
+                # Keep what arrived, so a retry resumes after it.
+                if e.partial:
+                    job.consume(len(e.partial))
+                    yield e.partial
+                raise
+            if not chunk:
+                break
+            job.consume(len(chunk))
+            yield chunk
+        return
+
+    view = memoryview(buffer)
+    if bandwidth_scheduler.read_size:
+        view = view[:bandwidth_scheduler.read_size]
+    while True:
+        size = response.readinto(view)
+        if not size:
+            break
+        job.consume(size)
+        yield view[:size]
+
+
+def _borrow_buffer(zero_copy):
+    """Borrow a pooled buffer for a zero-copy transfer, else lend nothing."""
+    if zero_copy:
+        return buffer_pool.buffer()
+    return nullcontext(None)
 
 
 def stream(
     url,
     timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
-    max_retries=0
+    max_retries=0,
+    job=None,
+    retry_policy=None,
+    zero_copy=False
 ):
     """Read the response in chunks.
+
+    The total size is learned from the first range response, and the size of
+    each following range adapts to the measured throughput. If the size can't
+    be determined, ranges are requested until one comes back short, or until
+    the server rejects a range past the bytes received (HTTP 416).
+
     :param str url: The URL to perform the GET request for.
+    :param int max_retries:
+        (Optional) Number of retries for each range, used when no
+        ``retry_policy`` is given.
+    :param job:
+        (Optional) The :class:`~pytube.scheduler.Job` the transfer is
+        charged to. A new job is registered if not given.
+    :param retry_policy:
+        (Optional) The :class:`~pytube.retry.RetryPolicy` applied to each
+        range. Failed ranges resume after the last byte received.
+    :param bool zero_copy:
+        (Optional) Read into a pooled buffer and yield :class:`memoryview`
+        chunks of it instead of new bytes objects. Each chunk is only valid
+        until the next one is requested, so it must be consumed (or copied)
+        straight away.
     :rtype: Iterable[bytes]
     """
-    file_size: int = default_range_size  # fake filesize to start
+    host = parse.urlsplit(url).netloc
+    retry_policy = _retry_policy(retry_policy, max_retries)
+    file_size: Optional[int] = None
     downloaded = 0
-    while downloaded < file_size:
-        stop_pos = min(downloaded + default_range_size, file_size) - 1
-        range_header = f"bytes={downloaded}-{stop_pos}"
-        tries = 0
-
-        # Attempt to make the request multiple times as necessary.
-        while True:
-            # If the max retries is exceeded, raise an exception
-            if tries >= 1 + max_retries:
-                raise MaxRetriesExceeded()
+    sizer = RangeSizer()
+    with _scheduler_job(job) as job, _borrow_buffer(zero_copy) as buffer:
+        while file_size is None or downloaded < file_size:
+            stop_pos = downloaded + sizer.range_size - 1
+            if file_size is not None:
+                stop_pos = min(stop_pos, file_size - 1)
 
-            # Try to execute the request, ignoring socket timeouts
-            try:
-                response = _execute_request(
-                    url + f"&range={downloaded}-{stop_pos}",
-                    method="GET",
-                    timeout=timeout
+            with job.connection(host):
+                started = time.monotonic()
+                reader = _RangeReader(
+                    url, downloaded, stop_pos, timeout, retry_policy, job, buffer
                 )
-            except URLError as e:
-                # We only want to skip over timeout errors, and
-                # raise any other URLError exceptions
-                if isinstance(e.reason, socket.timeout):
-                    pass
-                else:
-                    raise
-            except http.client.IncompleteRead:
-                # Allow retries on IncompleteRead errors for unreliable connections
-                pass
-            else:
-                # On a successful request, break from loop
+                range_start = downloaded
+                try:
+                    for chunk in reader:
+                        downloaded += len(chunk)
+                        yield chunk
+                except HTTPError as e:
+                    if e.code != 416 or file_size is not None or range_start == 0:
+                        raise
+                    # The previous range ended exactly at the end of the file.
+                    break
+                if file_size is None:
+                    file_size = reader.total
+
+            received = downloaded - range_start
+            sizer.record(received, reader.ttfb or 0, time.monotonic() - started)
+            if received < stop_pos - range_start + 1 and file_size is None:
+                # A short range without a known size marks the end of the file.
+                break
+            if received == 0:
+                logger.warning("empty response for range %s-%s", range_start, stop_pos)
                 break
-            tries += 1
+    return  # pylint: disable=R1711
 
-        if file_size == default_range_size:
-            try:
-                resp = _execute_request(
-                    url + f"&range={0}-{99999999999}",
-                    method="GET",
-                    timeout=timeout
+
+def range_stream(
+    url,
+    start,
+    stop,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    max_retries=0,
+    job=None,
+    retry_policy=None,
+    zero_copy=False
+):
+    """Read bytes ``start`` to ``stop`` (inclusive) of the response in chunks.
+
+    Unlike :func:`stream`, the total file size must already be known. Large
+    spans are still fetched as several range requests, sized adaptively.
+
+    :param str url: The URL to perform the GET request for.
+    :param int start: Offset of the first byte to read.
+    :param int stop: Offset of the last byte to read.
+    :param job:
+        (Optional) The :class:`~pytube.scheduler.Job` the transfer is
+        charged to. A new job is registered if not given.
+    :param retry_policy:
+        (Optional) The :class:`~pytube.retry.RetryPolicy` applied to each
+        range, as for :func:`stream`.
+    :param bool zero_copy:
+        (Optional) Yield :class:`memoryview` chunks of a pooled buffer, as
+        for :func:`stream`.
+    :rtype: Iterable[bytes]
+    """
+    host = parse.urlsplit(url).netloc
+    retry_policy = _retry_policy(retry_policy, max_retries)
+    downloaded = start
+    sizer = RangeSizer()
+    with _scheduler_job(job) as job, _borrow_buffer(zero_copy) as buffer:
+        while downloaded <= stop:
+            stop_pos = min(downloaded + sizer.range_size - 1, stop)
+            with job.connection(host):
+                started = time.monotonic()
+                reader = _RangeReader(
+                    url, downloaded, stop_pos, timeout, retry_policy, job, buffer
                 )
-                content_range = resp.info()["Content-Length"]
-                file_size = int(content_range)
-            except (KeyError, IndexError, ValueError) as e:
-                logger.error(e)
-        while True:
-            chunk = response.read()
-            if not chunk:
+                range_start = downloaded
+                for chunk in reader:
+                    downloaded += len(chunk)
+                    yield chunk
+            if downloaded == range_start:
+                logger.warning("empty response for range %s-%s", range_start, stop_pos)
                 break
-            downloaded += len(chunk)
-            yield chunk
+            sizer.record(
+                downloaded - range_start, reader.ttfb or 0, time.monotonic() - started
+            )
     return  # pylint: disable=R1711
 
 
-@lru_cache()
-def filesize(url):
+def filesize_key(url, key=None):
+    """Return the :data:`filesize_cache` key for a media url.
+
+    Signed urls change on every fetch of the watch page, so sizes are keyed by
+    the ``id`` and ``itag`` query parameters when the caller doesn't provide
+    a better key, such as ``(video_id, itag)``.
+    """
+    if key is not None:
+        return key
+    query = parse.parse_qs(parse.urlsplit(url).query)
+    if "id" in query and "itag" in query:
+        return query["id"][0], query["itag"][0]
+    return url
+
+
+def url_expiry(url) -> Optional[int]:
+    """Return the unix time at which a signed url expires, if it says."""
+    expire = parse.parse_qs(parse.urlsplit(url).query).get("expire")
+    if expire and expire[0].isdigit():
+        return int(expire[0])
+    return None
+
+
+def filesize(url, key=None):
     """Fetch size in bytes of file at given URL
 
+    Sizes are kept in :data:`filesize_cache` until the url expires.
+
     :param str url: The URL to get the size of
+    :param key: (Optional) Cache key, see :func:`filesize_key`.
     :returns: int: size in bytes of remote file
     """
-    return int(head(url)["content-length"])
+    cache_key = filesize_key(url, key)
+    size = filesize_cache.get(cache_key)
+    if size is None:
+        size = int(head(url)["content-length"])
+        filesize_cache.set(cache_key, size, expires=url_expiry(url))
+    return size
 
 
-@lru_cache()
-def seq_filesize(url):
+def seq_filesize(url, max_workers=None, key=None):
     """Fetch size in bytes of file at given URL from sequential requests
 
+    Sizes are kept in :data:`filesize_cache` until the url expires.
+
     :param str url: The URL to get the size of
+    :param int max_workers:
+        (Optional) Number of HEAD requests to make at the same time. Defaults
+        to ``default_segment_workers``.
+    :param key: (Optional) Cache key, see :func:`filesize_key`.
     :returns: int: size in bytes of remote file
     """
-    total_filesize = 0
-    # YouTube expects a request sequence number as part of the parameters.
-    split_url = parse.urlsplit(url)
-    base_url = '%s://%s/%s?' % (split_url.scheme, split_url.netloc, split_url.path)
-    querys = dict(parse.parse_qsl(split_url.query))
+    cache_key = filesize_key(url, key)
+    size = filesize_cache.get(cache_key)
+    if size is None:
+        size = _seq_filesize(url, max_workers)
+        filesize_cache.set(cache_key, size, expires=url_expiry(url))
+    return size
+
+
+def _seq_filesize(url, max_workers):
+    if max_workers is None:
+        max_workers = default_segment_workers
+    seq_url = _seq_urls(url)
 
     # The 0th sequential request provides the file headers, which tell us
     #  information about how the file is segmented.
-    querys['sq'] = 0
-    url = base_url + parse.urlencode(querys)
-    response = _execute_request(
-        url, method="GET"
-    )
+    response = _execute_request(seq_url(0), method="GET", compressed=False)
 
-    response_value = response.read()
-    # The file header must be added to the total filesize
-    total_filesize += len(response_value)
-
-    # We can then parse the header to find the number of segments
-    segment_count = 0
-    stream_info = response_value.split(b'\r\n')
-    segment_regex = b'Segment-Count: (\\d+)'
-    for line in stream_info:
-        # One of the lines should contain the segment count, but we don't know
-        #  which, so we need to iterate through the lines to find it
-        try:
-            segment_count = int(regex_search(segment_regex, line, 1))
-        except RegexMatchError:
-            pass
-
-    if segment_count == 0:
-        raise RegexMatchError('seq_filesize', segment_regex)
-
-    # We make HEAD requests to the segments sequentially to find the total filesize.
-    seq_num = 1
-    while seq_num <= segment_count:
-        # Create sequential request URL
-        querys['sq'] = seq_num
-        url = base_url + parse.urlencode(querys)
-
-        total_filesize += int(head(url)['content-length'])
-        seq_num += 1
+    # The file header must be added to the total filesize, and we parse it
+    #  to find the number of segments as it is read.
+    total_filesize = 0
+    parser = SegmentCountParser()
+    while True:
+        chunk = response.read(65536)
+        if not chunk:
+            break
+        total_filesize += len(chunk)
+        parser.feed(chunk)
+
+    segment_count = parser.close()
+    if not segment_count:
+        raise RegexMatchError('seq_filesize', SegmentCountParser.pattern.pattern)
+
+    def segment_size(seq_num):
+        return int(head(seq_url(seq_num))['content-length'])
+
+    # We make HEAD requests to the segments concurrently to find the total filesize.
+    total_filesize += sum(
+        _fetch_in_order(segment_size, range(1, segment_count + 1), max_workers)
+    )
     return total_filesize
 
 
-def head(url):
+def head(url, retry_policy=None):
     """Fetch headers returned http GET request.
 
     :param str url:
         The URL to perform the GET request for.
+    :param retry_policy:
+        (Optional) A :class:`~pytube.retry.RetryPolicy` to retry failed
+        requests with. By default errors are raised straight away.
     :rtype: dict
     :returns:
         dictionary of lowercase headers
     """
-    response_headers = _execute_request(url, method="HEAD").info()
+    if retry_policy is None:
+        response = _execute_request(url, method="HEAD", compressed=False)
+    else:
+        response = retry_policy.call(
+            _execute_request, url, method="HEAD", compressed=False
+        )
+    response_headers = response.info()
+    # HEAD responses have no body; closing hands the connection back to the pool.
+    response.close()
     return {k.lower(): v for k, v in response_headers.items()}
+
+
+async def _aexecute_request(
+    url,
+    method=None,
+    headers=None,
+    data=None,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    compressed=True
+):
+    if _opener is None:
+        install_proxy()
+    if parse.urlsplit(url).scheme.lower() in _proxies:
+        # The asyncio client only connects directly, so proxied requests go
+        # through the blocking client in a worker thread instead.
+        response = await asyncio.get_event_loop().run_in_executor(
+            None,
+            functools.partial(
+                _execute_request, url, method, headers, data, timeout, compressed
+            ),
+        )
+        return aio.ThreadedResponse(response)
+    base_headers, data = _prepare_request(url, headers, data, compressed)
+    response = await aio.urlopen(
+        async_connection_pool,
+        url,
+        method=method,
+        headers=base_headers,
+        data=data or None,
+        timeout=timeout
+    )
+    if compressed:
+        response = compression.decode_response(
+            response, compression.AsyncDecodedResponse
+        )
+    return response
+
+
+async def aget(url, extra_headers=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+    """Send an http GET request without blocking the event loop.
+
+    :param str url:
+        The URL to perform the GET request for.
+    :param dict extra_headers:
+        Extra headers to add to the request
+    :rtype: str
+    :returns:
+        UTF-8 encoded string of response
+    """
+    if extra_headers is None:
+        extra_headers = {}
+    response = await _aexecute_request(url, headers=extra_headers, timeout=timeout)
+    return (await response.read()).decode("utf-8")
+
+
+async def apost(url, extra_headers=None, data=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+    """Send an http POST request without blocking the event loop.
+
+    :param str url:
+        The URL to perform the POST request for.
+    :param dict extra_headers:
+        Extra headers to add to the request
+    :param dict data:
+        The data to send on the POST request
+    :rtype: str
+    :returns:
+        UTF-8 encoded string of response
+    """
+    if extra_headers is None:
+        extra_headers = {}
+    if data is None:
+        data = {}
+    # required because the youtube servers are strict on content type
+    # raises HTTPError [400]: Bad Request otherwise
+    extra_headers.update({"Content-Type": "application/json"})
+    response = await _aexecute_request(
+        url,
+        headers=extra_headers,
+        data=data,
+        timeout=timeout
+    )
+    return (await response.read()).decode("utf-8")
+
+
+async def ahead(url):
+    """Fetch headers returned http HEAD request without blocking the event loop.
+
+    :param str url:
+        The URL to perform the HEAD request for.
+    :rtype: dict
+    :returns:
+        dictionary of lowercase headers
+    """
+    response = await _aexecute_request(url, method="HEAD", compressed=False)
+    response.close()
+    return {k.lower(): v for k, v in response.info().items()}
+
+
+async def afilesize(url, key=None):
+    """Async counterpart of :func:`filesize`, sharing its cache.
+
+    :param str url: The URL to get the size of
+    :param key: (Optional) Cache key, see :func:`filesize_key`.
+    :returns: int: size in bytes of remote file
+    """
+    cache_key = filesize_key(url, key)
+    size = filesize_cache.get(cache_key)
+    if size is None:
+        size = int((await ahead(url))["content-length"])
+        filesize_cache.set(cache_key, size, expires=url_expiry(url))
+    return size
+
+
+async def aseq_filesize(url, max_workers=None, key=None):
+    """Async counterpart of :func:`seq_filesize`, sharing its cache.
+
+    :param str url: The URL to get the size of
+    :param key: (Optional) Cache key, see :func:`filesize_key`.
+    :returns: int: size in bytes of remote file
+    """
+    cache_key = filesize_key(url, key)
+    size = filesize_cache.get(cache_key)
+    if size is None:
+        size = await _aseq_filesize(url, max_workers)
+        filesize_cache.set(cache_key, size, expires=url_expiry(url))
+    return size
+
+
+async def _aseq_filesize(url, max_workers):
+    if max_workers is None:
+        max_workers = default_segment_workers
+    seq_url = _seq_urls(url)
+
+    response = await _aexecute_request(seq_url(0), method="GET", compressed=False)
+    total_filesize = 0
+    parser = SegmentCountParser()
+    while True:
+        chunk = await response.read(aio_chunk_size)
+        if not chunk:
+            break
+        total_filesize += len(chunk)
+        parser.feed(chunk)
+
+    segment_count = parser.close()
+    if not segment_count:
+        raise RegexMatchError('aseq_filesize', SegmentCountParser.pattern.pattern)
+
+    semaphore = asyncio.Semaphore(max(max_workers, 1))
+
+    async def segment_size(seq_num):
+        async with semaphore:
+            return int((await ahead(seq_url(seq_num)))['content-length'])
+
+    sizes = await asyncio.gather(
+        *(segment_size(seq_num) for seq_num in range(1, segment_count + 1))
+    )
+    return total_filesize + sum(sizes)
+
+
+class _AsyncRangeReader:
+    """Async counterpart of :class:`_RangeReader`, for :func:`astream`."""
+
+    def __init__(self, url, start, stop, timeout, retry_policy, job):
+        self.url = url
+        self.start = start
+        self.stop = stop
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.job = job
+        # Total file size reported by the first response, if any.
+        self.total: Optional[int] = None
+        # Seconds until the first response headers arrived.
+        self.ttfb: Optional[float] = None
+
+    async def __aiter__(self):
+        position = self.start
+        attempt = 0
+        started = time.monotonic()
+        while position <= self.stop:
+            resumed_at = position
+            response = None
+            try:
+                response = await _aexecute_request(
+                    self.url + f"&range={position}-{self.stop}",
+                    method="GET",
+                    timeout=self.timeout,
+                    compressed=False
+                )
+                if self.ttfb is None:
+                    self.ttfb = time.monotonic() - started
+                    self.total = _content_total(response, self.url)
+                async for chunk in _aread_body(response, self.job):
+                    position += len(chunk)
+                    yield chunk
+                return
+            except Exception as e:
+                if response is not None:
+                    response.close()
+                if position > resumed_at:
+                    # The connection made progress, so start counting afresh.
+                    attempt = 0
+                await self.retry_policy.acheck(e, attempt)
+                attempt += 1
+                logger.debug(
+                    "resuming range %s-%s at %s", self.start, self.stop, position
+                )
+
+
+async def _aread_body(response, job):
+    """Async counterpart of :func:`_read_body`, without zero-copy buffers."""
+    read_size = bandwidth_scheduler.read_size or aio_chunk_size
+    while True:
+        try:
+            chunk = await response.read(read_size)
+        except http.client.IncompleteRead as e:
+            # Keep what arrived, so a retry resumes after it.
+            if e.partial:
+                await _aconsume(job, len(e.partial))
+                yield e.partial
+            raise
+        if not chunk:
+            return
+        await _aconsume(job, len(chunk))
+        yield chunk
+
+
+async def _aconsume(job, nbytes):
+    """Charge ``nbytes`` to ``job``, waiting out the budget off the event loop."""
+    if job.scheduler.rate:
+        await asyncio.get_event_loop().run_in_executor(None, job.consume, nbytes)
+    else:
+        job.consume(nbytes)
+
+
+@asynccontextmanager
+async def _aconnection(job, host):
+    """Hold one of the connection slots for ``host``, waiting off the event loop."""
+    slot = job.connection(host)
+    if job.scheduler.max_connections_per_host is None:
+        slot.__enter__()
+    else:
+        acquired = asyncio.get_event_loop().run_in_executor(None, slot.__enter__)
+        try:
+            await asyncio.shield(acquired)
+        except asyncio.CancelledError:
+            # The slot may still be granted once the waiting thread wakes up.
+            acquired.add_done_callback(
+                lambda f: f.cancelled() or f.exception() or slot.__exit__(None, None, None)
+            )
+            raise
+    try:
+        yield
+    finally:
+        slot.__exit__(None, None, None)
+
+
+async def astream(
+    url,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    max_retries=0,
+    job=None,
+    retry_policy=None
+):
+    """Read the response in chunks without blocking the event loop.
+
+    Async counterpart of :func:`stream`, with the same size discovery,
+    adaptive range sizing, retries and bandwidth scheduling.
+
+    :param str url: The URL to perform the GET request for.
+    :param int max_retries:
+        (Optional) Number of retries for each range, used when no
+        ``retry_policy`` is given.
+    :param job:
+        (Optional) The :class:`~pytube.scheduler.Job` the transfer is
+        charged to. A new job is registered if not given.
+    :param retry_policy:
+        (Optional) The :class:`~pytube.retry.RetryPolicy` applied to each
+        range. Failed ranges resume after the last byte received.
+    :rtype: AsyncIterable[bytes]
+    """
+    host = parse.urlsplit(url).netloc
+    retry_policy = _retry_policy(retry_policy, max_retries)
+    file_size: Optional[int] = None
+    downloaded = 0
+    sizer = RangeSizer()
+    with _scheduler_job(job) as job:
+        while file_size is None or downloaded < file_size:
+            stop_pos = downloaded + sizer.range_size - 1
+            if file_size is not None:
+                stop_pos = min(stop_pos, file_size - 1)
+
+            async with _aconnection(job, host):
+                started = time.monotonic()
+                reader = _AsyncRangeReader(
+                    url, downloaded, stop_pos, timeout, retry_policy, job
+                )
+                range_start = downloaded
+                try:
+                    async for chunk in reader:
+                        downloaded += len(chunk)
+                        yield chunk
+                except HTTPError as e:
+                    if e.code != 416 or file_size is not None or range_start == 0:
+                        raise
+                    # The previous range ended exactly at the end of the file.
+                    break
+                if file_size is None:
+                    file_size = reader.total
+
+            received = downloaded - range_start
+            sizer.record(received, reader.ttfb or 0, time.monotonic() - started)
+            if received < stop_pos - range_start + 1 and file_size is None:
+                # A short range without a known size marks the end of the file.
+                break
+            if received == 0:
+                logger.warning("empty response for range %s-%s", range_start, stop_pos)
+                break
+
+
+async def aseq_stream(
+    url,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    max_retries=0,
+    max_workers=None
+):
+    """Read a sequential (OTF) response without blocking the event loop.
+
+    Async counterpart of :func:`seq_stream`: up to ``max_workers`` segments
+    are requested at once and yielded in order.
+
+    :param str url: The URL to perform the GET request for.
+    :rtype: AsyncIterable[bytes]
+    """
+    if max_workers is None:
+        max_workers = default_segment_workers
+    seq_url = _seq_urls(url)
+
+    parser = SegmentCountParser()
+    async for chunk in astream(seq_url(0), timeout=timeout, max_retries=max_retries):
+        yield chunk
+        parser.feed(chunk)
+
+    segment_count = parser.close()
+    if segment_count is None:
+        raise RegexMatchError('aseq_stream', SegmentCountParser.pattern.pattern)
+
+    async def fetch_segment(seq_num):
+        return b''.join([
+            chunk async for chunk in astream(
+                seq_url(seq_num), timeout=timeout, max_retries=max_retries
+            )
+        ])
+
+    pending = deque()
+    seq_nums = iter(range(1, segment_count + 1))
+    try:
+        for seq_num in seq_nums:
+            pending.append(asyncio.ensure_future(fetch_segment(seq_num)))
+            if len(pending) >= max(max_workers, 1):
+                break
+        while pending:
+            segment = await pending.popleft()
+            for seq_num in seq_nums:
+                pending.append(asyncio.ensure_future(fetch_segment(seq_num)))
+                break
+            yield segment
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,151 @@
+"""Retry rules and backoff for failed requests."""
+import asyncio
+import http.client
+import logging
+import random
+import socket
+import time
+from typing import Dict, Iterable, Optional, Type
+from urllib.error import HTTPError, URLError
+
+from pytube.exceptions import MaxRetriesExceeded
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying, and how many times (``None`` uses ``max_retries``).
+default_rules: Dict[Type[BaseException], Optional[int]] = {
+    http.client.IncompleteRead: None,
+    socket.timeout: None,
+    asyncio.TimeoutError: None,
+    ConnectionError: None,
+}
+
+# HTTP statuses that usually clear up on their own.
+default_retry_statuses = frozenset({429, 500, 502, 503, 504})
+
+# Errors reported as MaxRetriesExceeded even when no retries are allowed, as
+# pytube has always done; other errors then reach the caller unchanged.
+_always_exceeded = (http.client.IncompleteRead, socket.timeout, asyncio.TimeoutError)
+
+
+def _cause(error: BaseException) -> BaseException:
+    """Return the error a :class:`URLError` wraps, or ``error`` itself."""
+    if isinstance(error, URLError) and isinstance(error.reason, BaseException):
+        return error.reason
+    return error
+
+
+class RetryPolicy:
+    """Decide whether a failed request is retried, and how long to wait first.
+
+    Delays grow exponentially from ``backoff`` and are randomly shortened by
+    up to ``jitter`` of their length, so clients that failed together don't
+    retry together.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 0,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: float = 0.5,
+        rules: Optional[Dict[Type[BaseException], Optional[int]]] = None,
+        retry_statuses: Iterable[int] = default_retry_statuses,
+    ):
+        """Construct a :class:`RetryPolicy <RetryPolicy>`.
+
+        :param int max_retries:
+            Number of times a retryable error may be retried.
+        :param float backoff:
+            Seconds to wait before the first retry; doubled for each retry
+            after it.
+        :param float max_backoff:
+            Longest wait between two attempts, in seconds.
+        :param float jitter:
+            Largest fraction of each wait that is randomly taken off.
+        :param dict rules:
+            (Optional) Maps exception classes to the number of retries they
+            get, or ``None`` for ``max_retries``. Errors of classes not listed
+            are raised straight away. Defaults to :data:`default_rules`.
+        :param retry_statuses:
+            HTTP status codes that are retried ``max_retries`` times.
+        """
+        self.max_retries = max_retries or 0
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.rules = default_rules if rules is None else rules
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def retries_for(self, error: BaseException) -> Optional[int]:
+        """Return how many times ``error`` may be retried.
+
+        :rtype: int or None
+        :returns:
+            The number of retries, or ``None`` if the error isn't retryable.
+        """
+        if isinstance(error, HTTPError):
+            return self.max_retries if error.code in self.retry_statuses else None
+        error = _cause(error)
+        for error_class, retries in self.rules.items():
+            if isinstance(error, error_class):
+                return self.max_retries if retries is None else retries
+        return None
+
+    def delay(self, attempt: int) -> float:
+        """Return the number of seconds to wait before retry number ``attempt``.
+
+        :param int attempt:
+            Number of retries already made.
+        :rtype: float
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return delay * (1 - self.jitter * random.random())
+
+    def check(self, error: BaseException, attempt: int) -> None:
+        """Wait before retrying after ``error``, or raise if it can't be retried.
+
+        :param error:
+            The error the last attempt failed with.
+        :param int attempt:
+            Number of retries already made.
+        :raises MaxRetriesExceeded:
+            If the error is retryable but its retries are used up. HTTP
+            errors, errors that aren't retryable, and connection errors that
+            weren't allowed any retries are raised as they are.
+        """
+        time.sleep(self._next_delay(error, attempt))
+
+    async def acheck(self, error: BaseException, attempt: int) -> None:
+        """Like :meth:`check`, but wait without blocking the event loop."""
+        await asyncio.sleep(self._next_delay(error, attempt))
+
+    def _next_delay(self, error: BaseException, attempt: int) -> float:
+        """Return the wait before retrying after ``error``, or raise it."""
+        retries = self.retries_for(error)
+        if retries is None:
+            raise error
+        if attempt >= retries:
+            if isinstance(error, HTTPError):
+                # Callers act on the status code, so keep the original error.
+                raise error
+            if retries == 0 and not isinstance(_cause(error), _always_exceeded):
+                # Nothing was retried, so callers get what they always got.
+                raise error
+            raise MaxRetriesExceeded() from error
+        delay = self.delay(attempt)
+        logger.debug("retrying after %r in %.2fs", error, delay)
+        return delay
+
+    def call(self, fn, *args, **kwargs):
+        """Call ``fn`` until it succeeds or the policy gives up.
+
+        :returns: The return value of ``fn``.
+        """
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                self.check(e, attempt)
+                attempt += 1
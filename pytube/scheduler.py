@@ -0,0 +1,238 @@
+"""Process-wide bandwidth scheduling for pytube transfers.
+
+Every download registers a :class:`Job` with the :class:`BandwidthScheduler`
+in :data:`pytube.request.bandwidth_scheduler`. The scheduler enforces:
+
+* a token-bucket byte budget shared by all jobs,
+* a cap on the connections open to each host at the same time,
+* weighted fair sharing of both between jobs, so a large download split
+  over several connections can't starve a small one started after it.
+
+By default nothing is limited; call :meth:`BandwidthScheduler.configure`
+to set the limits.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Size of the reads made while a byte budget is in force.
+default_quantum = 65536
+
+
+class Job:
+    """A transfer, or group of transfers, sharing bandwidth fairly with others."""
+
+    def __init__(self, scheduler: "BandwidthScheduler", weight: float, name: Optional[str]):
+        self.scheduler = scheduler
+        self.weight = weight
+        self.name = name
+        self.transferred = 0
+        self.connections = 0
+        # Virtual time at which the job's last granted bytes finish.
+        self._finish = 0.0
+
+    def consume(self, nbytes: int) -> None:
+        """Account for ``nbytes`` received, blocking while over budget."""
+        self.scheduler.consume(self, nbytes)
+
+    def connection(self, host: str):
+        """Hold one of the connection slots for ``host``."""
+        return self.scheduler.connection(self, host)
+
+    def close(self) -> None:
+        """Unregister the job from its scheduler."""
+        self.scheduler._unregister(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'<Job name="{self.name}" weight="{self.weight}">'
+
+
+class BandwidthScheduler:
+    """Share a byte budget and per-host connection slots between jobs."""
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_connections_per_host: Optional[int] = None,
+        quantum: int = default_quantum,
+    ):
+        """Construct a :class:`BandwidthScheduler <BandwidthScheduler>`.
+
+        :param float rate:
+            (Optional) Bytes per second shared by all jobs. Unlimited if not
+            given.
+        :param float burst:
+            (Optional) Bytes that may be received at once after an idle
+            period. Defaults to one second worth of ``rate``.
+        :param int max_connections_per_host:
+            (Optional) Number of transfers allowed to each host at the same
+            time. Unlimited if not given.
+        :param int quantum:
+            Size of the reads made while ``rate`` is set; smaller reads share
+            the budget more evenly.
+        """
+        self._cond = threading.Condition()
+        self._jobs: List[Job] = []
+        self._seq = itertools.count()
+        # Tickets of consumers waiting for budget, by virtual finish time.
+        self._waiting: List = []
+        self._vtime = 0.0
+        self._open: Dict[str, int] = {}
+        self._slot_waiters: Dict[str, List] = {}
+        self.quantum = quantum
+        self.configure(rate, burst, max_connections_per_host)
+
+    def configure(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_connections_per_host: Optional[int] = None,
+    ) -> None:
+        """Replace the limits. Arguments are as for the constructor."""
+        with self._cond:
+            self.rate = rate or None
+            self.burst = burst or rate or None
+            self.max_connections_per_host = max_connections_per_host or None
+            self._tokens = self.burst or 0.0
+            self._updated = time.monotonic()
+            self._cond.notify_all()
+
+    @property
+    def read_size(self) -> Optional[int]:
+        """Size of the reads transfers should make, or ``None`` to read freely."""
+        return self.quantum if self.rate else None
+
+    def job(self, weight: float = 1.0, name: Optional[str] = None) -> Job:
+        """Register a new job.
+
+        :param float weight:
+            Share of the bandwidth the job gets relative to other jobs.
+        :param str name:
+            (Optional) A label for logs and :meth:`stats`.
+        :rtype: Job
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        job = Job(self, weight, name)
+        with self._cond:
+            self._jobs.append(job)
+        return job
+
+    def _unregister(self, job: Job) -> None:
+        with self._cond:
+            if job in self._jobs:
+                self._jobs.remove(job)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def consume(self, job: Job, nbytes: int) -> None:
+        """Account for ``nbytes`` received by ``job``.
+
+        Blocks until the shared budget allows the job to continue. Jobs
+        waiting at the same time are let through in order of their weighted
+        virtual finish time, so each gets bandwidth in proportion to its
+        weight however many connections it uses.
+        """
+        with self._cond:
+            job.transferred += nbytes
+            if not self.rate:
+                return
+            start = max(job._finish, self._vtime)
+            job._finish = start + nbytes / job.weight
+            ticket = (job._finish, next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    if not self.rate:
+                        break
+                    self._refill()
+                    if self._waiting[0] == ticket and self._tokens > 0:
+                        break
+                    timeout = None
+                    if self._waiting[0] == ticket:
+                        timeout = -self._tokens / self.rate
+                    self._cond.wait(timeout)
+                if self.rate:
+                    # The budget may go negative; later jobs wait out the debt.
+                    self._tokens -= nbytes
+                self._vtime = max(self._vtime, start)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    @contextmanager
+    def connection(self, job: Job, host: str) -> Iterator[None]:
+        """Hold one of the connection slots for ``host`` while in the block.
+
+        When every slot is taken, the next free one goes to the waiting job
+        with the fewest connections for its weight.
+        """
+        with self._cond:
+            waiter = (job, next(self._seq))
+            waiters = self._slot_waiters.setdefault(host, [])
+            waiters.append(waiter)
+            try:
+                while not (
+                    self._has_slot(host)
+                    and min(waiters, key=self._slot_priority) is waiter
+                ):
+                    self._cond.wait()
+            finally:
+                waiters.remove(waiter)
+                self._cond.notify_all()
+            self._open[host] = self._open.get(host, 0) + 1
+            job.connections += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._open[host] -= 1
+                job.connections -= 1
+                self._cond.notify_all()
+
+    def _has_slot(self, host: str) -> bool:
+        cap = self.max_connections_per_host
+        return cap is None or self._open.get(host, 0) < cap
+
+    @staticmethod
+    def _slot_priority(waiter):
+        job, seq = waiter
+        return job.connections / job.weight, seq
+
+    def stats(self) -> Dict:
+        """Return the limits and the state of the registered jobs.
+
+        :rtype: dict
+        """
+        with self._cond:
+            return {
+                'rate': self.rate,
+                'max_connections_per_host': self.max_connections_per_host,
+                'connections': {host: n for host, n in self._open.items() if n},
+                'jobs': [
+                    {
+                        'name': job.name,
+                        'weight': job.weight,
+                        'transferred': job.transferred,
+                        'connections': job.connections,
+                    }
+                    for job in self._jobs
+                ],
+            }
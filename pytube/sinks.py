@@ -0,0 +1,258 @@
+"""Destinations that receive a stream's bytes as they are downloaded.
+
+A sink is any object with ``write(chunk)``, ``close()`` and ``abort(error)``
+methods. :meth:`pytube.Stream.download` and
+:meth:`pytube.Stream.stream_to_sinks` push every chunk to each sink in order,
+call ``close()`` once the stream is complete, and ``abort(error)`` if it fails,
+so one download can be saved, hashed and uploaded without fetching it twice.
+"""
+import hashlib
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+from pytube.pipeline import WritePipeline
+
+logger = logging.getLogger(__name__)
+
+
+class Sink:
+    """Base class for sinks; subclasses override :meth:`write`."""
+
+    def write(self, chunk) -> None:
+        """Receive the next chunk of the stream.
+
+        :param chunk:
+            A bytes-like object that may be reused once this returns.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Called once after the last chunk."""
+
+    def abort(self, error: BaseException) -> None:
+        """Called instead of :meth:`close` if the stream fails."""
+
+
+class FileSink(Sink):
+    """Write the stream to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, "wb")
+
+    def write(self, chunk) -> None:
+        self._fh.write(chunk)
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def abort(self, error: BaseException) -> None:
+        self._fh.close()
+
+
+class HashSink(Sink):
+    """Compute a digest of the stream, e.g. to verify or deduplicate it."""
+
+    def __init__(self, algorithm: str = "sha256"):
+        self._hash = hashlib.new(algorithm)
+
+    def write(self, chunk) -> None:
+        self._hash.update(chunk)
+
+    def hexdigest(self) -> str:
+        """Return the digest of the bytes written so far.
+
+        :rtype: str
+        """
+        return self._hash.hexdigest()
+
+
+class MemorySink(Sink):
+    """Keep the stream in memory, up to ``limit`` bytes.
+
+    Useful for uploads that need the whole body at once, such as a Telegram
+    multipart request. Once the stream outgrows ``limit`` the bytes are
+    dropped and :attr:`overflowed` is set. :attr:`complete` is only set once
+    the whole stream was received.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.overflowed = False
+        self.complete = False
+        self._data = bytearray()
+
+    def write(self, chunk) -> None:
+        if self.overflowed:
+            return
+        if self.limit is not None and len(self._data) + len(chunk) > self.limit:
+            self.overflowed = True
+            self._data = bytearray()
+            return
+        self._data += chunk
+
+    def close(self) -> None:
+        self.complete = not self.overflowed
+
+    def abort(self, error: BaseException) -> None:
+        self._data = bytearray()
+
+    def getvalue(self) -> bytes:
+        """Return the bytes received, or ``b""`` if the limit was exceeded
+        or the stream failed.
+
+        :rtype: bytes
+        """
+        return bytes(self._data)
+
+
+class BackgroundSink(Sink):
+    """Run another sink on its own thread.
+
+    Writes are copied and queued, so a sink that uploads over the network
+    doesn't hold up the download until ``depth`` chunks are waiting for it.
+    """
+
+    def __init__(self, sink, depth: Optional[int] = None):
+        self.sink = sink
+        self._pipeline = WritePipeline(
+            lambda chunk, offset: sink.write(chunk), depth=depth
+        )
+
+    def write(self, chunk) -> None:
+        self._pipeline.submit(chunk)
+
+    def close(self) -> None:
+        self._pipeline.close()
+        self.sink.close()
+
+    def abort(self, error: BaseException) -> None:
+        try:
+            self._pipeline.close()
+        except BaseException as e:
+            logger.debug("background sink failed: %r", e)
+        self.sink.abort(error)
+
+
+class PipeSink(Sink):
+    """Hand the stream to a reader on another thread as a file object.
+
+    :meth:`write` blocks once ``depth`` chunks are waiting to be read, so a
+    slow reader holds back the download instead of filling memory.
+    """
+
+    def __init__(self, depth: int = 16):
+        self.depth = depth
+        self._chunks: Deque[bytes] = deque()
+        self._current = memoryview(b"")
+        self._cond = threading.Condition()
+        self._closed = False
+        self._cancelled = False
+        self._error: Optional[BaseException] = None
+
+    def write(self, chunk) -> None:
+        data = bytes(chunk)
+        with self._cond:
+            while len(self._chunks) >= self.depth and not self._cancelled:
+                self._cond.wait()
+            if self._cancelled:
+                raise BrokenPipeError("pipe reader was cancelled")
+            self._chunks.append(data)
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def abort(self, error: BaseException) -> None:
+        with self._cond:
+            self._error = error
+            self._closed = True
+            self._cond.notify_all()
+
+    def read(self, n: int = -1) -> bytes:
+        """Read up to ``n`` bytes, blocking until some are available.
+
+        Returns at most one written chunk, or ``b""`` once the stream is
+        complete.
+
+        :raises: The error the stream was aborted with.
+        """
+        with self._cond:
+            while not self._current:
+                if self._chunks:
+                    self._current = memoryview(self._chunks.popleft())
+                    self._cond.notify_all()
+                elif self._error is not None:
+                    raise self._error
+                elif self._closed:
+                    return b""
+                else:
+                    self._cond.wait()
+            if n is None or n < 0:
+                n = len(self._current)
+            data = bytes(self._current[:n])
+            self._current = self._current[n:]
+            return data
+
+    def cancel(self) -> None:
+        """Stop reading; pending and later writes fail with :class:`BrokenPipeError`."""
+        with self._cond:
+            self._cancelled = True
+            self._chunks.clear()
+            self._cond.notify_all()
+
+
+class Tee(Sink):
+    """Forward the stream to several sinks.
+
+    A sink that raises is aborted and detached, and its error kept in
+    :attr:`errors`; the other sinks keep receiving the stream.
+    """
+
+    def __init__(self, sinks: Iterable):
+        self.sinks: List = list(sinks)
+        self.errors: Dict = {}
+
+    def _call(self, sink, method: str, *args) -> None:
+        try:
+            getattr(sink, method)(*args)
+        except Exception as e:
+            logger.debug("sink %r failed: %r", sink, e)
+            self.errors[sink] = e
+            self.sinks.remove(sink)
+            if method != "abort":
+                try:
+                    sink.abort(e)
+                except Exception:
+                    pass
+
+    def write(self, chunk) -> None:
+        for sink in list(self.sinks):
+            self._call(sink, "write", chunk)
+
+    def close(self) -> None:
+        for sink in list(self.sinks):
+            self._call(sink, "close")
+
+    def abort(self, error: BaseException) -> None:
+        for sink in list(self.sinks):
+            self._call(sink, "abort", error)
+
+
+def feed_file(file_path: str, sink, chunk_size: int = 262144) -> None:
+    """Send the contents of an existing file to ``sink``, then close it."""
+    try:
+        with open(file_path, "rb") as fh:
+            while True:
+                chunk = fh.read(chunk_size)
+                if not chunk:
+                    break
+                sink.write(chunk)
+    except BaseException as e:
+        sink.abort(e)
+        raise
+    sink.close()
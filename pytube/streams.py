@@ -8,17 +8,24 @@ separately).
 """
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from math import ceil
 
 from datetime import datetime
-from typing import BinaryIO, Dict, Optional, Tuple
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
 from urllib.error import HTTPError
-from urllib.parse import parse_qs
+from urllib.parse import parse_qs, urlsplit
 
 from pytube import extract, request
+from pytube.extract import StreamSigner, needs_signature
 from pytube.helpers import safe_filename, target_directory
-from pytube.itags import get_format_profile
+from pytube.itags import format_profile
+from pytube.journal import DownloadJournal, journal_path, part_path
 from pytube.monostate import Monostate
+from pytube.pipeline import WritePipeline
+from pytube.scheduler import Job
+from pytube.sinks import Tee, feed_file
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +33,32 @@ logger = logging.getLogger(__name__)
 class Stream:
     """Container for stream manifest data."""
 
+    # A video has dozens of streams and a playlist thousands of videos, so
+    # streams keep no per-instance ``__dict__``.
+    __slots__ = (
+        "_monostate",
+        "_url",
+        "_signature",
+        "_signer",
+        "itag",
+        "mime_type",
+        "codecs",
+        "type",
+        "subtype",
+        "video_codec",
+        "audio_codec",
+        "is_otf",
+        "bitrate",
+        "fps",
+        "_filesize",
+        "_profile",
+    )
+
     def __init__(
-        self, stream: Dict, monostate: Monostate
+        self,
+        stream: Dict,
+        monostate: Monostate,
+        signer: Optional[StreamSigner] = None
     ):
         """Construct a :class:`Stream <Stream>`.
 
@@ -36,12 +67,18 @@ class Stream:
         :param dict monostate:
             Dictionary of data shared across all instances of
             :class:`Stream <Stream>`.
+        :param StreamSigner signer:
+            (Optional) Signs the url the first time it's read. Without one,
+            the url in ``stream`` is used as is.
         """
         # A dictionary shared between all instances of :class:`Stream <Stream>`
         # (Borg pattern).
         self._monostate = monostate
 
-        self.url = stream["url"]  # signed download url
+        # download url, signed by ``signer`` when first read
+        self._url: str = stream["url"]
+        self._signature: Optional[str] = stream.get("s")
+        self._signer = signer if signer and needs_signature(stream) else None
         self.itag = int(
             stream["itag"]
         )  # stream format id (youtube nomenclature)
@@ -61,31 +98,82 @@ class Stream:
         self.is_otf: bool = stream["is_otf"]
         self.bitrate: Optional[int] = stream["bitrate"]
 
-        # filesize in bytes
-        self._filesize: Optional[int] = int(stream.get('contentLength', 0))
-        
-        # filesize in kilobytes
-        self._filesize_kb: Optional[float] = float(ceil(float(stream.get('contentLength', 0)) / 1024 * 1000) / 1000)
-        
-        # filesize in megabytes
-        self._filesize_mb: Optional[float] = float(ceil(float(stream.get('contentLength', 0)) / 1024 / 1024 * 1000) / 1000)
-        
-        # filesize in gigabytes(fingers crossed we don't need terabytes going forward though)
-        self._filesize_gb: Optional[float] = float(ceil(float(stream.get('contentLength', 0)) / 1024 / 1024 / 1024 * 1000) / 1000)
+        # filesize in bytes; 0 until known, then fetched once on demand
+        self._filesize: int = int(stream.get('contentLength', 0))
 
         # Additional information about the stream format, such as resolution,
-        # frame rate, and whether the stream is live (HLS) or 3D.
-        itag_profile = get_format_profile(self.itag)
-        self.is_dash = itag_profile["is_dash"]
-        self.abr = itag_profile["abr"]  # average bitrate (audio streams only)
+        # and whether the stream is live (HLS) or 3D, shared by every stream
+        # with this itag.
+        self._profile = format_profile(self.itag)
         if 'fps' in stream:
             self.fps = stream['fps']  # Video streams only
-        self.resolution = itag_profile[
-            "resolution"
-        ]  # resolution (e.g.: "480p")
-        self.is_3d = itag_profile["is_3d"]
-        self.is_hdr = itag_profile["is_hdr"]
-        self.is_live = itag_profile["is_live"]
+
+    @property
+    def is_dash(self) -> bool:
+        """Whether the itag is a DASH format.
+
+        :rtype: bool
+        """
+        return self._profile.is_dash
+
+    @property
+    def abr(self) -> Optional[str]:
+        """Average bitrate (e.g.: "128kbps"), for audio formats only.
+
+        :rtype: str
+        """
+        return self._profile.abr
+
+    @property
+    def resolution(self) -> Optional[str]:
+        """Resolution (e.g.: "480p"), for video formats only.
+
+        :rtype: str
+        """
+        return self._profile.resolution
+
+    @property
+    def is_3d(self) -> bool:
+        """Whether the stream is 3D.
+
+        :rtype: bool
+        """
+        return self._profile.is_3d
+
+    @property
+    def is_hdr(self) -> bool:
+        """Whether the stream is HDR.
+
+        :rtype: bool
+        """
+        return self._profile.is_hdr
+
+    @property
+    def is_live(self) -> bool:
+        """Whether the stream is live (HLS).
+
+        :rtype: bool
+        """
+        return self._profile.is_live
+
+    @property
+    def url(self) -> str:
+        """Signed download url of the stream.
+
+        :rtype: str
+        """
+        signer = self._signer
+        if signer is not None:
+            self._url = signer.sign(self._url, self._signature)
+            self._signature = None
+            self._signer = None
+        return self._url
+
+    @url.setter
+    def url(self, value: str) -> None:
+        self._url = value
+        self._signature = None
+        self._signer = None
 
     @property
     def is_adaptive(self) -> bool:
@@ -144,6 +232,13 @@ class Stream:
             audio = self.codecs[0]
         return video, audio
 
+    @property
+    def _size_key(self) -> Optional[Tuple[str, int]]:
+        """Key of the stream in :data:`pytube.request.filesize_cache`."""
+        if self._monostate.video_id:
+            return self._monostate.video_id, self.itag
+        return None
+
     @property
     def filesize(self) -> int:
         """File size of the media stream in bytes.
@@ -154,13 +249,36 @@ class Stream:
         """
         if self._filesize == 0:
             try:
-                self._filesize = request.filesize(self.url)
+                self._filesize = request.filesize(self.url, key=self._size_key)
             except HTTPError as e:
                 if e.code != 404:
                     raise
-                self._filesize = request.seq_filesize(self.url)
+                self._filesize = request.seq_filesize(self.url, key=self._size_key)
         return self._filesize
     
+    async def afilesize(self) -> int:
+        """File size of the media stream in bytes, fetched without blocking.
+
+        :rtype: int
+        :returns:
+            Filesize (in bytes) of the stream.
+        """
+        if self._filesize == 0:
+            try:
+                self._filesize = await request.afilesize(self.url, key=self._size_key)
+            except HTTPError as e:
+                if e.code != 404:
+                    raise
+                self._filesize = await request.aseq_filesize(
+                    self.url, key=self._size_key
+                )
+        return self._filesize
+
+    def _scaled_filesize(self, power: int) -> float:
+        """File size in units of ``1024 ** power`` bytes, rounded up to
+        three decimals."""
+        return float(ceil(self.filesize / 1024 ** power * 1000) / 1000)
+
     @property
     def filesize_kb(self) -> float:
         """File size of the media stream in kilobytes.
@@ -169,15 +287,8 @@ class Stream:
         :returns:
             Rounded filesize (in kilobytes) of the stream.
         """
-        if self._filesize_kb == 0:
-            try:
-                self._filesize_kb = float(ceil(request.filesize(self.url)/1024 * 1000) / 1000)
-            except HTTPError as e:
-                if e.code != 404:
-                    raise
-                self._filesize_kb = float(ceil(request.seq_filesize(self.url)/1024 * 1000) / 1000)
-        return self._filesize_kb
-    
+        return self._scaled_filesize(1)
+
     @property
     def filesize_mb(self) -> float:
         """File size of the media stream in megabytes.
@@ -186,14 +297,7 @@ class Stream:
         :returns:
             Rounded filesize (in megabytes) of the stream.
         """
-        if self._filesize_mb == 0:
-            try:
-                self._filesize_mb = float(ceil(request.filesize(self.url)/1024/1024 * 1000) / 1000)
-            except HTTPError as e:
-                if e.code != 404:
-                    raise
-                self._filesize_mb = float(ceil(request.seq_filesize(self.url)/1024/1024 * 1000) / 1000)
-        return self._filesize_mb
+        return self._scaled_filesize(2)
 
     @property
     def filesize_gb(self) -> float:
@@ -203,15 +307,8 @@ class Stream:
         :returns:
             Rounded filesize (in gigabytes) of the stream.
         """
-        if self._filesize_gb == 0:
-            try:
-                self._filesize_gb = float(ceil(request.filesize(self.url)/1024/1024/1024 * 1000) / 1000)
-            except HTTPError as e:
-                if e.code != 404:
-                    raise
-                self._filesize_gb = float(ceil(request.seq_filesize(self.url)/1024/1024/1024 * 1000) / 1000)
-        return self._filesize_gb
-    
+        return self._scaled_filesize(3)
+
     @property
     def title(self) -> str:
         """Get title of video
@@ -262,10 +359,18 @@ class Stream:
         filename_prefix: Optional[str] = None,
         skip_existing: bool = True,
         timeout: Optional[int] = None,
-        max_retries: Optional[int] = 0
+        max_retries: Optional[int] = 0,
+        max_workers: Optional[int] = None,
+        write_queue_depth: Optional[int] = None,
+        sinks: Optional[Iterable] = None
     ) -> str:
         """Write the media stream to disk.
 
+        The stream is written to ``<file>.part`` and only renamed to its final
+        name once complete. The byte ranges already written are recorded in a
+        ``<file>.part.json`` journal, so if a download is interrupted, the next
+        call for the same file only fetches what is missing.
+
         :param output_path:
             (optional) Output path for writing media file. If one is not
             specified, defaults to the current working directory.
@@ -290,6 +395,26 @@ class Stream:
         :param max_retries:
             (optional) Number of retries to attempt after socket timeout. Defaults to 0.
         :type max_retries: int
+        :param max_workers:
+            (optional) Number of byte ranges to download at the same time. When
+            greater than 1, the file is preallocated and each range is written
+            at its own offset as it arrives. Defaults to a single connection.
+            For sequential (OTF) streams this is the number of segments
+            requested at once instead.
+        :type max_workers: int
+        :param write_queue_depth:
+            (optional) Number of downloaded chunks that may wait to be written
+            to disk before reading from the network pauses. Chunks are written
+            by a separate thread, so a slow disk doesn't stall the download.
+            Defaults to :data:`pytube.pipeline.default_depth`.
+        :type write_queue_depth: int
+        :param sinks:
+            (optional) :mod:`pytube.sinks` that also receive every chunk, in
+            order, as it is written, e.g. to hash or upload the stream while
+            it downloads. The stream is then downloaded front to back and an
+            interrupted download starts over. If the file already exists and
+            is skipped, it is read back into the sinks instead.
+        :type sinks: list
         :returns:
             Path to the saved video
         :rtype: str
@@ -301,6 +426,109 @@ class Stream:
             filename_prefix=filename_prefix,
         )
 
+        tee = Tee(sinks) if sinks else None
+
+        if skip_existing and self.exists_at_path(file_path):
+            logger.debug(f'file {file_path} already exists, skipping')
+            if tee is not None:
+                feed_file(file_path, tee, request.buffer_pool.buffer_size)
+            self.on_complete(file_path)
+            return file_path
+
+        file_size = self.filesize
+        part_file_path = part_path(file_path)
+        logger.debug(f'downloading ({file_size} total bytes) file to {file_path}')
+
+        # Sequential (OTF) streams have no stable byte offsets to resume from.
+        journal = None
+        if not self.is_otf and tee is not None:
+            # Sinks need every byte in order, so don't resume.
+            journal = DownloadJournal(
+                journal_path(part_file_path), file_size, self._journal_identity()
+            )
+        elif not self.is_otf:
+            journal = DownloadJournal.open(
+                part_file_path, file_size, self._journal_identity()
+            )
+            if journal.completed_bytes:
+                logger.debug(
+                    f'resuming {part_file_path} at '
+                    f'{journal.completed_bytes}/{file_size} bytes'
+                )
+
+        # All ranges of the download share one bandwidth scheduler job.
+        job = request.bandwidth_scheduler.job(name=f"itag {self.itag}")
+        try:
+            downloaded = False
+            if journal is not None and tee is None and (
+                journal.completed_bytes or (max_workers and max_workers > 1)
+            ):
+                try:
+                    self._download_ranges(
+                        part_file_path, journal, timeout, max_retries,
+                        max_workers or 1, job, write_queue_depth
+                    )
+                    downloaded = True
+                except HTTPError as e:
+                    if e.code != 404:
+                        raise
+                    # Sequential streams can't be split into ranges; fall
+                    # through to the sequence-numbered download below.
+                    logger.debug('ranged download returned 404, retrying sequentially')
+                    journal.remove()
+                    journal = None
+            if not downloaded:
+                self._download_sequential(
+                    part_file_path, journal, timeout, max_retries, max_workers, job,
+                    write_queue_depth, tee
+                )
+        except BaseException as e:
+            if journal is not None and journal.completed_bytes:
+                journal.save()
+            if tee is not None:
+                tee.abort(e)
+            raise
+        finally:
+            job.close()
+
+        if tee is not None:
+            tee.close()
+            for sink, error in tee.errors.items():
+                logger.warning(f'sink {sink!r} failed: {error!r}')
+
+        os.replace(part_file_path, file_path)
+        if journal is not None:
+            journal.remove()
+        self.on_complete(file_path)
+        return file_path
+
+    async def adownload(
+        self,
+        output_path: Optional[str] = None,
+        filename: Optional[str] = None,
+        filename_prefix: Optional[str] = None,
+        skip_existing: bool = True,
+        timeout: Optional[int] = None,
+        max_retries: Optional[int] = 0,
+        max_workers: Optional[int] = None
+    ) -> str:
+        """Write the media stream to disk without blocking the event loop.
+
+        Async counterpart of :meth:`download`, taking the same arguments.
+        ``max_workers`` only applies to sequential (OTF) streams here.
+
+        :returns:
+            Path to the saved video
+        :rtype: str
+        """
+        file_path = self.get_file_path(
+            filename=filename,
+            output_path=output_path,
+            filename_prefix=filename_prefix,
+        )
+
+        # Resolve the size up front so the sync accessors below don't block.
+        await self.afilesize()
         if skip_existing and self.exists_at_path(file_path):
             logger.debug(f'file {file_path} already exists, skipping')
             self.on_complete(file_path)
@@ -311,31 +539,158 @@ class Stream:
 
         with open(file_path, "wb") as fh:
             try:
-                for chunk in request.stream(
+                async for chunk in request.astream(
                     self.url,
                     timeout=timeout,
                     max_retries=max_retries
                 ):
-                    # reduce the (bytes) remainder by the length of the chunk.
                     bytes_remaining -= len(chunk)
-                    # send to the on_progress callback.
                     self.on_progress(chunk, fh, bytes_remaining)
             except HTTPError as e:
                 if e.code != 404:
                     raise
                 # Some adaptive streams need to be requested with sequence numbers
-                for chunk in request.seq_stream(
+                async for chunk in request.aseq_stream(
                     self.url,
                     timeout=timeout,
-                    max_retries=max_retries
+                    max_retries=max_retries,
+                    max_workers=max_workers
                 ):
-                    # reduce the (bytes) remainder by the length of the chunk.
                     bytes_remaining -= len(chunk)
-                    # send to the on_progress callback.
                     self.on_progress(chunk, fh, bytes_remaining)
         self.on_complete(file_path)
         return file_path
 
+    def _download_sequential(
+        self,
+        file_path: str,
+        journal: Optional[DownloadJournal],
+        timeout: Optional[int],
+        max_retries: Optional[int],
+        max_workers: Optional[int],
+        job: Job,
+        write_queue_depth: Optional[int] = None,
+        tee: Optional[Tee] = None,
+    ) -> None:
+        """Download the stream front to back into ``file_path``.
+
+        Chunks are written, recorded in ``journal`` and passed to ``tee``, if
+        given, on a writer thread, so the download can later be resumed by
+        :meth:`_download_ranges`.
+        """
+        file_size = self.filesize
+        with open(file_path, "wb") as fh:
+
+            def write(chunk: memoryview, offset: int) -> None:
+                # send to the on_progress callback.
+                self.on_progress(chunk, fh, file_size - offset - len(chunk))
+                if tee is not None:
+                    tee.write(chunk)
+                if journal is not None:
+                    journal.add(offset, offset + len(chunk) - 1)
+                    if journal.due():
+                        fh.flush()
+                        journal.save()
+
+            try:
+                with WritePipeline(write, depth=write_queue_depth) as pipeline:
+                    for chunk in request.stream(
+                        self.url,
+                        timeout=timeout,
+                        max_retries=max_retries,
+                        job=job,
+                        zero_copy=True
+                    ):
+                        pipeline.submit(chunk)
+            except HTTPError as e:
+                if e.code != 404:
+                    raise
+                # Sequence-numbered segments aren't recorded in the journal.
+                journal = None
+                # Some adaptive streams need to be requested with sequence numbers
+                with WritePipeline(write, depth=write_queue_depth) as pipeline:
+                    for chunk in request.seq_stream(
+                        self.url,
+                        timeout=timeout,
+                        max_retries=max_retries,
+                        max_workers=max_workers,
+                        job=job
+                    ):
+                        pipeline.submit(chunk)
+
+    def _download_ranges(
+        self,
+        file_path: str,
+        journal: DownloadJournal,
+        timeout: Optional[int],
+        max_retries: Optional[int],
+        max_workers: int,
+        job: Job,
+        write_queue_depth: Optional[int] = None,
+    ) -> None:
+        """Download the ranges missing from ``journal`` into ``file_path``.
+
+        The output file is sized to the full stream and every range is
+        written at its own offset, so ranges can complete in any order.
+        Ranges already in the journal are kept and not requested again. All
+        ranges share one writer thread, which also runs the progress
+        callbacks, so progress handlers need no locking.
+        """
+        file_size = self.filesize
+        missing = journal.missing()
+        bytes_remaining = sum(stop - start + 1 for start, stop in missing)
+        range_size = max(
+            1, min(request.default_range_size, ceil(bytes_remaining / max_workers))
+        )
+        ranges = [
+            (start + offset, min(stop, start + offset + range_size - 1))
+            for start, stop in missing
+            for offset in range(0, stop - start + 1, range_size)
+        ]
+
+        def write(chunk: memoryview, offset: int) -> None:
+            nonlocal bytes_remaining
+            _write_at(fd, chunk, offset)
+            journal.add(offset, offset + len(chunk) - 1)
+            bytes_remaining -= len(chunk)
+            self._notify_progress(chunk, bytes_remaining)
+            if journal.due():
+                journal.save()
+
+        def fetch(start: int, stop: int) -> None:
+            offset = start
+            for chunk in request.range_stream(
+                self.url, start, stop, timeout=timeout, max_retries=max_retries,
+                job=job, zero_copy=True
+            ):
+                pipeline.submit(chunk, offset)
+                offset += len(chunk)
+
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        fd = os.open(file_path, flags, 0o666)
+        try:
+            os.ftruncate(fd, file_size)
+            with WritePipeline(write, depth=write_queue_depth) as pipeline:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(fetch, start, stop)
+                        for start, stop in ranges
+                    ]
+                    for future in futures:
+                        try:
+                            future.result()
+                        except BaseException:
+                            for pending in futures:
+                                pending.cancel()
+                            raise
+        finally:
+            os.close(fd)
+
+    def _journal_identity(self) -> Dict:
+        """Values a saved download journal must match to be resumed."""
+        query = parse_qs(urlsplit(self.url).query)
+        return {"itag": self.itag, "id": query.get("id", [None])[0]}
+
     def get_file_path(
         self,
         filename: Optional[str] = None,
@@ -364,13 +719,52 @@ class Stream:
             "downloading (%s total bytes) file to buffer", self.filesize,
         )
 
-        for chunk in request.stream(self.url):
+        for chunk in request.stream(self.url, zero_copy=True):
             # reduce the (bytes) remainder by the length of the chunk.
             bytes_remaining -= len(chunk)
             # send to the on_progress callback.
             self.on_progress(chunk, buffer, bytes_remaining)
         self.on_complete(None)
 
+    def stream_to_sinks(
+        self,
+        sinks: Iterable,
+        timeout: Optional[int] = None,
+        max_retries: Optional[int] = 0
+    ) -> Tee:
+        """Send the media stream to ``sinks`` without writing it to disk.
+
+        :param sinks:
+            :mod:`pytube.sinks` that each receive every chunk, in order.
+        :returns:
+            The :class:`Tee <pytube.sinks.Tee>` that fed the sinks; its
+            ``errors`` hold the error of each sink that failed.
+        :rtype: pytube.sinks.Tee
+        """
+        tee = Tee(sinks)
+        bytes_remaining = self.filesize
+        logger.info(
+            "downloading (%s total bytes) file to %s sinks",
+            self.filesize, len(tee.sinks),
+        )
+
+        try:
+            for chunk in request.stream(
+                self.url, timeout=timeout, max_retries=max_retries, zero_copy=True
+            ):
+                bytes_remaining -= len(chunk)
+                tee.write(chunk)
+                if tee.errors and not tee.sinks:
+                    # Every sink failed; don't keep downloading for nobody.
+                    raise next(iter(tee.errors.values()))
+                self._notify_progress(chunk, bytes_remaining)
+        except BaseException as e:
+            tee.abort(e)
+            raise
+        tee.close()
+        self.on_complete(None)
+        return tee
+
     def on_progress(
         self, chunk: bytes, file_handler: BinaryIO, bytes_remaining: int
     ):
@@ -381,7 +775,9 @@ class Stream:
         allow things like displaying a progress bar.
 
         :param bytes chunk:
-            Segment of media file binary data, not yet written to disk.
+            Segment of media file binary data, not yet written to disk. This
+            may be a :class:`memoryview` of a buffer that is reused for the
+            next segment, so callbacks must not keep a reference to it.
         :param file_handler:
             The file handle where the media is being written to.
         :type file_handler:
@@ -394,6 +790,10 @@ class Stream:
 
         """
         file_handler.write(chunk)
+        self._notify_progress(chunk, bytes_remaining)
+
+    def _notify_progress(self, chunk: bytes, bytes_remaining: int):
+        """Forward a progress event to the monostate callback, if any."""
         logger.debug("download remaining: %s", bytes_remaining)
         if self._monostate.on_progress:
             self._monostate.on_progress(self, chunk, bytes_remaining)
@@ -434,3 +834,26 @@ class Stream:
             parts.extend(['abr="{s.abr}"', 'acodec="{s.audio_codec}"'])
         parts.extend(['progressive="{s.is_progressive}"', 'type="{s.type}"'])
         return f"<Stream: {' '.join(parts).format(s=self)}>"
+
+
+_write_lock = threading.Lock()
+
+
+def _write_at(fd: int, data: bytes, offset: int) -> None:
+    """Write ``data`` to the file descriptor ``fd`` at ``offset``.
+
+    Uses :func:`os.pwrite` where available so concurrent writers never share
+    a file position; other platforms fall back to a locked seek and write.
+    """
+    view = memoryview(data)
+    if hasattr(os, "pwrite"):
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+        return
+    with _write_lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
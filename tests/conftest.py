@@ -5,7 +5,16 @@ import os
 import pytest
 from unittest import mock
 
-from pytube import YouTube
+from pytube import YouTube, players
+
+
+@pytest.fixture(autouse=True)
+def player_store(tmp_path, monkeypatch):
+    """Keep stored players out of the package and separate between tests."""
+    store = players.PlayerStore(str(tmp_path / "players"))
+    monkeypatch.setattr(players, "player_store", store)
+    monkeypatch.setattr(players, "player_cache", players.PlayerCache())
+    return store
 
 
 def load_playback_file(filename):
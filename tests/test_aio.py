@@ -0,0 +1,196 @@
+import asyncio
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from pytube import aio, request
+from pytube.retry import RetryPolicy
+
+CONTENT = bytes(range(256)) * 64
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        if parts.path == "/missing":
+            self.send_error(404)
+            return
+        if parts.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/file")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if parts.path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for piece in (b"hello ", b"chunked ", b"world"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        if parts.path == "/gzip":
+            body = gzip.compress(b"hello compressed world")
+            self.send_response(200)
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                self.send_header("Content-Encoding", "gzip")
+            else:
+                body = b"hello compressed world"
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        body = CONTENT
+        if "range" in query:
+            start, stop = (int(x) for x in query["range"][0].split("-"))
+            body = CONTENT[start:stop + 1]
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(CONTENT)))
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_urlopen_reuses_connections(server_url):
+    pool = aio.AsyncConnectionPool()
+
+    async def fetch_twice():
+        bodies = []
+        for _ in range(2):
+            response = await aio.urlopen(pool, server_url + "/file")
+            bodies.append(await response.read())
+        return bodies
+
+    assert asyncio.run(fetch_twice()) == [CONTENT, CONTENT]
+    assert pool.stats()["created"] == 1
+    assert pool.stats()["reused"] == 1
+
+
+def test_urlopen_chunked_body(server_url):
+    pool = aio.AsyncConnectionPool()
+
+    async def fetch():
+        response = await aio.urlopen(pool, server_url + "/chunked")
+        return await response.read()
+
+    assert asyncio.run(fetch()) == b"hello chunked world"
+
+
+def test_urlopen_follows_redirects(server_url):
+    pool = aio.AsyncConnectionPool()
+
+    async def fetch():
+        response = await aio.urlopen(pool, server_url + "/redirect")
+        return await response.read()
+
+    assert asyncio.run(fetch()) == CONTENT
+
+
+def test_urlopen_raises_http_error(server_url):
+    pool = aio.AsyncConnectionPool()
+    with pytest.raises(HTTPError) as exc_info:
+        asyncio.run(aio.urlopen(pool, server_url + "/missing"))
+    assert exc_info.value.code == 404
+
+
+def test_aget_and_ahead(server_url):
+    async def fetch():
+        return await asyncio.gather(
+            request.ahead(server_url + "/file"),
+            request.aget(server_url + "/chunked"),
+        )
+
+    headers, body = asyncio.run(fetch())
+    assert headers["content-length"] == str(len(CONTENT))
+    assert body == "hello chunked world"
+
+
+def test_astream(server_url):
+    async def fetch():
+        return b"".join([
+            chunk async for chunk in request.astream(
+                server_url + f"/file?clen={len(CONTENT)}"
+            )
+        ])
+
+    assert asyncio.run(fetch()) == CONTENT
+
+
+def test_astream_retries_and_charges_job(server_url):
+    execute_request = request._aexecute_request
+    calls = []
+
+    async def flaky_request(url, *args, **kwargs):
+        calls.append(url)
+        if len(calls) == 1:
+            raise URLError(ConnectionResetError("reset"))
+        return await execute_request(url, *args, **kwargs)
+
+    async def fetch(job):
+        return b"".join([
+            chunk async for chunk in request.astream(
+                server_url + f"/file?clen={len(CONTENT)}",
+                job=job,
+                retry_policy=RetryPolicy(max_retries=1, backoff=0),
+            )
+        ])
+
+    with request.bandwidth_scheduler.job() as job, \
+            mock.patch("pytube.request._aexecute_request", side_effect=flaky_request):
+        assert asyncio.run(fetch(job)) == CONTENT
+        assert job.transferred == len(CONTENT)
+    assert len(calls) == 2
+
+
+def test_proxied_requests_use_the_blocking_client(server_url, monkeypatch):
+    monkeypatch.setattr(request, "_opener", request._opener)
+    monkeypatch.setattr(request, "_proxies", request._proxies)
+    # The test server answers absolute-form requests, so it can act as the proxy.
+    request.install_proxy({"http": server_url})
+    created = request.async_pool_stats()["created"]
+
+    body = asyncio.run(request.aget("http://pytube.invalid/chunked"))
+    assert body == "hello chunked world"
+    assert request.async_pool_stats()["created"] == created
+
+
+def test_pool_survives_closed_event_loop(server_url):
+    pool = aio.AsyncConnectionPool()
+
+    async def fetch():
+        response = await aio.urlopen(pool, server_url + "/file")
+        return await response.read()
+
+    # Each asyncio.run uses a new loop, so the idle connection can't be reused.
+    assert asyncio.run(fetch()) == CONTENT
+    assert asyncio.run(fetch()) == CONTENT
+    assert pool.stats()["created"] == 2
+
+
+def test_aget_decompresses_gzip(server_url):
+    assert asyncio.run(request.aget(server_url + "/gzip")) == "hello compressed world"
@@ -0,0 +1,40 @@
+from unittest import mock
+
+from pytube.cache import ExpiringCache
+
+
+def test_get_and_counters():
+    cache = ExpiringCache()
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats() == {
+        "hits": 1, "misses": 1, "evictions": 0, "expirations": 0, "size": 1
+    }
+
+
+def test_evicts_least_recently_used():
+    cache = ExpiringCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+@mock.patch("pytube.cache.time.time")
+def test_entries_expire(mock_time):
+    mock_time.return_value = 1000
+    cache = ExpiringCache(ttl=60)
+    cache.set("ttl", 1)
+    cache.set("expires", 2, expires=1010)
+    mock_time.return_value = 1020
+    assert cache.get("expires") is None
+    assert cache.get("ttl") == 1
+    mock_time.return_value = 1061
+    assert cache.get("ttl") is None
+    assert cache.expirations == 2
+    assert len(cache) == 0
@@ -1,3 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+import re
+from unittest import mock
+
 import pytest
 
 from pytube import cipher
@@ -101,3 +105,125 @@ def test_get_throttling_function_name(base_js):
         assert code_fragment['raw_code'] in base_js_file
         func_name = cipher.get_throttling_function_name(base_js_file)
         assert func_name == code_fragment['nfunc_name']
+
+
+def test_js_index_regions():
+    js = "a;b.set(1);c;d}e.set(2)\nf.set(3);g"
+    index = cipher.JsIndex(js)
+    regions = index.regions(".set(")
+    assert [js[start:end] for start, end in regions] == [
+        "b.set(1);", "e.set(2)\nf.set(3);"
+    ]
+    assert index.regions(".set(") is regions
+    assert index.regions("missing") == []
+
+
+def test_get_initial_function_name_matches_across_lines():
+    js = 'Xy=\n\n\nfunction(a){a=a.split("")};'
+    index = cipher.JsIndex(js)
+    assert cipher.get_initial_function_name(js, index) == "Xy"
+
+
+def test_get_initial_function_name_keeps_pattern_priority():
+    # The .sig|| pattern matches first in the file, but has a lower priority.
+    js = 'c.sig||Zz(a);\nXy=\n\n\nfunction(a){a=a.split("")};'
+    index = cipher.JsIndex(js)
+    assert index.search(re.compile(r"\.sig\|\|(\w+)\("), ".sig||")
+    assert cipher.get_initial_function_name(js, index) == "Xy"
+
+
+def test_cipher_does_not_scan_the_whole_file(base_js):
+    js = base_js[0]
+    scanned = []
+
+    class RecordingPattern:
+        def __init__(self, regex):
+            self.regex = regex
+
+        def search(self, string, pos=0, endpos=len(js)):
+            if string is js:
+                scanned.append(min(endpos, len(js)) - pos)
+            return self.regex.search(string, pos, endpos)
+
+        def __getattr__(self, name):
+            return getattr(self.regex, name)
+
+    class RecordingRe:
+        def __getattr__(self, name):
+            return getattr(re, name)
+
+        def compile(self, *args, **kwargs):
+            return RecordingPattern(re.compile(*args, **kwargs))
+
+        def search(self, pattern, string, flags=0):
+            return self.compile(pattern, flags).search(string)
+
+    with mock.patch("pytube.cipher.re", RecordingRe()):
+        c = cipher.Cipher(js=js)
+    assert c.transform_plan == ["Bz.lc(a,1)", "Bz.yT(a,36)", "Bz.lc(a,1)"]
+    # Only the statements around each pattern's literal are searched.
+    assert scanned
+    assert sum(scanned) < len(js) // 10
+
+
+def test_cipher_records_timings(base_js):
+    c = cipher.Cipher(js=base_js[0])
+    assert set(c.timings) == {
+        "transform_plan",
+        "transform_map",
+        "throttling_code",
+        "throttling_plan",
+        "throttling_array",
+    }
+    assert c.transform_plan == ["Bz.lc(a,1)", "Bz.yT(a,36)", "Bz.lc(a,1)"]
+
+
+def test_compile_signature_permutation():
+    steps = ((cipher.reverse, 0), (cipher.splice, 2), (cipher.swap, 3))
+    positions = cipher.compile_signature_permutation(steps, 8)
+    signature = "abcdefgh"
+    expected = list(signature)
+    for fn, argument in steps:
+        expected = fn(expected, argument)
+    assert "".join(signature[i] for i in positions) == "".join(expected)
+    assert cipher.compile_signature_permutation(steps, 8) is positions
+
+
+def test_get_signature(base_js):
+    c = cipher.Cipher(js=base_js[0])
+    signature = "abcdefghijklmnopqrstuvwxyz0123456789ABCDEFGHIJ"
+    expected = list(signature)
+    for fn, argument in [(cipher.splice, 1), (cipher.reverse, 36), (cipher.splice, 1)]:
+        expected = fn(expected, argument)
+    assert c.get_signature(signature) == "".join(expected)
+
+
+def test_calculate_n_does_not_modify_cipher(base_js):
+    c = cipher.Cipher(js=base_js[0])
+    array = list(c.throttling_array)
+    first = c.calculate_n("abcdefghijklmnop")
+    assert c.calculate_n(list("ponmlkjihgfedcba")) != first
+    assert c.throttling_array == array
+    c._calculate_n.cache_clear()
+    assert c.calculate_n("abcdefghijklmnop") == first
+    assert c._calculate_n.cache_info().misses == 1
+
+
+def test_calculate_n_is_memoized_per_cipher(base_js):
+    c = cipher.Cipher(js=base_js[0])
+    other = cipher.Cipher(js=base_js[0])
+    with mock.patch("pytube.cipher.transform_n", wraps=cipher.transform_n) as transform_n:
+        first = c.calculate_n("abcdefghijklmnop")
+        assert c.calculate_n(list("abcdefghijklmnop")) == first
+        assert transform_n.call_count == 1
+        assert other.calculate_n("abcdefghijklmnop") == first
+        assert transform_n.call_count == 2
+
+
+def test_calculate_n_from_threads(base_js):
+    c = cipher.Cipher(js=base_js[0])
+    values = ["%016d" % i for i in range(32)]
+    expected = [c.calculate_n(n) for n in values]
+    c._calculate_n.cache_clear()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(c.calculate_n, values)) == expected
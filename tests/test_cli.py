@@ -1,6 +1,7 @@
 import argparse
 import logging
 import os
+import threading
 from unittest import mock
 from unittest.mock import MagicMock, patch
 
@@ -8,6 +9,7 @@ import pytest
 
 from pytube import Caption, CaptionQuery, cli, StreamQuery
 from pytube.exceptions import PytubeError
+from pytube.progress import ProgressBus
 
 parse_args = cli._parse_args
 
@@ -125,6 +127,20 @@ def test_display_progress_bar(capsys):
     assert "25.0%" in out
 
 
+def test_progress_renderer(capsys):
+    bus = ProgressBus(interval=0)
+    bus.subscribe(cli.progress_renderer(scale=0.55))
+    bus.task("v", total=100, label="video").update(50)
+    bus.task("a", total=100, label="audio").update(100)
+    out = capsys.readouterr().out
+    lines = out.split("\x1b[")[-1].splitlines()
+    assert lines[0].startswith("1F")  # drawn over the previous single bar
+    assert lines[1].startswith("audio |")
+    assert lines[1].endswith("100.0%")
+    assert lines[2].startswith("total |")
+    assert lines[2].endswith(" 75.0%")
+
+
 @mock.patch("pytube.Stream")
 def test_on_progress(stream):
     stream.filesize = 10
@@ -335,7 +351,11 @@ def test_perform_args_should_ffmpeg_process(ffmpeg_process, youtube):
     cli._perform_args_on_youtube(youtube, args)
     # Then
     ffmpeg_process.assert_called_with(
-        youtube=youtube, resolution="best", target=None
+        youtube=youtube,
+        resolution="best",
+        target=None,
+        piped=False,
+        builtin=False,
     )
 
 
@@ -480,6 +500,114 @@ def test_ffmpeg_downloader(unique_name, download, run, unlink):
     unlink.assert_called()
 
 
+@mock.patch("pytube.cli._ffmpeg_pipe_downloader")
+def test_ffmpeg_process_piped(_ffmpeg_pipe_downloader):
+    # Given
+    youtube = MagicMock()
+    video_stream = MagicMock()
+    youtube.streams.filter.return_value.order_by.return_value.last.return_value = (
+        video_stream
+    )
+    audio_stream = youtube.streams.get_audio_only.return_value
+    # When
+    cli.ffmpeg_process(youtube, "best", "/target", piped=True)
+    # Then
+    _ffmpeg_pipe_downloader.assert_called_with(
+        audio_stream=audio_stream, video_stream=video_stream, target="/target"
+    )
+
+
+@pytest.mark.skipif(os.name != "posix", reason="needs pass_fds")
+@mock.patch("pytube.cli.safe_filename", return_value="title")
+@mock.patch("pytube.cli.subprocess.Popen")
+def test_ffmpeg_pipe_downloader(popen, safe_filename, tmp_path):
+    # Given
+    received = {}
+    readers = []
+
+    def fake_ffmpeg(args, pass_fds):
+        # Read both pipes at the same time, as ffmpeg would.
+        for fd in pass_fds:
+            copy = os.dup(fd)
+
+            def read(fd=fd, copy=copy):
+                with open(copy, "rb") as fh:
+                    received[fd] = fh.read()
+
+            reader = threading.Thread(target=read)
+            reader.start()
+            readers.append(reader)
+        return popen.return_value
+
+    popen.side_effect = fake_ffmpeg
+
+    def make_stream(content, subtype):
+        stream = MagicMock()
+        stream.title = "title"
+        stream.subtype = subtype
+        stream.filesize = len(content)
+        stream.stream_to_buffer.side_effect = lambda fh: fh.write(content)
+        return stream
+
+    video_stream = make_stream(b"video" * 50000, "mp4")
+    audio_stream = make_stream(b"audio" * 50000, "m4a")
+    # When
+    cli._ffmpeg_pipe_downloader(
+        audio_stream=audio_stream, video_stream=video_stream, target=str(tmp_path)
+    )
+    for reader in readers:
+        reader.join()
+    # Then
+    args = popen.call_args[0][0]
+    video_fd, audio_fd = popen.call_args[1]["pass_fds"]
+    assert args == [
+        "ffmpeg",
+        "-i",
+        f"pipe:{video_fd}",
+        "-i",
+        f"pipe:{audio_fd}",
+        "-codec",
+        "copy",
+        os.path.join(str(tmp_path), "title.mp4"),
+    ]
+    assert received == {video_fd: b"video" * 50000, audio_fd: b"audio" * 50000}
+    popen.return_value.wait.assert_called()
+    assert os.listdir(tmp_path) == []
+
+
+@mock.patch("pytube.cli.mux_streams")
+@mock.patch("pytube.cli.safe_filename", return_value="title")
+def test_builtin_mux_downloader(safe_filename, mux_streams):
+    # Given
+    audio_stream = MagicMock(subtype="mp4", filesize=1)
+    video_stream = MagicMock(subtype="mp4", filesize=1)
+    # When
+    cli._builtin_mux_downloader(
+        audio_stream=audio_stream, video_stream=video_stream, target="target"
+    )
+    # Then
+    mux_streams.assert_called_with(
+        video_stream, audio_stream, os.path.join("target", "title.mp4")
+    )
+
+
+@mock.patch("pytube.cli._ffmpeg_downloader")
+@mock.patch("pytube.cli.mux_streams")
+def test_builtin_mux_downloader_webm_uses_ffmpeg(mux_streams, _ffmpeg_downloader):
+    # Given
+    audio_stream = MagicMock(subtype="webm")
+    video_stream = MagicMock(subtype="mp4")
+    # When
+    cli._builtin_mux_downloader(
+        audio_stream=audio_stream, video_stream=video_stream, target="target"
+    )
+    # Then
+    mux_streams.assert_not_called()
+    _ffmpeg_downloader.assert_called_with(
+        audio_stream=audio_stream, video_stream=video_stream, target="target"
+    )
+
+
 @mock.patch("pytube.cli.download_audio")
 @mock.patch("pytube.cli.YouTube.__init__", return_value=None)
 def test_download_audio_args(youtube, download_audio):
@@ -0,0 +1,56 @@
+import gzip
+import io
+import zlib
+
+import pytest
+
+from pytube.compression import DecodedResponse, decode_response, get_decoder
+
+TEXT = b"ytInitialData = {" + b'"contents": [1, 2, 3], ' * 2000 + b"}"
+
+
+class _FakeResponse(io.BytesIO):
+    def __init__(self, body, headers):
+        super().__init__(body)
+        self.headers = headers
+
+    def info(self):
+        return self.headers
+
+
+@pytest.mark.parametrize("encoding,body", [
+    ("gzip", gzip.compress(TEXT)),
+    ("deflate", zlib.compress(TEXT)),
+    ("deflate", zlib.compress(TEXT)[2:-4]),  # raw deflate, no zlib header
+    ("gzip, deflate", zlib.compress(gzip.compress(TEXT))),
+])
+def test_decode_response(encoding, body):
+    response = decode_response(_FakeResponse(body, {"Content-Encoding": encoding}))
+    assert isinstance(response, DecodedResponse)
+    assert response.read() == TEXT
+
+
+def test_decode_response_reads_incrementally():
+    response = decode_response(
+        _FakeResponse(gzip.compress(TEXT), {"Content-Encoding": "gzip"})
+    )
+    chunks = []
+    while True:
+        chunk = response.read(1000)
+        if not chunk:
+            break
+        assert len(chunk) <= 1000
+        chunks.append(chunk)
+    assert b"".join(chunks) == TEXT
+
+
+def test_identity_is_not_wrapped():
+    raw = _FakeResponse(TEXT, {"Content-Encoding": "identity"})
+    assert decode_response(raw) is raw
+    raw = _FakeResponse(TEXT, {})
+    assert decode_response(raw) is raw
+
+
+def test_unsupported_encoding():
+    with pytest.raises(ValueError):  # noqa: PT011
+        get_decoder("compress")
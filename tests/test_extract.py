@@ -2,9 +2,11 @@
 from datetime import datetime
 import pytest
 import re
+from unittest import mock
+from unittest.mock import MagicMock
 
 from pytube import extract
-from pytube.exceptions import RegexMatchError
+from pytube.exceptions import ExtractError, RegexMatchError
 
 
 def test_extract_video_id():
@@ -100,3 +102,69 @@ def test_initial_data_missing():
 def test_initial_data(stream_dict):
     initial_data = extract.initial_data(stream_dict)
     assert 'contents' in initial_data
+
+
+UNSIGNED_URL = "https://r1.googlevideo.com/videoplayback?itag=18&n=abc"
+
+
+@mock.patch("pytube.extract.Cipher")
+def test_stream_signer_shares_cipher(mock_cipher):
+    cipher = mock_cipher.return_value
+    cipher.get_signature.side_effect = lambda ciphered_signature: ciphered_signature[::-1]
+    cipher.calculate_n.return_value = "xyz"
+    signer = extract.StreamSigner(lambda: mock_cipher(js="js"))
+    assert not mock_cipher.called
+
+    first = signer.sign(UNSIGNED_URL, "123")
+    second = signer.sign(UNSIGNED_URL, "456")
+    assert first.endswith("n=xyz&sig=321")
+    assert second.endswith("n=xyz&sig=654")
+    mock_cipher.assert_called_once_with(js="js")
+    cipher.calculate_n.assert_called_with("abc")
+    assert signer.sign(UNSIGNED_URL, None) == UNSIGNED_URL
+
+
+@mock.patch("pytube.extract.Cipher")
+def test_stream_signer_refreshes_stale_js(mock_cipher):
+    stale, fresh = MagicMock(), MagicMock()
+    stale.get_signature.side_effect = ExtractError("stale")
+    fresh.get_signature.return_value = "sig"
+    mock_cipher.side_effect = [stale, fresh]
+    refresh_js = MagicMock()
+    signer = extract.StreamSigner(lambda: mock_cipher(js="js"), refresh_js)
+
+    assert "sig=sig" in signer.sign(UNSIGNED_URL + "&ratebypass=yes", "s")
+    refresh_js.assert_called_once_with()
+
+
+def test_needs_signature():
+    assert extract.needs_signature({"url": UNSIGNED_URL, "s": "abc"})
+    assert not extract.needs_signature({"url": UNSIGNED_URL + "&sig=1"})
+    assert not extract.needs_signature({"url": UNSIGNED_URL + "&signature=1"})
+
+
+@pytest.mark.parametrize("field, function", [
+    ("initial_data", extract.initial_data),
+    ("initial_player_response", extract.initial_player_response),
+    ("ytcfg", extract.get_ytcfg),
+    ("js_url", extract.js_url),
+    ("publish_date", extract.publish_date),
+    ("is_age_restricted", extract.is_age_restricted),
+    ("playability_status", extract.playability_status),
+])
+def test_watch_page_matches_functions(cipher_signature, age_restricted, field, function):
+    for html in (cipher_signature.watch_html, age_restricted["watch_html"]):
+        assert getattr(extract.WatchPage(html), field) == function(html)
+
+
+@mock.patch("pytube.extract.parse_for_object_from_startpoint")
+def test_watch_page_parses_objects_once(parse, cipher_signature):
+    parse.return_value = {"playabilityStatus": {"status": "OK"}}
+    page = extract.WatchPage(cipher_signature.watch_html)
+    assert page.playability_status == (None, [None])
+    assert page.playability_status == (None, [None])
+    assert page.initial_player_response is page.initial_player_response
+    assert parse.call_count == 1
+
+    with pytest.raises(RegexMatchError):
+        extract.WatchPage("<html></html>").initial_data
@@ -1,3 +1,5 @@
+import pytest
+
 from pytube import itags
 
 
@@ -9,3 +11,11 @@ def test_get_format_profile():
 def test_get_format_profile_non_existant():
     profile = itags.get_format_profile(2239)
     assert profile["resolution"] is None
+
+
+def test_format_profile_is_shared_and_immutable():
+    assert itags.format_profile(18) is itags.format_profile("18")
+    # Unknown itags share a single profile.
+    assert itags.format_profile(2239) is itags.format_profile(2240)
+    with pytest.raises(AttributeError):
+        itags.format_profile(18).resolution = "720p"
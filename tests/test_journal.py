@@ -0,0 +1,41 @@
+from pytube.journal import DownloadJournal, journal_path, part_path
+
+
+def test_paths():
+    assert part_path("/tmp/video.mp4") == "/tmp/video.mp4.part"
+    assert journal_path("/tmp/video.mp4.part") == "/tmp/video.mp4.part.json"
+
+
+def test_add_merges_ranges():
+    journal = DownloadJournal("unused", 100, {})
+    journal.add(0, 9)
+    journal.add(10, 19)
+    journal.add(40, 49)
+    journal.add(30, 39)
+    assert journal.missing() == [(20, 29), (50, 99)]
+    assert journal.completed_bytes == 40
+    journal.add(15, 35)
+    assert journal.missing() == [(50, 99)]
+
+
+def test_save_and_open(tmp_path):
+    part = str(tmp_path / "video.mp4.part")
+    open(part, "wb").close()
+    journal = DownloadJournal.open(part, 100, {"itag": 18})
+    journal.add(0, 49)
+    journal.save()
+
+    assert DownloadJournal.open(part, 100, {"itag": 18}).missing() == [(50, 99)]
+    assert DownloadJournal.open(part, 200, {"itag": 18}).completed_bytes == 0
+    assert DownloadJournal.open(part, 100, {"itag": 22}).completed_bytes == 0
+
+    journal.remove()
+    assert DownloadJournal.open(part, 100, {"itag": 18}).completed_bytes == 0
+
+
+def test_open_ignores_journal_without_part_file(tmp_path):
+    part = str(tmp_path / "video.mp4.part")
+    journal = DownloadJournal(journal_path(part), 100, {})
+    journal.add(0, 49)
+    journal.save()
+    assert DownloadJournal.open(part, 100, {}).completed_bytes == 0
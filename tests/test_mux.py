@@ -0,0 +1,148 @@
+import io
+import struct
+from unittest.mock import MagicMock
+
+import pytest
+
+from pytube.exceptions import MuxError
+from pytube.mux import mux, mux_streams
+from pytube.sinks import PipeSink
+
+
+def box(box_type, *payload):
+    data = b"".join(payload)
+    return struct.pack(">I4s", len(data) + 8, box_type) + data
+
+
+def full(version=0, flags=0):
+    return struct.pack(">I", version << 24 | flags)
+
+
+def init_segment(track_id, timescale, handler):
+    mvhd = box(b"mvhd", full(), struct.pack(">IIII", 0, 0, 1000, 0), bytes(76),
+               struct.pack(">I", track_id + 1))
+    tkhd = box(b"tkhd", full(), struct.pack(">IIIII", 0, 0, track_id, 0, 0), bytes(60))
+    mdhd = box(b"mdhd", full(), struct.pack(">IIII", 0, 0, timescale, 0), bytes(4))
+    hdlr = box(b"hdlr", full(), bytes(4), handler, bytes(13))
+    trak = box(b"trak", tkhd, box(b"mdia", mdhd, hdlr))
+    trex = box(b"trex", full(), struct.pack(">IIIII", track_id, 1, 0, 0, 0))
+    return box(b"ftyp", b"dash", bytes(4)) + box(b"moov", mvhd, trak, box(b"mvex", trex))
+
+
+def fragment(track_id, sequence, time, data, base_offset=None):
+    """Build a moof+mdat pair, optionally with an absolute base data offset."""
+    tfdt = box(b"tfdt", full(1), struct.pack(">Q", time))
+    trun = box(b"trun", full(0, 0x1), struct.pack(">Ii", 1, 0))
+
+    def build(offset):
+        if base_offset is None:
+            tfhd = box(b"tfhd", full(0, 0x020000), struct.pack(">I", track_id))
+        else:
+            tfhd = box(b"tfhd", full(0, 0x1), struct.pack(">IQ", track_id, offset))
+        return box(b"moof", box(b"mfhd", full(), struct.pack(">I", sequence)),
+                   box(b"traf", tfhd, tfdt, trun))
+
+    moof = build(0)
+    if base_offset is not None:
+        # Absolute offset of the mdat payload in the input file.
+        moof = build(base_offset + len(moof) + 8)
+    return moof + box(b"mdat", data)
+
+
+def parse(data, start=0, end=None):
+    end = len(data) if end is None else end
+    boxes = []
+    while start < end:
+        size, box_type = struct.unpack_from(">I4s", data, start)
+        boxes.append((box_type, start, start + size))
+        start += size
+    return boxes
+
+
+def test_mux_interleaves_fragments_by_time():
+    # Video at 90kHz with 2s fragments, audio at 48kHz with 1s fragments.
+    video = init_segment(1, 90000, b"vide")
+    video += box(b"sidx", bytes(24))
+    for i in range(2):
+        video += fragment(1, i + 1, i * 180000, b"V%d" % i * 100, base_offset=len(video))
+    audio = init_segment(1, 48000, b"soun")
+    for i in range(4):
+        audio += fragment(1, i + 1, i * 48000, b"A%d" % i * 50)
+    output = io.BytesIO()
+
+    mux(io.BytesIO(video), io.BytesIO(audio), output)
+
+    data = output.getvalue()
+    boxes = parse(data)
+    assert [b[0] for b in boxes[:2]] == [b"ftyp", b"moov"]
+    assert b"sidx" not in [b[0] for b in boxes]
+    moov = boxes[1]
+    traks = [b for b in parse(data, moov[1] + 8, moov[2]) if b[0] == b"trak"]
+    track_ids = []
+    for _, start, end in traks:
+        tkhd = parse(data, start + 8, end)[0]
+        track_ids.append(struct.unpack_from(">I", data, tkhd[1] + 20)[0])
+    assert track_ids == [1, 2]
+
+    mdats = []
+    for box_type, start, end in boxes[2:]:
+        if box_type == b"moof":
+            mfhd, traf = parse(data, start + 8, end)
+            sequence = struct.unpack_from(">I", data, mfhd[1] + 12)[0]
+            tfhd = parse(data, traf[1] + 8, traf[2])[0]
+            flags, track_id = struct.unpack_from(">II", data, tfhd[1] + 8)
+            if flags & 1:
+                # The rewritten absolute offset points at this fragment's mdat.
+                base = struct.unpack_from(">Q", data, tfhd[1] + 16)[0]
+                assert base == end + 8
+            mdats.append((sequence, track_id))
+        else:
+            assert box_type == b"mdat"
+            mdats[-1] += (data[start + 8:start + 10],)
+    assert mdats == [
+        (1, 1, b"V0"), (2, 2, b"A0"), (3, 2, b"A1"),
+        (4, 1, b"V1"), (5, 2, b"A2"), (6, 2, b"A3"),
+    ]
+
+
+def test_mux_rejects_unfragmented_input():
+    moov = box(b"moov", box(b"mvhd", full(), bytes(96)))
+    with pytest.raises(MuxError):
+        mux(io.BytesIO(moov), io.BytesIO(moov), io.BytesIO())
+
+
+def test_mux_streams(tmp_path):
+    video = init_segment(1, 90000, b"vide") + fragment(1, 1, 0, b"video")
+    audio = init_segment(1, 48000, b"soun") + fragment(1, 1, 0, b"audio")
+
+    def make_stream(content):
+        stream = MagicMock()
+
+        def stream_to_sinks(sinks):
+            for i in range(0, len(content), 7):
+                sinks[0].write(content[i:i + 7])
+            sinks[0].close()
+
+        stream.stream_to_sinks.side_effect = stream_to_sinks
+        return stream
+
+    expected = io.BytesIO()
+    mux(io.BytesIO(video), io.BytesIO(audio), expected)
+    file_path = str(tmp_path / "out.mp4")
+
+    assert mux_streams(make_stream(video), make_stream(audio), file_path) == file_path
+    with open(file_path, "rb") as fh:
+        assert fh.read() == expected.getvalue()
+
+
+def test_pipe_sink_read_and_abort():
+    pipe = PipeSink(depth=2)
+    pipe.write(b"abc")
+    assert pipe.read(2) == b"ab"
+    assert pipe.read(5) == b"c"
+    pipe.abort(OSError("lost"))
+    with pytest.raises(OSError):
+        pipe.read(1)
+    pipe.cancel()
+    with pytest.raises(BrokenPipeError):
+        pipe.write(b"x")
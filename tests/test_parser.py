@@ -2,7 +2,11 @@ import json
 import pytest
 
 from pytube.exceptions import HTMLParseError
-from pytube.parser import parse_for_object
+from pytube.parser import (
+    find_object_from_startpoint,
+    parse_for_object,
+    throttling_array_split,
+)
 
 
 def test_invalid_start():
@@ -56,3 +60,28 @@ def test_parse_object_requiring_ast():
     assert result == {
         'foo': 'bar'
     }
+
+
+def test_find_object_skips_strings_and_regexes():
+    js = r'x = {a: "}\"]", b: /[}]\//, c: [1] / 2, d: {e: "{"}}; y = {}'
+    start = js.index("{")
+    assert find_object_from_startpoint(js, start) == js[start:js.index(";")]
+
+
+def test_find_object_from_offset():
+    html = 'var a = [1, [2, "]"]]; var b = {};'
+    assert find_object_from_startpoint(html, 8) == '[1, [2, "]"]]'
+    with pytest.raises(HTMLParseError):
+        find_object_from_startpoint(html, 0)
+
+
+def test_throttling_array_split():
+    js_array = r'[null,function(d,e){d.push(e)},"a,b","c\",d",-5,function(){return [1,2]}]'
+    assert throttling_array_split(js_array) == [
+        "null",
+        "function(d,e){d.push(e)}",
+        '"a,b"',
+        r'"c\",d"',
+        "-5",
+        "function(){return [1,2]}",
+    ]
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from pytube.buffers import BufferPool
+from pytube.pipeline import WritePipeline
+
+
+def test_chunks_handled_in_order_on_writer_thread():
+    written = []
+    threads = set()
+
+    def handler(chunk, offset):
+        threads.add(threading.current_thread())
+        written.append((bytes(chunk), offset))
+
+    pool = BufferPool(buffer_size=4)
+    with WritePipeline(handler, depth=2, pool=pool) as pipeline:
+        reused = bytearray(b"abc")
+        pipeline.submit(reused)
+        reused[:] = b"def"
+        pipeline.submit(reused)
+        # Larger than a buffer: split across two.
+        pipeline.submit(b"ghijkl")
+        pipeline.submit(b"xy", offset=100)
+    assert written == [
+        (b"abc", 0), (b"def", 3), (b"ghij", 6), (b"kl", 10), (b"xy", 100)
+    ]
+    assert threading.current_thread() not in threads
+    assert pool.stats()["idle"] > 0
+
+
+def test_writer_error_is_raised_to_reader():
+    def handler(chunk, offset):
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        with WritePipeline(handler, depth=1, pool=BufferPool(4)) as pipeline:
+            for _ in range(100):
+                pipeline.submit(b"data")
+
+
+def test_reader_error_drains_queue():
+    written = []
+    with pytest.raises(ValueError):
+        with WritePipeline(lambda c, o: written.append(bytes(c))) as pipeline:
+            pipeline.submit(b"abc")
+            raise ValueError()
+    assert written == [b"abc"]
+
+
+def test_reader_blocks_while_queue_is_full():
+    release = threading.Event()
+    pipeline = WritePipeline(
+        lambda c, o: release.wait(), depth=1, pool=BufferPool(4)
+    )
+    pipeline.submit(b"a")  # taken by the writer, which blocks
+    pipeline.submit(b"b")  # fills the queue
+    submitted = threading.Event()
+    reader = threading.Thread(
+        target=lambda: (pipeline.submit(b"c"), submitted.set())
+    )
+    reader.start()
+    assert not submitted.wait(0.3)
+    release.set()
+    reader.join()
+    pipeline.close()
+    assert submitted.is_set()
+
+
+def test_non_buffer_chunks_are_rejected():
+    with WritePipeline(lambda chunk, offset: None, pool=BufferPool(4)) as pipeline:
+        with pytest.raises(TypeError):
+            pipeline.submit("text")
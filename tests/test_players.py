@@ -0,0 +1,175 @@
+import asyncio
+import gzip
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPMessage
+from unittest import mock
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+
+import pytest
+
+from pytube import players
+from pytube.cipher import Cipher
+
+JS_URL = "https://youtube.com/s/player/13371337/player_ias.vflset/en_US/base.js"
+
+
+def load_base_js():
+    path = os.path.join(os.path.dirname(__file__), "mocks", "base.js-2022-02-04.gz")
+    with gzip.open(path, "rb") as fh:
+        return fh.read().decode("utf-8")
+
+
+@mock.patch("pytube.players.request.get_if_modified")
+def test_get_js_is_stored(get_if_modified, tmp_path):
+    get_if_modified.return_value = ("js", {"etag": '"v1"'})
+    store = players.PlayerStore(str(tmp_path))
+    assert store.get_js(JS_URL) == "js"
+    # A second store, e.g. in another process, reads the same files.
+    assert players.PlayerStore(str(tmp_path)).get_js(JS_URL) == "js"
+    get_if_modified.assert_called_once_with(JS_URL)
+
+
+@mock.patch("pytube.players.request.get_if_modified")
+def test_get_js_revalidates(get_if_modified, tmp_path):
+    store = players.PlayerStore(str(tmp_path), max_age=0)
+    get_if_modified.return_value = ("js", {"etag": '"v1"', "last-modified": "then"})
+    store.get_js(JS_URL)
+
+    get_if_modified.return_value = (None, {})
+    assert store.get_js(JS_URL) == "js"
+    get_if_modified.assert_called_with(JS_URL, etag='"v1"', last_modified="then")
+
+    get_if_modified.return_value = ("new js", {})
+    assert store.get_js(JS_URL) == "new js"
+    assert store.load_js(JS_URL) == "new js"
+
+
+@mock.patch("pytube.players.Cipher")
+def test_get_cipher_reuses_stored_artifacts(mock_cipher, tmp_path):
+    mock_cipher.return_value.to_dict.return_value = {"version": 1}
+    store = players.PlayerStore(str(tmp_path))
+    store.get_cipher(JS_URL, "js")
+    mock_cipher.assert_called_once_with(js="js")
+
+    assert store.get_cipher(JS_URL, "js") is mock_cipher.from_dict.return_value
+    mock_cipher.from_dict.assert_called_once_with({"version": 1})
+    assert store.load_js(JS_URL) == "js"
+
+    # A different copy of the js is parsed again.
+    store.get_cipher(JS_URL, "other js")
+    assert mock_cipher.call_count == 2
+
+    store.invalidate(JS_URL)
+    assert store.load_js(JS_URL) is None
+
+
+def test_cipher_round_trip():
+    js = load_base_js()
+    cipher = Cipher(js=js)
+    data = json.loads(json.dumps(cipher.to_dict()))
+    restored = Cipher.from_dict(data)
+    signature = "abcdefghijklmnopqrstuvwxyz0123456789ABCDEFGHIJ"
+    assert restored.get_signature(signature) == cipher.get_signature(signature)
+    assert restored.calculate_n(list("abcdefgh")) == cipher.calculate_n(list("abcdefgh"))
+
+
+@mock.patch("pytube.request._execute_request")
+def test_get_if_modified_not_modified(execute_request):
+    from pytube import request
+
+    headers = HTTPMessage()
+    headers["ETag"] = "x"
+    execute_request.side_effect = HTTPError(JS_URL, 304, "Not Modified", headers, None)
+    assert request.get_if_modified(JS_URL, etag="x") == (None, {"etag": "x"})
+    assert execute_request.call_args[1]["headers"] == {"If-None-Match": "x"}
+
+
+def test_player_cache_fetches_once_per_version():
+    release = threading.Event()
+    store = MagicMock()
+
+    def get_js(js_url):
+        release.wait(5)
+        return "js of " + js_url
+
+    store.get_js.side_effect = get_js
+    cache = players.PlayerCache(store=store)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(cache.js, url) for url in ["a", "b"] * 4]
+        release.set()
+        results = [f.result() for f in futures]
+    assert results == ["js of a", "js of b"] * 4
+    assert sorted(c[0][0] for c in store.get_js.call_args_list) == ["a", "b"]
+
+
+def test_player_cache_evicts_least_recently_used():
+    store = MagicMock()
+    store.get_js.side_effect = lambda js_url: js_url
+    cache = players.PlayerCache(maxsize=2, store=store)
+    cache.js("a")
+    cache.js("b")
+    cache.js("a")
+    cache.js("c")
+    assert cache.cached_js("a") == "a"
+    assert cache.cached_js("b") is None
+    assert store.get_js.call_count == 3
+
+
+def test_player_cache_retries_after_failure():
+    store = MagicMock()
+    store.get_js.side_effect = [OSError("offline"), "js"]
+    cache = players.PlayerCache(store=store)
+    with pytest.raises(OSError):
+        cache.js("a")
+    assert cache.js("a") == "js"
+
+
+def test_player_cache_shares_cipher():
+    store = MagicMock()
+    store.get_cipher.return_value = Cipher(js=load_base_js())
+    cache = players.PlayerCache(store=store)
+    first = cache.cipher(JS_URL, "js")
+    second = cache.cipher(JS_URL)
+    assert first is second
+    store.get_cipher.assert_called_once_with(JS_URL, "js")
+    assert not store.get_js.called
+
+
+def test_player_cache_invalidate_keeps_refetched_player():
+    store = MagicMock()
+    store.get_js.side_effect = ["old", "new"]
+    cache = players.PlayerCache(store=store)
+    cache.js("a")
+    cache.invalidate("a", "old")
+    assert cache.js("a") == "new"
+    # A video still holding the old js doesn't drop the new one.
+    cache.invalidate("a", "old")
+    assert cache.cached_js("a") == "new"
+    store.invalidate.assert_called_once_with("a")
+
+
+def test_store_reads_and_writes_off_the_event_loop(tmp_path):
+    store = players.PlayerStore(str(tmp_path))
+    threads = []
+    load_js, store_js = store.load_js, store.store_js
+
+    def record(fn):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return fn(*args, **kwargs)
+        return wrapper
+
+    async def roundtrip():
+        await store.astore_js(JS_URL, "js")
+        return await store.aload_js(JS_URL, fresh=True), threading.get_ident()
+
+    with mock.patch.object(store, "load_js", record(load_js)), \
+            mock.patch.object(store, "store_js", record(store_js)):
+        js, loop_thread = asyncio.run(roundtrip())
+    assert js == "js"
+    assert len(threads) == 2
+    assert loop_thread not in threads
@@ -0,0 +1,75 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import Request, build_opener
+
+import pytest
+
+from pytube.pool import ConnectionPool, KeepAliveHTTPHandler
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        body = b"x" * 1024
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Length", "1024")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_reused_after_body_read(server_url):
+    pool = ConnectionPool()
+    opener = build_opener(KeepAliveHTTPHandler(pool))
+    for _ in range(3):
+        assert len(opener.open(server_url).read()) == 1024
+    stats = pool.stats()
+    assert stats["requests"] == 3
+    assert stats["created"] == 1
+    assert stats["reused"] == 2
+
+
+def test_connection_reused_after_head(server_url):
+    pool = ConnectionPool()
+    opener = build_opener(KeepAliveHTTPHandler(pool))
+    opener.open(Request(server_url, method="HEAD")).close()
+    opener.open(server_url).read()
+    assert pool.stats()["reused"] == 1
+
+
+def test_connection_discarded_when_closed_early(server_url):
+    pool = ConnectionPool()
+    opener = build_opener(KeepAliveHTTPHandler(pool))
+    response = opener.open(server_url)
+    response.read(10)
+    response.close()
+    opener.open(server_url).read()
+    stats = pool.stats()
+    assert stats["created"] == 2
+    assert stats["discarded"] == 1
+
+
+def test_idle_connections_expire(server_url):
+    pool = ConnectionPool(idle_timeout=-1)
+    opener = build_opener(KeepAliveHTTPHandler(pool))
+    opener.open(server_url).read()
+    opener.open(server_url).read()
+    assert pool.stats()["reused"] == 0
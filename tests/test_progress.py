@@ -0,0 +1,81 @@
+from unittest import mock
+from unittest.mock import MagicMock
+
+from pytube.progress import ProgressBus
+
+
+@mock.patch("pytube.progress.time.monotonic")
+def test_events_are_coalesced(monotonic):
+    monotonic.return_value = 100.0
+    bus = ProgressBus(interval=1.0)
+    events = []
+    bus.subscribe(events.append)
+    task = bus.task("video", total=1000)
+
+    task.advance(100)
+    task.advance(100)
+    task.advance(100)
+    assert [e.progress() for e in events] == [(100, 1000)]
+
+    monotonic.return_value = 101.0
+    task.advance(100)
+    assert [e.progress() for e in events] == [(100, 1000), (400, 1000)]
+
+    # Finishing is delivered straight away.
+    task.finish()
+    assert events[-1].tasks[0].done
+    assert len(events) == 3
+
+
+def test_min_bytes():
+    bus = ProgressBus(interval=0, min_bytes=500)
+    events = []
+    bus.subscribe(events.append)
+    task = bus.task("video")
+    task.advance(400)
+    assert events == []
+    task.advance(100)
+    assert events[0].progress() == (500, None)
+
+
+def test_aggregate_progress_per_job():
+    bus = ProgressBus(interval=0)
+    events = []
+    bus.subscribe(events.append)
+    bus.task("video", total=300, job="a").update(150)
+    bus.task("audio", total=100, job="a").update(50)
+    bus.task("other", total=1000, job="b").update(10)
+
+    event = events[-1]
+    assert event.progress("a") == (200, 400)
+    assert event.fraction("a") == 0.5
+    assert event.progress() == (210, 1400)
+    assert event.jobs(changed=True) == ["b"]
+
+    bus.remove("a")
+    bus.task("other").advance(10)
+    assert [t.name for t in events[-1].tasks] == ["other"]
+
+
+def test_failing_subscriber_does_not_stop_others():
+    bus = ProgressBus(interval=0)
+    received = []
+    bus.subscribe(MagicMock(side_effect=ValueError))
+    unsubscribe = bus.subscribe(received.append)
+    bus.task("video").advance(1)
+    assert len(received) == 1
+    unsubscribe()
+    bus.task("video").advance(1)
+    assert len(received) == 1
+
+
+def test_stream_callbacks():
+    bus = ProgressBus(interval=0)
+    events = []
+    bus.subscribe(events.append)
+    stream = MagicMock(filesize=100, type="audio", resolution=None, abr="128kbps")
+    bus.on_progress(stream, b"", 40)
+    bus.on_complete(stream, None)
+    task = events[-1].tasks[0]
+    assert task.label == "audio 128kbps"
+    assert (task.received, task.total, task.done) == (60, 100, True)
@@ -1,11 +1,18 @@
+import gzip
+import http.client
+import io
 import socket
 import os
 import pytest
 from unittest import mock
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qsl, urlsplit
 
 from pytube import request
+from pytube.buffers import BufferPool
+from pytube.cache import ExpiringCache
 from pytube.exceptions import MaxRetriesExceeded
+from pytube.retry import RetryPolicy
 
 
 @mock.patch("pytube.request.urlopen")
@@ -55,6 +62,264 @@ def test_get(mock_urlopen):
     assert response == "<html></html>"
 
 
+@mock.patch("pytube.request.urlopen")
+def test_get_decompresses_gzip(mock_urlopen):
+    body = gzip.compress(b"<html></html>")
+    response = mock.Mock()
+    response.read.side_effect = [body, b""]
+    response.info.return_value = {"Content-Encoding": "gzip"}
+    mock_urlopen.return_value = response
+    assert request.get("http://fakeassurl.gov") == "<html></html>"
+    sent = mock_urlopen.call_args[0][0]
+    assert "gzip" in sent.get_header("Accept-encoding")
+
+
 def test_get_non_http():
     with pytest.raises(ValueError):  # noqa: PT011
         request.get("file://bad")
+
+
+@mock.patch("pytube.request.urlopen")
+def test_range_stream(mock_urlopen):
+    mock_response = mock.Mock()
+    mock_response.read.side_effect = [b"a" * 4, None, b"b" * 2, None]
+    mock_urlopen.return_value = mock_response
+    fixed_sizer = request.RangeSizer(range_size=4, minimum=4, maximum=4)
+    with mock.patch("pytube.request.RangeSizer", return_value=fixed_sizer):
+        chunks = list(request.range_stream("http://fakeassurl.gov/?a=1", 10, 15))
+    assert b"".join(chunks) == b"aaaabb"
+    requested = [call[0][0].full_url for call in mock_urlopen.call_args_list]
+    assert requested == [
+        "http://fakeassurl.gov/?a=1&range=10-13",
+        "http://fakeassurl.gov/?a=1&range=14-15",
+    ]
+
+
+@mock.patch("pytube.retry.time.sleep")
+@mock.patch("pytube.request.urlopen")
+def test_range_stream_resumes_after_last_byte(mock_urlopen, mock_sleep):
+    first = mock.Mock()
+    first.read.side_effect = [b"a" * 3, http.client.IncompleteRead(b"")]
+    second = mock.Mock()
+    second.read.side_effect = [b"b" * 3, None]
+    mock_urlopen.side_effect = [first, second]
+    policy = RetryPolicy(max_retries=1, backoff=0.5)
+    chunks = list(request.range_stream(
+        "http://fakeassurl.gov/?a=1", 0, 5, retry_policy=policy
+    ))
+    assert b"".join(chunks) == b"aaabbb"
+    requested = [call[0][0].full_url for call in mock_urlopen.call_args_list]
+    assert requested == [
+        "http://fakeassurl.gov/?a=1&range=0-5",
+        "http://fakeassurl.gov/?a=1&range=3-5",
+    ]
+    assert first.close.called
+    assert 0.25 <= mock_sleep.call_args[0][0] <= 0.5
+
+
+class _DroppedResponse:
+    """Serves ``available`` bytes of ``body``, then fails like a dropped connection."""
+
+    def __init__(self, body, available):
+        self.body = body
+        self.available = available
+        self.position = 0
+        self.closed = False
+
+    def read(self, amt=None):
+        end = self.available if amt is None else min(self.position + amt, self.available)
+        chunk = self.body[self.position:end]
+        self.position = end
+        if amt is None or not chunk:
+            if self.position < len(self.body):
+                raise http.client.IncompleteRead(chunk)
+        return chunk
+
+    def info(self):
+        return {}
+
+    def close(self):
+        self.closed = True
+
+
+@mock.patch("pytube.retry.time.sleep")
+@mock.patch("pytube.request.urlopen")
+def test_range_stream_resumes_without_rate_limit(mock_urlopen, mock_sleep):
+    body = bytes(range(256)) * 1024
+    first = _DroppedResponse(body, available=150000)
+    second = _DroppedResponse(body[150000:], available=len(body))
+    mock_urlopen.side_effect = [first, second]
+    chunks = list(request.range_stream(
+        "http://fakeassurl.gov/?a=1", 0, len(body) - 1,
+        retry_policy=RetryPolicy(max_retries=1),
+    ))
+    assert b"".join(chunks) == body
+    requested = [call[0][0].full_url for call in mock_urlopen.call_args_list]
+    assert requested[1] == f"http://fakeassurl.gov/?a=1&range=150000-{len(body) - 1}"
+    assert first.closed
+
+
+@mock.patch("pytube.retry.time.sleep")
+@mock.patch("pytube.request.urlopen")
+def test_head_with_retry_policy(mock_urlopen, mock_sleep):
+    response = mock.Mock()
+    response.info.return_value = {"content-length": "16384"}
+    mock_urlopen.side_effect = [URLError(socket.timeout()), response]
+    headers = request.head("http://fakeassurl.gov", RetryPolicy(max_retries=1))
+    assert headers == {"content-length": "16384"}
+    assert mock_sleep.call_count == 1
+
+
+class _BodyResponse(io.BytesIO):
+    def info(self):
+        return {"Content-Range": f"bytes 0-{len(self.getvalue()) - 1}/{len(self.getvalue())}"}
+
+
+@mock.patch("pytube.request.urlopen")
+def test_streaming_zero_copy(mock_urlopen):
+    content = os.urandom(3 * 1024)
+    mock_urlopen.return_value = _BodyResponse(content)
+    pool = BufferPool(buffer_size=1024)
+    with mock.patch("pytube.request.buffer_pool", pool):
+        chunks = []
+        for chunk in request.stream("http://fakeassurl.gov/?a=1", zero_copy=True):
+            assert isinstance(chunk, memoryview)
+            assert len(chunk) <= 1024
+            chunks.append(bytes(chunk))
+    assert b"".join(chunks) == content
+    # A single buffer served every read and went back to the pool.
+    assert pool.stats() == {"created": 1, "reused": 0, "idle": 1}
+
+
+def test_buffer_pool_reuses_buffers():
+    pool = BufferPool(buffer_size=16, max_idle=1)
+    first = pool.acquire()
+    second = pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert pool.acquire() is first
+    assert pool.stats() == {"created": 2, "reused": 1, "idle": 0}
+
+
+@mock.patch("pytube.request.urlopen")
+def test_streaming_size_from_clen(mock_urlopen):
+    mock_response = mock.Mock()
+    mock_response.read.side_effect = [b"a" * 10, None]
+    mock_response.info.return_value = {}
+    mock_urlopen.return_value = mock_response
+    chunks = list(request.stream("http://fakeassurl.gov/?clen=10"))
+    assert b"".join(chunks) == b"a" * 10
+    # The size is known from the url, so no probing request is made.
+    assert mock_urlopen.call_count == 1
+
+
+@mock.patch("pytube.request.urlopen")
+def test_streaming_stops_on_short_range(mock_urlopen):
+    mock_response = mock.Mock()
+    mock_response.read.side_effect = [b"a" * 4, None, b"b" * 2, None]
+    mock_response.info.return_value = {}
+    mock_urlopen.return_value = mock_response
+    fixed_sizer = request.RangeSizer(range_size=4, minimum=4, maximum=4)
+    with mock.patch("pytube.request.RangeSizer", return_value=fixed_sizer):
+        chunks = list(request.stream("http://fakeassurl.gov/?a=1"))
+    assert b"".join(chunks) == b"aaaabb"
+    assert mock_urlopen.call_count == 2
+
+
+@mock.patch("pytube.request.urlopen")
+def test_streaming_unknown_size_ends_on_416(mock_urlopen):
+    mock_response = mock.Mock()
+    mock_response.read.side_effect = [b"abcd", None]
+    mock_response.info.return_value = {}
+    mock_urlopen.side_effect = [
+        mock_response,
+        HTTPError("http://fakeassurl.gov/?a=1", 416, "Range Not Satisfiable", {}, None),
+    ]
+    fixed_sizer = request.RangeSizer(range_size=4, minimum=4, maximum=4)
+    with mock.patch("pytube.request.RangeSizer", return_value=fixed_sizer):
+        chunks = list(request.stream("http://fakeassurl.gov/?a=1"))
+    assert b"".join(chunks) == b"abcd"
+    assert mock_urlopen.call_count == 2
+
+
+def test_range_sizer_grows_on_fast_links():
+    sizer = request.RangeSizer(range_size=2 * 1024 * 1024, maximum=64 * 1024 * 1024)
+    # 2MB transferred in 0.1s after a 0.05s time-to-first-byte.
+    assert sizer.record(2 * 1024 * 1024, 0.05, 0.15) == 4 * 1024 * 1024
+
+
+def test_range_sizer_shrinks_on_slow_links():
+    sizer = request.RangeSizer(range_size=8 * 1024 * 1024)
+    # 8MB transferred in 80s.
+    assert sizer.record(8 * 1024 * 1024, 0.05, 80.05) == 4 * 1024 * 1024
+
+
+def test_range_sizer_respects_bounds():
+    sizer = request.RangeSizer(range_size=1024, minimum=512, maximum=2048)
+    assert sizer.range_size == 1024
+    assert sizer.record(1024, 0.01, 0.011) == 2048
+    assert sizer.record(1024, 0.01, 0.011) == 2048
+
+
+def test_segment_count_parser_across_chunks():
+    parser = request.SegmentCountParser()
+    assert parser.feed(b"x" * 100 + b"Segment-Co") is None
+    assert parser.feed(b"unt: 12") is None
+    assert parser.feed(b"\r\nrest" + b"y" * 100) == 12
+
+
+def test_segment_count_parser_at_end():
+    parser = request.SegmentCountParser()
+    parser.feed(b"Raw_data\r\nSegment-Count: 3")
+    assert parser.close() == 3
+
+
+def test_seq_stream_yields_segments_in_order():
+    segments = {0: [b"Raw_data\r\nSegment-Count: 5\r\n"]}
+    segments.update({n: [str(n).encode() * 3] for n in range(1, 6)})
+
+    def fake_stream(url, **kwargs):
+        seq_num = int(dict(parse_qsl(urlsplit(url).query))["sq"])
+        return iter(segments[seq_num])
+
+    with mock.patch("pytube.request.stream", side_effect=fake_stream):
+        chunks = list(request.seq_stream("http://fakeassurl.gov/?a=1", max_workers=3))
+    assert chunks == [segments[n][0] for n in range(6)]
+
+
+@mock.patch("pytube.request.head")
+@mock.patch("pytube.request.urlopen")
+def test_seq_filesize(mock_urlopen, mock_head):
+    header = b"Raw_data\r\nSegment-Count: 3\r\n"
+    mock_response = mock.Mock()
+    mock_response.read.side_effect = [header, b""]
+    mock_urlopen.return_value = mock_response
+    mock_head.return_value = {"content-length": "10"}
+    assert request.seq_filesize("http://fakeassurl.gov/?seq=1") == len(header) + 30
+    assert mock_head.call_count == 3
+
+
+@mock.patch("pytube.request.head")
+def test_filesize_cached_per_video_and_itag(mock_head):
+    mock_head.return_value = {"content-length": "1234"}
+    cache = ExpiringCache()
+    with mock.patch("pytube.request.filesize_cache", cache):
+        first = "http://fakeassurl.gov/?id=abc&itag=18&sig=1"
+        second = "http://fakeassurl.gov/?id=abc&itag=18&sig=2"
+        assert request.filesize(first) == 1234
+        assert request.filesize(second) == 1234
+        assert request.filesize(second, key=("video", 18)) == 1234
+    assert mock_head.call_count == 2
+    assert cache.stats()["hits"] == 1
+
+
+@mock.patch("pytube.request.head")
+def test_filesize_cache_honours_expire(mock_head):
+    mock_head.return_value = {"content-length": "1234"}
+    cache = ExpiringCache()
+    with mock.patch("pytube.request.filesize_cache", cache):
+        url = "http://fakeassurl.gov/?id=abc&itag=18&expire=1"
+        request.filesize(url)
+        request.filesize(url)
+    assert mock_head.call_count == 2
+    assert cache.expirations == 1
@@ -0,0 +1,82 @@
+import asyncio
+import http.client
+import socket
+from unittest import mock
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+from pytube.exceptions import MaxRetriesExceeded
+from pytube.retry import RetryPolicy
+
+
+def test_retries_for_error_classes():
+    policy = RetryPolicy(max_retries=3, rules={socket.timeout: None, ConnectionError: 1})
+    assert policy.retries_for(socket.timeout()) == 3
+    assert policy.retries_for(URLError(socket.timeout())) == 3
+    assert policy.retries_for(ConnectionResetError()) == 1
+    assert policy.retries_for(http.client.IncompleteRead(b"")) is None
+    assert policy.retries_for(ValueError()) is None
+
+
+def test_retries_for_http_status():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.retries_for(HTTPError("", 503, "", {}, None)) == 2
+    assert policy.retries_for(HTTPError("", 404, "", {}, None)) is None
+
+
+def test_delay_backs_off_with_jitter():
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=0.5)
+    for attempt, ceiling in [(0, 1), (1, 2), (2, 4), (5, 5)]:
+        delay = policy.delay(attempt)
+        assert ceiling / 2 <= delay <= ceiling
+
+
+@mock.patch("pytube.retry.time.sleep")
+def test_call_retries_until_success(mock_sleep):
+    fn = mock.Mock(side_effect=[socket.timeout(), socket.timeout(), "ok"])
+    assert RetryPolicy(max_retries=2).call(fn) == "ok"
+    assert mock_sleep.call_count == 2
+
+
+@mock.patch("pytube.retry.time.sleep")
+def test_call_gives_up(mock_sleep):
+    fn = mock.Mock(side_effect=socket.timeout())
+    with pytest.raises(MaxRetriesExceeded):
+        RetryPolicy(max_retries=2).call(fn)
+    assert fn.call_count == 3
+
+    fn = mock.Mock(side_effect=HTTPError("", 503, "", {}, None))
+    with pytest.raises(HTTPError):
+        RetryPolicy(max_retries=1).call(fn)
+    assert fn.call_count == 2
+
+
+def test_call_raises_errors_that_are_not_retryable():
+    fn = mock.Mock(side_effect=HTTPError("", 404, "", {}, None))
+    with pytest.raises(HTTPError):
+        RetryPolicy(max_retries=5).call(fn)
+    assert fn.call_count == 1
+
+
+@mock.patch("pytube.retry.time.sleep")
+def test_connection_errors_are_raised_unchanged_without_retries(mock_sleep):
+    error = URLError(ConnectionRefusedError("refused"))
+    fn = mock.Mock(side_effect=error)
+    with pytest.raises(URLError):
+        RetryPolicy().call(fn)
+    assert fn.call_count == 1
+
+    with pytest.raises(MaxRetriesExceeded):
+        RetryPolicy(max_retries=1).call(fn)
+    assert fn.call_count == 3
+
+
+@mock.patch("pytube.retry.time.sleep")
+def test_acheck_waits_without_blocking(mock_sleep):
+    policy = RetryPolicy(max_retries=1, backoff=0)
+    assert policy.retries_for(asyncio.TimeoutError()) == 1
+    asyncio.run(policy.acheck(asyncio.TimeoutError(), 0))
+    with pytest.raises(MaxRetriesExceeded):
+        asyncio.run(policy.acheck(asyncio.TimeoutError(), 1))
+    assert not mock_sleep.called
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from pytube.scheduler import BandwidthScheduler
+
+
+def test_unlimited_consume_does_not_block():
+    scheduler = BandwidthScheduler()
+    assert scheduler.read_size is None
+    with scheduler.job(name="a") as job:
+        job.consume(10 ** 9)
+        assert scheduler.stats()["jobs"][0]["transferred"] == 10 ** 9
+    assert scheduler.stats()["jobs"] == []
+
+
+def test_job_weight_must_be_positive():
+    with pytest.raises(ValueError):
+        BandwidthScheduler().job(weight=0)
+
+
+def test_rate_limit():
+    scheduler = BandwidthScheduler(rate=100000, burst=10000)
+    job = scheduler.job()
+    started = time.monotonic()
+    for _ in range(6):
+        job.consume(10000)
+    # The burst covers the first chunk, the other 50000 bytes take ~0.5s.
+    assert time.monotonic() - started >= 0.4
+
+
+def test_jobs_share_bandwidth_fairly():
+    scheduler = BandwidthScheduler(rate=4 * 1024 * 1024, burst=16384, quantum=16384)
+    large = scheduler.job(name="large")
+    small = scheduler.job(name="small")
+    deadline = time.monotonic() + 0.5
+
+    def transfer(job):
+        while time.monotonic() < deadline:
+            job.consume(scheduler.quantum)
+
+    # The large job uses four connections, the small one a single one.
+    threads = [threading.Thread(target=transfer, args=(large,)) for _ in range(4)]
+    threads.append(threading.Thread(target=transfer, args=(small,)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = large.transferred + small.transferred
+    assert small.transferred >= 0.35 * total
+
+
+def test_connections_per_host_are_capped():
+    scheduler = BandwidthScheduler(max_connections_per_host=2)
+    large = scheduler.job(name="large")
+    small = scheduler.job(name="small")
+    order = []
+
+    first = large.connection("example.com")
+    second = large.connection("example.com")
+    first.__enter__()
+    second.__enter__()
+
+    def connect(job):
+        with job.connection("example.com"):
+            order.append(job.name)
+
+    waiting_large = threading.Thread(target=connect, args=(large,))
+    waiting_large.start()
+    time.sleep(0.05)
+    waiting_small = threading.Thread(target=connect, args=(small,))
+    waiting_small.start()
+    time.sleep(0.05)
+    assert order == []
+    assert scheduler.stats()["connections"] == {"example.com": 2}
+
+    # The freed slot goes to the job with fewer open connections.
+    first.__exit__(None, None, None)
+    waiting_small.join(1)
+    second.__exit__(None, None, None)
+    waiting_large.join(1)
+    assert order == ["small", "large"]
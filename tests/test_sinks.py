@@ -0,0 +1,51 @@
+import os
+from unittest.mock import MagicMock
+
+from pytube.sinks import BackgroundSink, FileSink, MemorySink, Tee, feed_file
+
+
+def test_tee_detaches_failing_sink():
+    good = MagicMock()
+    bad = MagicMock()
+    bad.write.side_effect = OSError("upload failed")
+    tee = Tee([bad, good])
+    tee.write(b"a")
+    tee.write(b"b")
+    tee.close()
+    assert good.write.call_count == 2
+    good.close.assert_called_once()
+    assert bad.write.call_count == 1
+    bad.abort.assert_called_once()
+    assert isinstance(tee.errors[bad], OSError)
+
+
+def test_memory_sink_limit():
+    sink = MemorySink(limit=4)
+    sink.write(b"abc")
+    sink.write(b"de")
+    sink.close()
+    assert sink.overflowed
+    assert not sink.complete
+    assert sink.getvalue() == b""
+
+
+def test_background_sink_writes_in_order(tmp_path):
+    path = str(tmp_path / "out")
+    sink = BackgroundSink(FileSink(path), depth=1)
+    reused = bytearray(3)
+    for i in range(50):
+        reused[:] = bytes([i]) * 3
+        sink.write(reused)
+    sink.close()
+    with open(path, "rb") as fh:
+        assert fh.read() == b"".join(bytes([i]) * 3 for i in range(50))
+
+
+def test_feed_file(tmp_path):
+    path = tmp_path / "in"
+    content = os.urandom(1000)
+    path.write_bytes(content)
+    sink = MemorySink()
+    feed_file(str(path), sink, chunk_size=64)
+    assert sink.complete
+    assert sink.getvalue() == content
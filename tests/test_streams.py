@@ -1,5 +1,9 @@
+import asyncio
+import hashlib
+import json
 import os
 import random
+import socket
 import pytest
 from datetime import datetime
 from unittest import mock
@@ -7,6 +11,8 @@ from unittest.mock import MagicMock, Mock
 from urllib.error import HTTPError
 
 from pytube import request, Stream
+from pytube.monostate import Monostate
+from pytube.sinks import HashSink, MemorySink
 
 
 @mock.patch("pytube.streams.request")
@@ -123,8 +129,9 @@ def test_views(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024)).encode()])),
 )
+@mock.patch("pytube.streams.os.replace", MagicMock())
 def test_download(cipher_signature):
     with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
         stream = cipher_signature.streams[0]
@@ -136,9 +143,10 @@ def test_download(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024)).encode()])),
 )
 @mock.patch("pytube.streams.target_directory", MagicMock(return_value="/target"))
+@mock.patch("pytube.streams.os.replace", MagicMock())
 def test_download_with_prefix(cipher_signature):
     with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
         stream = cipher_signature.streams[0]
@@ -154,9 +162,10 @@ def test_download_with_prefix(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024)).encode()])),
 )
 @mock.patch("pytube.streams.target_directory", MagicMock(return_value="/target"))
+@mock.patch("pytube.streams.os.replace", MagicMock())
 def test_download_with_filename(cipher_signature):
     with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
         stream = cipher_signature.streams[0]
@@ -172,7 +181,7 @@ def test_download_with_filename(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024)).encode()])),
 )
 @mock.patch("pytube.streams.target_directory", MagicMock(return_value="/target"))
 @mock.patch("os.path.isfile", MagicMock(return_value=True))
@@ -193,10 +202,11 @@ def test_download_with_existing(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024)).encode()])),
 )
 @mock.patch("pytube.streams.target_directory", MagicMock(return_value="/target"))
 @mock.patch("os.path.isfile", MagicMock(return_value=True))
+@mock.patch("pytube.streams.os.replace", MagicMock())
 def test_download_with_existing_no_skip(cipher_signature):
     with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
         stream = cipher_signature.streams[0]
@@ -224,8 +234,9 @@ def test_progressive_streams_return_includes_video_track(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024)).encode()])),
 )
+@mock.patch("pytube.streams.os.replace", MagicMock())
 def test_on_progress_hook(cipher_signature):
     callback_fn = mock.MagicMock()
     cipher_signature.register_on_progress_callback(callback_fn)
@@ -245,8 +256,9 @@ def test_on_progress_hook(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024)).encode()])),
 )
+@mock.patch("pytube.streams.os.replace", MagicMock())
 def test_on_complete_hook(cipher_signature):
     callback_fn = mock.MagicMock()
     cipher_signature.register_on_complete_callback(callback_fn)
@@ -311,7 +323,9 @@ def test_repr_for_adaptive_streams(cipher_signature):
 
 def test_segmented_stream_on_404(cipher_signature):
     stream = cipher_signature.streams.filter(adaptive=True)[0]
-    with mock.patch('pytube.request.head') as mock_head:
+    with mock.patch('pytube.request.head') as mock_head, \
+            mock.patch('pytube.request.default_segment_workers', 1), \
+            mock.patch('pytube.streams.os.replace'):
         with mock.patch('pytube.request.urlopen') as mock_url_open:
             # Mock the responses to YouTube
             mock_url_open_object = mock.Mock()
@@ -345,7 +359,7 @@ def test_segmented_stream_on_404(cipher_signature):
 
             # Handle filesize requests
             mock_head.side_effect = [
-                HTTPError('', 404, 'Not Found', '', ''),
+                HTTPError('', 404, 'Not Found', {}, None),
                 *response_headers[1:],
             ]
 
@@ -360,7 +374,7 @@ def test_segmented_stream_on_404(cipher_signature):
 
             # This handles the HEAD requests to get content-length
             mock_url_open_object.info.side_effect = [
-                HTTPError('', 404, 'Not Found', '', ''),
+                HTTPError('', 404, 'Not Found', {}, None),
                 *response_headers
             ]
 
@@ -375,13 +389,186 @@ def test_segmented_stream_on_404(cipher_signature):
                     full_content += b''.join(args)
 
                 assert full_content == joined_responses
-                mock_open.assert_called_once_with(fp, 'wb')
+                mock_open.assert_called_once_with(fp + '.part', 'wb')
 
 
 def test_segmented_only_catches_404(cipher_signature):
     stream = cipher_signature.streams.filter(adaptive=True)[0]
     with mock.patch('pytube.request.stream') as mock_stream:
-        mock_stream.side_effect = HTTPError('', 403, 'Forbidden', '', '')
+        mock_stream.side_effect = HTTPError('', 403, 'Forbidden', {}, None)
         with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
             with pytest.raises(HTTPError):
                 stream.download()
+
+
+def _make_stream(content_length, monostate=None):
+    return Stream(
+        stream={
+            "url": "http://fakeassurl.gov/videoplayback?expire=1",
+            "itag": "18",
+            "mimeType": 'video/mp4; codecs="avc1.42001E, mp4a.40.2"',
+            "is_otf": False,
+            "bitrate": None,
+            "contentLength": str(content_length),
+        },
+        monostate=monostate or Monostate(on_progress=None, on_complete=None),
+    )
+
+
+def test_download_parallel_ranges(tmp_path):
+    content = os.urandom(10 * 1024)
+    on_progress = MagicMock()
+    stream = _make_stream(len(content), Monostate(on_progress, None))
+
+    def fake_range_stream(url, start, stop, **kwargs):
+        yield content[start:stop + 1]
+
+    with mock.patch("pytube.streams.request.range_stream", side_effect=fake_range_stream):
+        file_path = stream.download(
+            output_path=str(tmp_path), filename="out.mp4", max_workers=4
+        )
+
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    assert on_progress.call_count == 4
+    assert min(call[0][2] for call in on_progress.call_args_list) == 0
+
+
+def test_adownload(tmp_path):
+    content = os.urandom(4 * 1024)
+    stream = _make_stream(len(content))
+
+    async def fake_astream(url, **kwargs):
+        yield content[:1024]
+        yield content[1024:]
+
+    with mock.patch("pytube.streams.request.astream", side_effect=fake_astream):
+        file_path = asyncio.run(
+            stream.adownload(output_path=str(tmp_path), filename="out.mp4")
+        )
+
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+
+
+def test_download_resumes_from_journal(tmp_path):
+    content = os.urandom(8 * 1024)
+    stream = _make_stream(len(content))
+    requested = []
+
+    def failing_stream(url, **kwargs):
+        yield content[:3 * 1024]
+        raise socket.timeout()
+
+    def fake_range_stream(url, start, stop, **kwargs):
+        requested.append((start, stop))
+        yield content[start:stop + 1]
+
+    kwargs = dict(output_path=str(tmp_path), filename="out.mp4")
+    with mock.patch("pytube.streams.request.stream", side_effect=failing_stream):
+        with pytest.raises(socket.timeout):
+            stream.download(**kwargs)
+    assert sorted(os.listdir(tmp_path)) == ["out.mp4.part", "out.mp4.part.json"]
+
+    with mock.patch("pytube.streams.request.range_stream", side_effect=fake_range_stream):
+        file_path = stream.download(**kwargs)
+
+    assert requested == [(3 * 1024, len(content) - 1)]
+    assert os.listdir(tmp_path) == ["out.mp4"]
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+
+
+def test_download_ignores_journal_of_other_stream(tmp_path):
+    content = os.urandom(4 * 1024)
+    part_file = tmp_path / "out.mp4.part"
+    part_file.write_bytes(b"\0" * len(content))
+    (tmp_path / "out.mp4.part.json").write_text(json.dumps({
+        "file_size": len(content),
+        "identity": {"itag": 22, "id": None},
+        "ranges": [[0, 1023]],
+    }))
+    stream = _make_stream(len(content))
+
+    with mock.patch("pytube.streams.request.stream", return_value=iter([content])):
+        file_path = stream.download(output_path=str(tmp_path), filename="out.mp4")
+
+    assert os.listdir(tmp_path) == ["out.mp4"]
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+
+
+def test_download_tees_to_sinks(tmp_path):
+    content = os.urandom(600 * 1024)
+    stream = _make_stream(len(content))
+    hash_sink = HashSink()
+    memory_sink = MemorySink()
+
+    chunks = [content[i:i + 100 * 1024] for i in range(0, len(content), 100 * 1024)]
+    with mock.patch("pytube.streams.request.stream", return_value=iter(chunks)):
+        # Parallel ranges would deliver bytes out of order; sinks need them in order.
+        file_path = stream.download(
+            output_path=str(tmp_path), filename="out.mp4", max_workers=4,
+            sinks=[hash_sink, memory_sink]
+        )
+
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    assert memory_sink.complete
+    assert memory_sink.getvalue() == content
+    assert hash_sink.hexdigest() == hashlib.sha256(content).hexdigest()
+
+
+def test_download_aborts_sinks_on_failure(tmp_path):
+    stream = _make_stream(4096)
+    sink = MagicMock()
+
+    def failing_stream(url, **kwargs):
+        yield b"\0" * 1024
+        raise socket.timeout()
+
+    with mock.patch("pytube.streams.request.stream", side_effect=failing_stream):
+        with pytest.raises(socket.timeout):
+            stream.download(output_path=str(tmp_path), filename="out.mp4", sinks=[sink])
+    sink.write.assert_called_once()
+    sink.abort.assert_called_once()
+    sink.close.assert_not_called()
+
+
+def test_stream_shares_format_profile():
+    first, second = _make_stream(1024), _make_stream(2048)
+    assert first._profile is second._profile
+    assert (first.resolution, first.abr, first.is_dash) == ("360p", "96kbps", False)
+    assert not hasattr(first, "__dict__")
+
+
+@mock.patch("pytube.streams.request.filesize", return_value=3399554)
+def test_filesize_units_fetch_once(mock_filesize):
+    stream = _make_stream(0)
+    assert stream.filesize_kb == float(3319.877)
+    assert stream.filesize_mb == float(3.243)
+    assert stream.filesize_gb == float(0.004)
+    mock_filesize.assert_called_once()
+
+
+def test_url_is_signed_when_first_read():
+    signer = MagicMock()
+    signer.sign.return_value = "http://fakeassurl.gov/videoplayback?expire=1&sig=x"
+    stream = Stream(
+        stream={
+            "url": "http://fakeassurl.gov/videoplayback?expire=1",
+            "s": "ciphered",
+            "itag": "18",
+            "mimeType": 'video/mp4; codecs="avc1.42001E, mp4a.40.2"',
+            "is_otf": False,
+            "bitrate": None,
+        },
+        monostate=Monostate(on_progress=None, on_complete=None),
+        signer=signer,
+    )
+    assert not signer.sign.called
+    assert stream.url == signer.sign.return_value
+    assert stream.url == signer.sign.return_value
+    signer.sign.assert_called_once_with(
+        "http://fakeassurl.gov/videoplayback?expire=1", "ciphered"
+    )